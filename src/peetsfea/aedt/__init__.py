@@ -1,3 +1,20 @@
 from .maxwell3d_adapter import Maxwell3dConfig, apply_parametric_geometry_plan
+from .script_backend import compile_plan_script
+from .session_pool import (
+    AedtBackend,
+    AedtSession,
+    AedtSessionPool,
+    FakeAedtBackend,
+    PyAedtBackend,
+)
 
-__all__ = ["Maxwell3dConfig", "apply_parametric_geometry_plan"]
+__all__ = [
+    "AedtBackend",
+    "AedtSession",
+    "AedtSessionPool",
+    "FakeAedtBackend",
+    "Maxwell3dConfig",
+    "PyAedtBackend",
+    "apply_parametric_geometry_plan",
+    "compile_plan_script",
+]
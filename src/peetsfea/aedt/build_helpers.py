@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+import time
+
+from peetsfea.domain.type1.sampled_models import MaterialSample
+
+# Plan -> AEDT conventions shared by both build modes (maxwell3d_adapter's per-call API path
+# and script_backend's compiled script): material names, design variable values and the
+# order of unite calls.
+
+
+def material_name(core: MaterialSample) -> str:
+    return "CoreMaterial"
+
+
+def resolve_material_name(material: str, core_name: str) -> str:
+    if material == "core":
+        return core_name
+    if material == "copper":
+        return "copper"
+    if material == "fr4":
+        return "FR4_epoxy"
+    return "vacuum"
+
+
+def format_design_value(value: float | str, units: str | None, default_units: str) -> str:
+    if isinstance(value, str):
+        return value
+    use_units = units or default_units
+    return f"{value}{use_units}"
+
+
+def ms_since(start: float) -> int:
+    return int((time.perf_counter() - start) * 1000)
+
+
+def _unite_group_key(name: str) -> str:
+    # TX_Coil_pos_x_Top_0_00012 -> TX_Coil_pos_x_Top; the anchor and tabs are their own group.
+    return re.sub(r"(_\d+)+$", "", name)
+
+
+def unite_batches(targets: list[str], strategy: str, chunk_size: int) -> list[list[list[str]]]:
+    # Levels of unite calls; every call keeps its first name, so targets[0] survives as the result.
+    if strategy == "single":
+        return [[targets]]
+    if strategy == "tree":
+        levels: list[list[list[str]]] = []
+        level = targets
+        while len(level) > 1:
+            chunks = [level[i : i + chunk_size] for i in range(0, len(level), chunk_size)]
+            levels.append([chunk for chunk in chunks if len(chunk) > 1])
+            level = [chunk[0] for chunk in chunks]
+        return levels
+    if strategy == "per_layer":
+        groups: dict[str, list[str]] = {}
+        for name in targets:
+            groups.setdefault(_unite_group_key(name), []).append(name)
+        heads = [names[0] for names in groups.values()]
+        levels = [[names for names in groups.values() if len(names) > 1]]
+        if len(heads) > 1:
+            levels.append([heads])
+        return [level for level in levels if level]
+    raise ValueError(f"Unknown unite strategy: {strategy!r}")
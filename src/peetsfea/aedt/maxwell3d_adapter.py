@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from peetsfea.aedt.build_helpers import (
+    format_design_value,
+    material_name,
+    ms_since,
+    resolve_material_name,
+    unite_batches,
+)
+from peetsfea.aedt.session_pool import AedtSessionPool
 from peetsfea.domain.type1.sampled_models import MaterialSample
-from peetsfea.geometry.plan import DesignVariable, ParametricGeometryPlan
-from peetsfea.logging_utils import log_action
+from peetsfea.geometry.plan import (
+    DesignVariable,
+    ParametricGeometryPlan,
+    parametric_plan_signature,
+)
+from peetsfea.logging_utils import get_logger, log_action
+
+UNITE_STRATEGIES = ("single", "tree", "per_layer")
+BUILD_MODES = ("api", "script")
 
 
 @dataclass(frozen=True)
@@ -15,20 +31,14 @@ class Maxwell3dConfig:
     non_graphical: bool = False
     new_desktop: bool = False
     close_on_exit: bool = False
-
-
-def _material_name(core: MaterialSample) -> str:
-    return "CoreMaterial"
-
-
-def _resolve_material_name(material: str, core_name: str) -> str:
-    if material == "core":
-        return core_name
-    if material == "copper":
-        return "copper"
-    if material == "fr4":
-        return "FR4_epoxy"
-    return "vacuum"
+    # How a unite op is issued: "single" (one call with every target), "tree" (chunks of
+    # unite_chunk_size, then the chunk heads, ...), "per_layer" (one call per name group such
+    # as TX_Coil_Top / TX_Coil_Bot / TX_Coil_Via, then one join of the group heads).
+    unite_strategy: str = "single"
+    unite_chunk_size: int = 32
+    # "api": one pyaedt call per object/attribute; "script": compile the plan into one native
+    # AEDT script and run it with a single RunScript (aedt/script_backend.py).
+    build_mode: str = "api"
 
 
 def _set_object_color(obj: Any, material: str) -> None:
@@ -41,13 +51,6 @@ def _set_object_color(obj: Any, material: str) -> None:
         return
 
 
-def _format_design_value(value: float | str, units: str | None, default_units: str) -> str:
-    if isinstance(value, str):
-        return value
-    use_units = units or default_units
-    return f"{value}{use_units}"
-
-
 def _apply_material_override_prefix(
     modeler: Any,
     materials: Any,
@@ -93,14 +96,259 @@ def _apply_material_override_prefix(
     }
 
 
+def _apply_core_material(materials: Any, core_material: MaterialSample | None) -> str:
+    mat_name = "vacuum"
+    if core_material is not None:
+        try:
+            mat_name = material_name(core_material)
+            if mat_name not in materials.material_keys:
+                mat = materials.add_material(mat_name)
+            else:
+                mat = materials[mat_name]
+            if not mat:
+                raise RuntimeError("Material creation failed")
+            if core_material.mu_r != -1:
+                mat.permeability = core_material.mu_r
+            if core_material.epsilon_r != -1:
+                mat.permittivity = core_material.epsilon_r
+            if core_material.conductivity_s_per_m != -1:
+                mat.conductivity = core_material.conductivity_s_per_m
+        except Exception:
+            mat_name = "vacuum"
+    return mat_name
+
+
+def _independent_values(plan: ParametricGeometryPlan) -> dict[str, str]:
+    return {
+        var.name: format_design_value(var.value, var.units, plan.units_length)
+        for var in plan.variables
+        if not var.is_expression
+    }
+
+
+def _ensure_material(materials: Any, material: str, core_name: str) -> str:
+    mat = resolve_material_name(material, core_name)
+    if mat not in materials.material_keys:
+        try:
+            materials.add_material(mat)
+        except Exception:
+            mat = "vacuum"
+    return mat
+
+
+def _finish_object(modeler: Any, obj: Any, material: str, model: bool) -> None:
+    if not obj:
+        return
+    _set_object_color(obj, material)
+    try:
+        modeler.set_object_model_state([obj.name], model=model)
+    except Exception:
+        obj.model = model
+
+
+def _unite(modeler: Any, targets: list[str], *, keep_originals: bool, cfg: Maxwell3dConfig) -> dict[str, Any]:
+    start = time.perf_counter()
+    calls = 0
+    for level in unite_batches(targets, cfg.unite_strategy, cfg.unite_chunk_size):
+        for names in level:
+            modeler.unite(names, purge=False, keep_originals=keep_originals)
+            calls += 1
+    return {"targets": len(targets), "calls": calls, "duration_ms": ms_since(start)}
+
+
+def _validate_config(cfg: Maxwell3dConfig) -> None:
+    if cfg.unite_strategy not in UNITE_STRATEGIES:
+        raise ValueError(f"unite_strategy must be one of {UNITE_STRATEGIES}")
+    if cfg.unite_chunk_size < 2:
+        raise ValueError("unite_chunk_size must be >= 2")
+    if cfg.build_mode not in BUILD_MODES:
+        raise ValueError(f"build_mode must be one of {BUILD_MODES}")
+
+
+def _build_design(
+    app: Any,
+    plan: ParametricGeometryPlan,
+    core_material: MaterialSample | None,
+    cfg: Maxwell3dConfig,
+    project_path: Path,
+) -> dict[str, Any]:
+    if cfg.build_mode == "script":
+        from peetsfea.aedt.script_backend import apply_plan_script
+
+        return apply_plan_script(app, plan, core_material, cfg, project_path)
+    return _apply_plan_to_app(app, plan, core_material, cfg)
+
+
+def _apply_plan_to_app(
+    app: Any,
+    plan: ParametricGeometryPlan,
+    core_material: MaterialSample | None,
+    cfg: Maxwell3dConfig,
+) -> dict[str, Any]:
+    report: dict[str, Any] = {"material_overrides": []}
+    timings: dict[str, int] = {}
+    modeler = app.modeler
+    materials = app.materials
+    modeler.model_units = plan.units_length
+
+    start = time.perf_counter()
+    mat_name = _apply_core_material(materials, core_material)
+
+    for name, value in _independent_values(plan).items():
+        app[name] = value
+
+    for var in plan.variables:
+        if not var.is_expression:
+            continue
+        expr = format_design_value(var.value, var.units, plan.units_length)
+        app[var.name] = expr
+    timings["variables"] = ms_since(start)
+
+    # Names are tracked locally: re-reading modeler.object_names after every boolean op is
+    # O(objects) per call across the COM/gRPC boundary.
+    existing: set[str] = set()
+    start = time.perf_counter()
+    for box in plan.boxes:
+        obj = modeler.create_box(
+            list(box.corner_expr),
+            list(box.size_expr),
+            name=box.name,
+            matname=_ensure_material(materials, box.material, mat_name),
+        )
+        _finish_object(modeler, obj, box.material, box.model)
+        if obj:
+            existing.add(obj.name)
+
+    for line in plan.polylines:
+        obj = modeler.create_polyline(
+            [list(point) for point in line.points_expr],
+            name=line.name,
+            matname=_ensure_material(materials, line.material, mat_name),
+            xsection_type=line.xsection_type,
+            xsection_orient=line.xsection_orient,
+            xsection_width=line.xsection_width,
+            xsection_height=line.xsection_height,
+            xsection_bend_type=line.xsection_bend_type,
+        )
+        _finish_object(modeler, obj, line.material, line.model)
+        if obj:
+            existing.add(obj.name)
+    timings["create"] = ms_since(start)
+
+    unites: list[dict[str, Any]] = []
+    start = time.perf_counter()
+    for op in plan.operations:
+        if op.op == "unite":
+            targets = [name for name in op.targets if name in existing]
+            if len(targets) < 2:
+                continue
+            unites.append(_unite(modeler, targets, keep_originals=op.keep_originals, cfg=cfg))
+            if op.keep_originals:
+                # Kept originals come back under names AEDT picks; resync once.
+                existing = set(modeler.object_names)
+            else:
+                existing.difference_update(targets[1:])
+            continue
+
+        if op.op == "subtract":
+            blanks = [name for name in op.targets if name in existing]
+            tools = [name for name in op.tools if name in existing]
+            if not blanks or not tools:
+                continue
+            modeler.subtract(blanks, tools, keep_originals=op.keep_originals)
+            if not op.keep_originals:
+                existing.difference_update(tools)
+            continue
+
+        raise ValueError(f"Unknown operation: {op.op!r}")
+    timings["boolean"] = ms_since(start)
+
+    # Boolean ops can result in incorrect material assignment in some AEDT workflows.
+    # Force key prefixes back to copper as a last step.
+    report["material_overrides"].append(
+        _apply_material_override_prefix(modeler, materials, prefix="TX_Coil", material="copper")
+    )
+
+    start = time.perf_counter()
+    app.save_project()
+    timings["save"] = ms_since(start)
+
+    report["unite"] = {
+        "strategy": cfg.unite_strategy,
+        "chunk_size": cfg.unite_chunk_size,
+        "calls": sum(u["calls"] for u in unites),
+        "duration_ms": sum(u["duration_ms"] for u in unites),
+        "ops": unites,
+    }
+    report["timings_ms"] = timings
+    get_logger().info(
+        "aedt_apply_timings",
+        unite_strategy=cfg.unite_strategy,
+        unite_calls=report["unite"]["calls"],
+        unite_ms=report["unite"]["duration_ms"],
+        **{f"{k}_ms": v for k, v in timings.items()},
+    )
+    return report
+
+
+def _update_plan_variables(
+    app: Any,
+    plan: ParametricGeometryPlan,
+    core_material: MaterialSample | None,
+    previous: dict[str, str],
+    project_path: Path,
+) -> dict[str, Any]:
+    # Same topology signature: objects/expressions already exist, only values change.
+    _apply_core_material(app.materials, core_material)
+    values = _independent_values(plan)
+    changed = [name for name, value in values.items() if previous.get(name) != value]
+    for name in changed:
+        app[name] = values[name]
+    # Save-as: the shared design keeps living in the desktop, each sample gets its own project file.
+    app.save_project(str(project_path))
+    return {"material_overrides": [], "variables_pushed": len(changed)}
+
+
+def _apply_plan_reusing_design(
+    session_pool: AedtSessionPool,
+    plan: ParametricGeometryPlan,
+    project_path: Path,
+    design_name: str,
+    core_material: MaterialSample | None,
+    cfg: Maxwell3dConfig,
+) -> dict[str, Any]:
+    signature = parametric_plan_signature(plan)
+    # Core material presence changes box materials, which the plan signature does not see.
+    key = f"{signature}:{int(core_material is not None)}"
+    with session_pool.reusable_design(key, project_path, design_name) as design:
+        if design.fresh:
+            report = _build_design(design.app, plan, core_material, cfg, project_path)
+            report["variables_pushed"] = len(plan.variables)
+        else:
+            report = _update_plan_variables(design.app, plan, core_material, design.values, project_path)
+        design.values = _independent_values(plan)
+        report["design_reuse"] = {
+            "signature": signature,
+            "reused": not design.fresh,
+            "design_name": design.design_name,
+            "project_path": str(project_path),
+        }
+        return report
+
+
 @log_action(
     "apply_parametric_geometry_plan",
     lambda plan, project_path, design_name, **kwargs: {
         "project_path": str(project_path),
         "design_name": design_name,
         "box_count": len(plan.boxes),
+        "polyline_count": len(plan.polylines),
         "variable_count": len(plan.variables),
         "operation_count": len(plan.operations),
+        "pooled": kwargs.get("session_pool") is not None,
+        "reuse_designs": getattr(kwargs.get("session_pool"), "reuse_designs", False),
+        "unite_strategy": getattr(kwargs.get("config"), "unite_strategy", "single"),
+        "build_mode": getattr(kwargs.get("config"), "build_mode", "api"),
     },
 )
 def apply_parametric_geometry_plan(
@@ -109,12 +357,21 @@ def apply_parametric_geometry_plan(
     design_name: str,
     core_material: MaterialSample | None = None,
     config: Maxwell3dConfig | None = None,
+    session_pool: AedtSessionPool | None = None,
 ) -> dict[str, Any]:
+    cfg = config or Maxwell3dConfig()
+    _validate_config(cfg)
+    if session_pool is not None and session_pool.reuse_designs:
+        return _apply_plan_reusing_design(session_pool, plan, project_path, design_name, core_material, cfg)
+
+    if session_pool is not None:
+        # Desktop lifetime is owned by the pool (desktop settings come from the pool itself).
+        with session_pool.design(project_path, design_name) as pooled_app:
+            return _build_design(pooled_app, plan, core_material, cfg, project_path)
+
     from ansys.aedt.core import Maxwell3d
 
-    cfg = config or Maxwell3dConfig()
     app: Maxwell3d | None = None
-    report: dict[str, Any] = {"material_overrides": []}
     try:
         app = Maxwell3d(
             project=str(project_path),
@@ -128,90 +385,8 @@ def apply_parametric_geometry_plan(
         from ansys.aedt.core.modules.material_lib import Materials
         assert isinstance(app.modeler, Modeler3D)
         assert isinstance(app.materials, Materials)
-        
-        modeler = app.modeler
-        materials = app.materials
-        modeler.model_units = plan.units_length
 
-        mat_name = "vacuum"
-        if core_material is not None:
-            try:
-                mat_name = _material_name(core_material)
-                if mat_name not in materials.material_keys:
-                    mat = materials.add_material(mat_name)
-                else:
-                    mat = materials[mat_name]
-                if not mat:
-                    raise RuntimeError("Material creation failed")
-                if core_material.mu_r != -1:
-                    mat.permeability = core_material.mu_r
-                if core_material.epsilon_r != -1:
-                    mat.permittivity = core_material.epsilon_r
-                if core_material.conductivity_s_per_m != -1:
-                    mat.conductivity = core_material.conductivity_s_per_m
-            except Exception:
-                mat_name = "vacuum"
-
-        for var in plan.variables:
-            if var.is_expression:
-                continue
-            app[var.name] = _format_design_value(var.value, var.units, plan.units_length)
-
-        for var in plan.variables:
-            if not var.is_expression:
-                continue
-            expr = _format_design_value(var.value, var.units, plan.units_length)
-            app[var.name] = expr
-
-        for box in plan.boxes:
-            mat = _resolve_material_name(box.material, mat_name)
-            if mat not in materials.material_keys:
-                try:
-                    materials.add_material(mat)
-                except Exception:
-                    mat = "vacuum"
-            obj = modeler.create_box(
-                list(box.corner_expr),
-                list(box.size_expr),
-                name=box.name,
-                matname=mat,
-            )
-            if obj:
-                _set_object_color(obj, box.material)
-                try:
-                    modeler.set_object_model_state([obj.name], model=box.model)
-                except Exception:
-                    obj.model = box.model
-
-        existing = set(modeler.object_names)
-        for op in plan.operations:
-            if op.op == "unite":
-                targets = [name for name in op.targets if name in existing]
-                if len(targets) < 2:
-                    continue
-                modeler.unite(targets, purge=False, keep_originals=op.keep_originals)
-                existing = set(modeler.object_names)
-                continue
-
-            if op.op == "subtract":
-                blanks = [name for name in op.targets if name in existing]
-                tools = [name for name in op.tools if name in existing]
-                if not blanks or not tools:
-                    continue
-                modeler.subtract(blanks, tools, keep_originals=op.keep_originals)
-                existing = set(modeler.object_names)
-                continue
-
-            raise ValueError(f"Unknown operation: {op.op!r}")
-
-        # Boolean ops can result in incorrect material assignment in some AEDT workflows.
-        # Force key prefixes back to copper as a last step.
-        report["material_overrides"].append(
-            _apply_material_override_prefix(modeler, materials, prefix="TX_Coil", material="copper")
-        )
-
-        app.save_project()
-        return report
+        return _build_design(app, plan, core_material, cfg, project_path)
     finally:
         if app is not None:
             app.release_desktop(close_projects=False, close_desktop=False)
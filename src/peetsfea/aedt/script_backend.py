@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from peetsfea.aedt.build_helpers import (
+    format_design_value,
+    material_name,
+    ms_since,
+    resolve_material_name,
+    unite_batches,
+)
+from peetsfea.aedt.maxwell3d_adapter import Maxwell3dConfig
+from peetsfea.domain.type1.sampled_models import MaterialSample
+from peetsfea.geometry.plan import ParametricGeometryPlan, parametric_plan_signature
+
+# Script build mode: the whole plan (variables, core material, boxes, polylines, booleans,
+# copper override, save) is compiled into one native AEDT script and executed with a single
+# oDesktop.RunScript, instead of one remote call per object/attribute.
+# The generated text only depends on its inputs (no timestamps/paths beyond the arguments),
+# so it can be diffed against golden files without AEDT.
+
+_COLORS = {"copper": "(184 115 51)", "fr4": "(30 110 30)"}
+_DEFAULT_COLOR = "(143 175 143)"
+
+
+def _py(value: Any) -> str:
+    # Python literal in the subset both IronPython 2.7 and CPython accept.
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_py(v) for v in value) + "]"
+    raise TypeError(f"Unsupported script value: {value!r}")
+
+
+def _call(target: str, method: str, *args: Any) -> str:
+    return f"{target}.{method}(" + ", ".join(_py(a) for a in args) + ")"
+
+
+def _attributes(name: str, material: str, mat: str, model: bool) -> list[Any]:
+    return [
+        "NAME:Attributes",
+        "Name:=",
+        name,
+        "Flags:=",
+        "" if model else "NonModel#",
+        "Color:=",
+        _COLORS.get(material, _DEFAULT_COLOR),
+        "Transparency:=",
+        0,
+        "PartCoordinateSystem:=",
+        "Global",
+        "MaterialValue:=",
+        f'"{mat}"',
+    ]
+
+
+def _core_material_lines(core_material: MaterialSample) -> list[str]:
+    name = material_name(core_material)
+    props: list[Any] = [
+        f"NAME:{name}",
+        "CoordinateSystemType:=",
+        "Cartesian",
+        "BulkOrSurfaceType:=",
+        1,
+        ["NAME:PhysicsTypes", "set:=", ["Electromagnetic"]],
+    ]
+    for key, value in (
+        ("permeability", core_material.mu_r),
+        ("permittivity", core_material.epsilon_r),
+        ("conductivity", core_material.conductivity_s_per_m),
+    ):
+        if value != -1:
+            props.extend([f"{key}:=", repr(float(value))])
+    return [
+        "oDefinitionManager = oProject.GetDefinitionManager()",
+        f"if oDefinitionManager.DoesMaterialExist({_py(name)}):",
+        "    " + _call("oDefinitionManager", "EditMaterial", name, props),
+        "else:",
+        "    " + _call("oDefinitionManager", "AddMaterial", props),
+    ]
+
+
+def compile_plan_script(
+    plan: ParametricGeometryPlan,
+    *,
+    project_name: str,
+    design_name: str,
+    core_material: MaterialSample | None = None,
+    config: Maxwell3dConfig | None = None,
+    save_path: Path | None = None,
+) -> str:
+    cfg = config or Maxwell3dConfig()
+    units = plan.units_length
+    core_name = material_name(core_material) if core_material is not None else "vacuum"
+
+    lines = [
+        "# Generated by peetsfea.aedt.script_backend; do not edit.",
+        f"# plan_signature: {parametric_plan_signature(plan)}",
+        f"oProject = oDesktop.SetActiveProject({_py(project_name)})",
+        f"oDesign = oProject.SetActiveDesign({_py(design_name)})",
+        'oEditor = oDesign.SetActiveEditor("3D Modeler")',
+        _call("oEditor", "SetModelUnits", ["NAME:Units Parameter", "Units:=", units, "Rescale:=", False]),
+    ]
+    if core_material is not None:
+        lines.extend(_core_material_lines(core_material))
+
+    # Independent values first: expressions may reference them.
+    ordered = [v for v in plan.variables if not v.is_expression] + [v for v in plan.variables if v.is_expression]
+    if ordered:
+        new_props: list[Any] = ["NAME:NewProps"]
+        for var in ordered:
+            value = format_design_value(var.value, var.units, units)
+            new_props.append([f"NAME:{var.name}", "PropType:=", "VariableProp", "UserDef:=", True, "Value:=", value])
+        lines.append(
+            _call(
+                "oDesign",
+                "ChangeProperty",
+                ["NAME:AllTabs", ["NAME:LocalVariableTab", ["NAME:PropServers", "LocalVariables"], new_props]],
+            )
+        )
+
+    existing: list[str] = []
+    for box in plan.boxes:
+        mat = resolve_material_name(box.material, core_name)
+        params: list[Any] = ["NAME:BoxParameters"]
+        for key, value in zip(
+            ("XPosition", "YPosition", "ZPosition", "XSize", "YSize", "ZSize"),
+            (*box.corner_expr, *box.size_expr),
+        ):
+            params.extend([f"{key}:=", value])
+        lines.append(_call("oEditor", "CreateBox", params, _attributes(box.name, box.material, mat, box.model)))
+        existing.append(box.name)
+
+    for line in plan.polylines:
+        mat = resolve_material_name(line.material, core_name)
+        points: list[Any] = ["NAME:PolylinePoints"]
+        for x, y, z in line.points_expr:
+            points.append(["NAME:PLPoint", "X:=", x, "Y:=", y, "Z:=", z])
+        segments: list[Any] = ["NAME:PolylineSegments"]
+        for i in range(len(line.points_expr) - 1):
+            segments.append(["NAME:PLSegment", "SegmentType:=", "Line", "StartIndex:=", i, "NoOfPoints:=", 2])
+        xsection = [
+            "NAME:PolylineXSection",
+            "XSectionType:=",
+            line.xsection_type,
+            "XSectionOrient:=",
+            line.xsection_orient,
+            "XSectionWidth:=",
+            line.xsection_width,
+            "XSectionTopWidth:=",
+            f"0{units}",
+            "XSectionHeight:=",
+            line.xsection_height,
+            "XSectionNumSegments:=",
+            "0",
+            "XSectionBendType:=",
+            line.xsection_bend_type,
+        ]
+        params = [
+            "NAME:PolylineParameters",
+            "IsPolylineCovered:=",
+            True,
+            "IsPolylineClosed:=",
+            False,
+            points,
+            segments,
+            xsection,
+        ]
+        lines.append(_call("oEditor", "CreatePolyline", params, _attributes(line.name, line.material, mat, line.model)))
+        existing.append(line.name)
+
+    alive = set(existing)
+    for op in plan.operations:
+        if op.op == "unite":
+            targets = [name for name in op.targets if name in alive]
+            if len(targets) < 2:
+                continue
+            for level in unite_batches(targets, cfg.unite_strategy, cfg.unite_chunk_size):
+                for names in level:
+                    lines.append(
+                        _call(
+                            "oEditor",
+                            "Unite",
+                            ["NAME:Selections", "Selections:=", ",".join(names)],
+                            ["NAME:UniteParameters", "KeepOriginals:=", op.keep_originals],
+                        )
+                    )
+            if not op.keep_originals:
+                alive.difference_update(targets[1:])
+            continue
+
+        if op.op == "subtract":
+            blanks = [name for name in op.targets if name in alive]
+            tools = [name for name in op.tools if name in alive]
+            if not blanks or not tools:
+                continue
+            lines.append(
+                _call(
+                    "oEditor",
+                    "Subtract",
+                    ["NAME:Selections", "Blank Parts:=", ",".join(blanks), "Tool Parts:=", ",".join(tools)],
+                    ["NAME:SubtractParameters", "KeepOriginals:=", op.keep_originals],
+                )
+            )
+            if not op.keep_originals:
+                alive.difference_update(tools)
+            continue
+
+        raise ValueError(f"Unknown operation: {op.op!r}")
+
+    # Same last step as the API path: booleans can drop the coil material.
+    coil = [name for name in existing if name in alive and name.startswith("TX_Coil")]
+    if coil:
+        lines.append(
+            _call(
+                "oEditor",
+                "AssignMaterial",
+                ["NAME:Selections", "Selections:=", ",".join(coil)],
+                ["NAME:Attributes", "MaterialValue:=", '"copper"'],
+            )
+        )
+
+    if save_path is not None:
+        lines.append(_call("oProject", "SaveAs", save_path.as_posix(), True))
+    else:
+        lines.append("oProject.Save()")
+    return "\n".join(lines) + "\n"
+
+
+def script_path_for(project_path: Path) -> Path:
+    return project_path.with_name(f"{project_path.stem}_build.py")
+
+
+def apply_plan_script(
+    app: Any,
+    plan: ParametricGeometryPlan,
+    core_material: MaterialSample | None,
+    cfg: Maxwell3dConfig,
+    project_path: Path,
+) -> dict[str, Any]:
+    start = time.perf_counter()
+    text = compile_plan_script(
+        plan,
+        project_name=app.project_name,
+        design_name=app.design_name,
+        core_material=core_material,
+        config=cfg,
+        save_path=project_path,
+    )
+    script_path = script_path_for(project_path)
+    script_path.parent.mkdir(parents=True, exist_ok=True)
+    script_path.write_text(text, encoding="utf-8")
+    compile_ms = ms_since(start)
+
+    start = time.perf_counter()
+    app.odesktop.RunScript(str(script_path))
+    run_ms = ms_since(start)
+    return {
+        "material_overrides": [],
+        "script": {"path": str(script_path), "lines": text.count("\n"), "bytes": len(text.encode("utf-8"))},
+        "timings_ms": {"compile": compile_ms, "run": run_ms},
+    }
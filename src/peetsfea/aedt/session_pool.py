@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol, Self
+
+from peetsfea.logging_utils import get_logger
+
+# Long-lived AEDT desktops shared across samples.
+# `apply_parametric_geometry_plan` normally attaches/launches a desktop per sample; with a
+# pool, each sample only opens (and afterwards closes) its own project/design on one of N
+# already-running desktops. A desktop is recycled after `recycle_after` designs or after any
+# error raised while it was in use.
+#
+# With `reuse_designs=True`, `reusable_design(key, ...)` keeps up to `max_open_designs`
+# designs open per desktop, keyed by a topology signature; a later sample with the same key
+# gets the already-built design back and only has to push its variable values.
+#
+# The AEDT side sits behind `AedtBackend`/`AedtSession`, so the pooling logic can run
+# against `FakeAedtBackend` (in-process, no AEDT) as well as `PyAedtBackend`.
+
+
+class AedtSession(Protocol):
+    def open_design(self, project_path: Path, design_name: str, *, solution_type: str) -> Any: ...
+
+    def close_design(self, app: Any) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class AedtBackend(Protocol):
+    def launch(self, *, non_graphical: bool, new_desktop: bool, close_on_exit: bool) -> AedtSession: ...
+
+
+class PyAedtSession:
+    def __init__(self, *, non_graphical: bool, new_desktop: bool, close_on_exit: bool) -> None:
+        from ansys.aedt.core import Desktop
+
+        self._desktop = Desktop(non_graphical=non_graphical, new_desktop=new_desktop, close_on_exit=close_on_exit)
+        self._owns_desktop = new_desktop
+
+    def open_design(self, project_path: Path, design_name: str, *, solution_type: str) -> Any:
+        from ansys.aedt.core import Maxwell3d
+
+        return Maxwell3d(
+            project=str(project_path),
+            design=design_name,
+            solution_type=solution_type,
+            new_desktop=False,
+            aedt_process_id=self._desktop.aedt_process_id,
+        )
+
+    def close_design(self, app: Any) -> None:
+        # The plan apply step saves; closing keeps the desktop's project list bounded.
+        app.close_project(name=app.project_name, save=False)
+
+    def close(self) -> None:
+        self._desktop.release_desktop(close_projects=True, close_desktop=self._owns_desktop)
+
+
+class PyAedtBackend:
+    def launch(self, *, non_graphical: bool, new_desktop: bool, close_on_exit: bool) -> AedtSession:
+        return PyAedtSession(non_graphical=non_graphical, new_desktop=new_desktop, close_on_exit=close_on_exit)
+
+
+# --- In-process fake (no AEDT) ---
+
+
+@dataclass
+class FakeAedtObject:
+    name: str
+    corner: list[str]
+    size: list[str]
+    material_name: str
+    model: bool = True
+    color: tuple[int, int, int] | None = None
+    points: list[list[str]] | None = None
+
+
+@dataclass
+class FakeAedtMaterial:
+    name: str
+    permeability: float | None = None
+    permittivity: float | None = None
+    conductivity: float | None = None
+
+
+class FakeAedtMaterials:
+    def __init__(self) -> None:
+        self._materials: dict[str, FakeAedtMaterial] = {
+            name: FakeAedtMaterial(name) for name in ("vacuum", "copper", "FR4_epoxy")
+        }
+
+    @property
+    def material_keys(self) -> list[str]:
+        return list(self._materials)
+
+    def add_material(self, name: str) -> FakeAedtMaterial:
+        return self._materials.setdefault(name, FakeAedtMaterial(name))
+
+    def __getitem__(self, name: str) -> FakeAedtMaterial:
+        return self._materials[name]
+
+
+class FakeAedtModeler:
+    def __init__(self) -> None:
+        self.model_units = "mm"
+        self.objects: dict[str, FakeAedtObject] = {}
+        self.operations: list[tuple[str, tuple[str, ...], tuple[str, ...]]] = []
+
+    @property
+    def object_names(self) -> list[str]:
+        return list(self.objects)
+
+    def create_box(self, corner: list[str], size: list[str], *, name: str, matname: str) -> FakeAedtObject:
+        if name in self.objects:
+            raise ValueError(f"Object already exists: {name}")
+        obj = FakeAedtObject(name=name, corner=list(corner), size=list(size), material_name=matname)
+        self.objects[name] = obj
+        return obj
+
+    def create_polyline(
+        self,
+        points: list[list[str]],
+        *,
+        name: str,
+        matname: str,
+        xsection_type: str | None = None,
+        xsection_orient: str | None = None,
+        xsection_width: str = "0",
+        xsection_height: str = "0",
+        xsection_bend_type: str | None = None,
+    ) -> FakeAedtObject:
+        if name in self.objects:
+            raise ValueError(f"Object already exists: {name}")
+        if len(points) < 2:
+            raise ValueError(f"Polyline needs at least two points: {name}")
+        obj = FakeAedtObject(
+            name=name,
+            corner=[],
+            size=[xsection_width, xsection_height],
+            material_name=matname,
+            points=[list(p) for p in points],
+        )
+        self.objects[name] = obj
+        return obj
+
+    def get_object_from_name(self, name: str) -> FakeAedtObject | None:
+        return self.objects.get(name)
+
+    def set_object_model_state(self, names: list[str], model: bool = True) -> bool:
+        for name in names:
+            self.objects[name].model = model
+        return True
+
+    def unite(self, names: list[str], purge: bool = False, keep_originals: bool = False) -> str:
+        self.operations.append(("unite", tuple(names), ()))
+        for name in names[1:]:
+            self.objects.pop(name, None)
+        return names[0]
+
+    def subtract(self, blanks: list[str], tools: list[str], keep_originals: bool = True) -> bool:
+        self.operations.append(("subtract", tuple(blanks), tuple(tools)))
+        if not keep_originals:
+            for name in tools:
+                self.objects.pop(name, None)
+        return True
+
+
+class FakeAedtDesktop:
+    def __init__(self) -> None:
+        # Script build mode: scripts are recorded, not interpreted.
+        self.scripts: list[Path] = []
+
+    def RunScript(self, script_path: str) -> None:
+        self.scripts.append(Path(script_path))
+
+
+class FakeAedtApp:
+    def __init__(self, project_path: Path, design_name: str, solution_type: str) -> None:
+        self.project_path = Path(project_path)
+        self.project_name = self.project_path.stem
+        self.design_name = design_name
+        self.solution_type = solution_type
+        self.variables: dict[str, str] = {}
+        self.modeler = FakeAedtModeler()
+        self.materials = FakeAedtMaterials()
+        self.odesktop = FakeAedtDesktop()
+        self.save_count = 0
+        self.closed = False
+
+    def __setitem__(self, name: str, value: str) -> None:
+        self.variables[name] = value
+
+    def __getitem__(self, name: str) -> str:
+        return self.variables[name]
+
+    def save_project(self, file_name: str | None = None) -> bool:
+        if file_name is not None:
+            self.project_path = Path(file_name)
+            self.project_name = self.project_path.stem
+        self.save_count += 1
+        return True
+
+
+class FakeAedtSession:
+    def __init__(self, session_id: int) -> None:
+        self.session_id = session_id
+        self.apps: list[FakeAedtApp] = []
+        self.closed = False
+
+    def open_design(self, project_path: Path, design_name: str, *, solution_type: str) -> FakeAedtApp:
+        if self.closed:
+            raise RuntimeError("Session is closed")
+        app = FakeAedtApp(project_path, design_name, solution_type)
+        self.apps.append(app)
+        return app
+
+    def close_design(self, app: Any) -> None:
+        app.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeAedtBackend:
+    def __init__(self) -> None:
+        self.sessions: list[FakeAedtSession] = []
+
+    def launch(self, *, non_graphical: bool, new_desktop: bool, close_on_exit: bool) -> AedtSession:
+        session = FakeAedtSession(len(self.sessions))
+        self.sessions.append(session)
+        return session
+
+
+# --- Pool ---
+
+
+@dataclass
+class OpenDesign:
+    key: str
+    app: Any
+    design_name: str
+    fresh: bool = True
+    # Independent variable values last written to the design (name -> AEDT value string).
+    values: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _Slot:
+    index: int
+    session: AedtSession | None = None
+    designs: int = 0
+    busy: bool = False
+    open_designs: OrderedDict[str, OpenDesign] = field(default_factory=OrderedDict)
+
+
+def _close_session(session: AedtSession, slot_index: int) -> None:
+    # A session being dropped may already be broken; closing it must not fail the caller.
+    logger = get_logger()
+    try:
+        session.close()
+    except Exception:
+        logger.exception("aedt_session_close_error", slot=slot_index)
+
+
+def _close_design(session: AedtSession, app: Any, slot_index: int) -> bool:
+    # False if the design could not be closed; the caller recycles the session.
+    logger = get_logger()
+    try:
+        session.close_design(app)
+    except Exception:
+        logger.exception("aedt_close_design_error", slot=slot_index)
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class AedtSessionPoolStats:
+    size: int
+    launches: int
+    recycles: int
+    designs: int
+    errors: int
+    reuses: int = 0
+
+
+@dataclass
+class AedtSessionPool:
+    backend: AedtBackend = field(default_factory=PyAedtBackend)
+    size: int = 1
+    recycle_after: int = 25
+    solution_type: str = "Magnetostatic"
+    non_graphical: bool = False
+    new_desktop: bool = False
+    close_on_exit: bool = False
+    reuse_designs: bool = False
+    max_open_designs: int = 4
+
+    def __post_init__(self) -> None:
+        if self.size < 1:
+            raise ValueError("size must be >= 1")
+        if self.recycle_after < 1:
+            raise ValueError("recycle_after must be >= 1")
+        if self.max_open_designs < 1:
+            raise ValueError("max_open_designs must be >= 1")
+        self._slots = [_Slot(index=i) for i in range(self.size)]
+        self._cond = threading.Condition()
+        self._launches = 0
+        self._recycles = 0
+        self._designs = 0
+        self._errors = 0
+        self._reuses = 0
+        self._closed = False
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Any,
+        *,
+        size: int = 1,
+        recycle_after: int = 25,
+        backend: AedtBackend | None = None,
+        reuse_designs: bool = False,
+    ) -> AedtSessionPool:
+        # `config` is a Maxwell3dConfig (not imported here to keep this module adapter-free).
+        return cls(
+            backend=backend or PyAedtBackend(),
+            size=size,
+            recycle_after=recycle_after,
+            solution_type=config.solution_type,
+            non_graphical=config.non_graphical,
+            new_desktop=config.new_desktop,
+            close_on_exit=config.close_on_exit,
+            reuse_designs=reuse_designs,
+        )
+
+    def _acquire(self, key: str | None = None) -> _Slot:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("AedtSessionPool is closed")
+                free = [slot for slot in self._slots if not slot.busy]
+                if free:
+                    # Prefer a desktop that already has this design open, then running desktops.
+                    slot = min(free, key=lambda s: (key not in s.open_designs, s.session is None, s.index))
+                    slot.busy = True
+                    return slot
+                self._cond.wait()
+
+    def _release(self, slot: _Slot) -> None:
+        with self._cond:
+            slot.busy = False
+            self._cond.notify()
+
+    def _launch(self, slot: _Slot) -> AedtSession:
+        # Several desktops cannot attach to the same running AEDT instance.
+        new_desktop = self.new_desktop or self.size > 1
+        slot.session = self.backend.launch(
+            non_graphical=self.non_graphical,
+            new_desktop=new_desktop,
+            close_on_exit=self.close_on_exit,
+        )
+        slot.designs = 0
+        with self._cond:
+            self._launches += 1
+        return slot.session
+
+    def _recycle(self, slot: _Slot, reason: str) -> None:
+        session = slot.session
+        slot.session = None
+        slot.designs = 0
+        slot.open_designs.clear()
+        with self._cond:
+            self._recycles += 1
+        get_logger().info("aedt_session_recycle", slot=slot.index, reason=reason)
+        if session is not None:
+            _close_session(session, slot.index)
+
+    @contextmanager
+    def design(self, project_path: Path, design_name: str) -> Iterator[Any]:
+        slot = self._acquire()
+        try:
+            session = slot.session or self._launch(slot)
+            failed = False
+            app = None
+            try:
+                app = session.open_design(project_path, design_name, solution_type=self.solution_type)
+                yield app
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                if app is not None and not _close_design(session, app, slot.index):
+                    failed = True
+                slot.designs += 1
+                with self._cond:
+                    self._designs += 1
+                    if failed:
+                        self._errors += 1
+                if failed:
+                    self._recycle(slot, "error")
+                elif slot.designs >= self.recycle_after:
+                    self._recycle(slot, "recycle_after")
+        finally:
+            self._release(slot)
+
+    @contextmanager
+    def reusable_design(self, key: str, project_path: Path, design_name: str) -> Iterator[OpenDesign]:
+        # Only fresh designs count towards `recycle_after`; reused ones are variable edits.
+        if not self.reuse_designs:
+            raise RuntimeError("AedtSessionPool was created with reuse_designs=False")
+        slot = self._acquire(key)
+        try:
+            session = slot.session or self._launch(slot)
+            entry = slot.open_designs.get(key)
+            if entry is not None:
+                entry.fresh = False
+                slot.open_designs.move_to_end(key)
+            failed = False
+            try:
+                if entry is None:
+                    app = session.open_design(project_path, design_name, solution_type=self.solution_type)
+                    entry = OpenDesign(key=key, app=app, design_name=design_name)
+                    slot.open_designs[key] = entry
+                    while len(slot.open_designs) > self.max_open_designs:
+                        _, evicted = slot.open_designs.popitem(last=False)
+                        session.close_design(evicted.app)
+                yield entry
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                fresh = entry is None or entry.fresh
+                if fresh:
+                    slot.designs += 1
+                with self._cond:
+                    if fresh:
+                        self._designs += 1
+                    else:
+                        self._reuses += 1
+                    if failed:
+                        self._errors += 1
+                if failed:
+                    self._recycle(slot, "error")
+                elif slot.designs >= self.recycle_after:
+                    self._recycle(slot, "recycle_after")
+        finally:
+            self._release(slot)
+
+    def stats(self) -> AedtSessionPoolStats:
+        with self._cond:
+            return AedtSessionPoolStats(
+                size=self.size,
+                launches=self._launches,
+                recycles=self._recycles,
+                designs=self._designs,
+                errors=self._errors,
+                reuses=self._reuses,
+            )
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            slots = list(self._slots)
+        for slot in slots:
+            session = slot.session
+            slot.session = None
+            slot.open_designs.clear()
+            if session is not None:
+                _close_session(session, slot.index)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -5,7 +5,8 @@ import json
 from pathlib import Path
 from typing import Any
 
-from peetsfea.geometry.type1 import DdSplit, build_planar_rect_spiral_masks, layer_rect_spirals
+from peetsfea.aedt.script_backend import compile_plan_script
+from peetsfea.geometry.type1.coil_cache import planar_coil_geometry
 from peetsfea.geometry.type1.tx_coil_3d import tx_coil_face_frame_for_name
 from peetsfea.pipeline.runner import run_type1_from_path
 from peetsfea.pipeline.serialize import to_dict
@@ -28,9 +29,31 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Include a derived planar rectangular spiral mask (2D) in JSON output (debug helper)",
     )
+    parser.add_argument(
+        "--parametric-coil",
+        action="store_true",
+        help="Express TX coil boxes in per-instance design variables instead of literals",
+    )
+    parser.add_argument(
+        "--coil-emission",
+        choices=("boxes", "polyline"),
+        default="boxes",
+        help="TX trace geometry: one box per segment, or one swept polyline per layer run",
+    )
+    parser.add_argument(
+        "--aedt-script-out",
+        type=Path,
+        default=None,
+        help="Also write the native AEDT build script for this seed (offline, no AEDT needed)",
+    )
     args = parser.parse_args(argv)
 
-    result = run_type1_from_path(args.spec, args.seed)
+    result = run_type1_from_path(
+        args.spec,
+        args.seed,
+        parametric_coil=args.parametric_coil,
+        coil_emission=args.coil_emission,
+    )
     payload = _build_payload(result)
 
     if args.debug_tx_planar_spiral:
@@ -43,41 +66,31 @@ def main(argv: list[str] | None = None) -> int:
             }
         else:
             frame = tx_coil_face_frame_for_name(result.sample, first.face)
-            dd = None
-            if first.spiral_count == 2:
-                dd = DdSplit(axis_idx=first.dd_split_axis_idx, gap_mm=first.dd_gap_mm, ratio=first.dd_split_ratio)
-
-            masks = build_planar_rect_spiral_masks(
+            coil_geometry = planar_coil_geometry(
+                first,
                 face_u_size_mm=frame.face_u_size_mm,
                 face_v_size_mm=frame.face_v_size_mm,
-                spiral_count=first.spiral_count,
-                turns=first.spiral_turns,
-                direction_idx=first.spiral_direction_idx,
-                start_edge_idx=first.spiral_start_edge_idx,
-                edge_clearance_mm=first.edge_clearance_mm,
-                fill_scale=first.fill_scale,
-                pitch_duty=first.pitch_duty,
-                min_trace_width_mm=first.min_trace_width_mm,
-                min_trace_gap_mm=first.min_trace_gap_mm,
-                dd=dd,
+                pcb_layer_count=result.sample.tx_pcb.layer_count,
+                with_overlap=True,
+                overlap_method=result.spec.tx.coil.overlap_method,
             )
-
-            effective_trace_layers = min(result.sample.tx_pcb.layer_count, first.trace_layer_count)
-            layer_mode_idx_effective = first.layer_mode_idx if effective_trace_layers >= 2 else 0
             payload["debug"] = {
                 "tx_planar_spiral_face": frame.name,
-                "tx_planar_spiral_masks": [to_dict(mask) for mask in masks],
-                "tx_planar_spiral_layered": [
-                    to_dict(layered)
-                    for layered in layer_rect_spirals(
-                        masks,
-                        layer_mode_idx=layer_mode_idx_effective,
-                        radial_split_top_turn_fraction=first.radial_split_top_turn_fraction,
-                        radial_split_outer_is_top=first.radial_split_outer_is_top,
-                    )
-                ],
+                "tx_planar_spiral_masks": [to_dict(mask) for mask in coil_geometry.masks],
+                "tx_planar_spiral_layered": [to_dict(layered) for layered in coil_geometry.layered],
             }
 
+    if args.aedt_script_out:
+        args.aedt_script_out.write_text(
+            compile_plan_script(
+                result.geometry,
+                project_name="type1",
+                design_name=f"type1_{args.seed}",
+                core_material=result.sample.materials_core,
+            ),
+            encoding="utf-8",
+        )
+
     text = json.dumps(payload, indent=2, sort_keys=True)
 
     if args.out:
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from peetsfea.pipeline.catalog import GeneCatalog, build_gene_catalog
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build / query the SQLite gene catalog of a peetsfea dataset")
+    parser.add_argument("out", type=Path, help="Dataset root output directory (the dataset_cli --out)")
+    parser.add_argument("--build", action="store_true", help="(Re)index every sample directory under OUT first")
+    parser.add_argument("--sample", type=str, default=None, help="SQL condition on samples (e.g. 'core_core_gap_mm < 106')")
+    parser.add_argument("--instance", type=str, default=None, help="SQL condition on TX coil instances (e.g. 'spiral_count = 2')")
+    parser.add_argument("--spiral", type=str, default=None, help="SQL condition on spirals of a matching instance (e.g. 'turns >= 15')")
+    parser.add_argument("--spec-hash", type=str, default=None, help="Only samples of this spec hash")
+    parser.add_argument("--status", type=str, default="ok", help="Only samples with this run status (default: ok; 'any' for all)")
+
+    args = parser.parse_args(argv)
+    if args.build:
+        print(f"indexed: {build_gene_catalog(args.out)}")
+    with GeneCatalog.for_dataset(args.out) as catalog:
+        seeds = catalog.select_seeds(
+            args.sample,
+            instance=args.instance,
+            spiral=args.spiral,
+            spec_hash=args.spec_hash,
+            status=None if args.status == "any" else args.status,
+        )
+    # One line, ready for `dataset_cli --seed`-style scripting.
+    print(" ".join(str(seed) for seed in seeds))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,8 +3,13 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from peetsfea.aedt.maxwell3d_adapter import Maxwell3dConfig
-from peetsfea.pipeline.dataset import write_type1_dataset_sample
+from peetsfea.aedt.maxwell3d_adapter import (
+    BUILD_MODES,
+    UNITE_STRATEGIES,
+    Maxwell3dConfig,
+)
+from peetsfea.pipeline.dataset import write_type1_dataset_samples
+from peetsfea.pipeline.layout import DATASET_LAYOUTS
 
 
 def _seed_list(args) -> list[int]:
@@ -40,10 +45,90 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--new-desktop", action="store_true", help="Force new AEDT desktop instance")
     parser.add_argument("--close-on-exit", action="store_true", help="Close AEDT on exit (best effort)")
     parser.add_argument("--solution-type", type=str, default="Magnetostatic", help="Maxwell solution type")
+    parser.add_argument(
+        "--aedt-pool-size",
+        type=int,
+        default=0,
+        help="Long-lived AEDT desktops shared across samples (default: 0 = attach per sample)",
+    )
+    parser.add_argument(
+        "--aedt-recycle-after",
+        type=int,
+        default=25,
+        help="Restart a pooled desktop after this many designs (default: 25)",
+    )
+    parser.add_argument(
+        "--aedt-reuse-designs",
+        action="store_true",
+        help="Reuse open designs with the same topology signature; push only changed variables",
+    )
 
+    parser.add_argument(
+        "--aedt-build-mode",
+        choices=BUILD_MODES,
+        default="api",
+        help="api: one pyaedt call per object; script: one generated AEDT script per design (RunScript)",
+    )
+    parser.add_argument(
+        "--unite-strategy",
+        choices=UNITE_STRATEGIES,
+        default="single",
+        help="How coil unites are issued to AEDT (timings in maxwell/results.json)",
+    )
+    parser.add_argument(
+        "--unite-chunk-size",
+        type=int,
+        default=32,
+        help="Objects per unite call for --unite-strategy tree (default: 32)",
+    )
+    parser.add_argument(
+        "--parametric-coil",
+        action="store_true",
+        help="Express TX coil boxes in per-instance design variables (pairs with --aedt-reuse-designs)",
+    )
+    parser.add_argument(
+        "--coil-emission",
+        choices=("boxes", "polyline"),
+        default="boxes",
+        help="TX trace geometry: one box per segment, or one swept polyline per layer run",
+    )
+    parser.add_argument(
+        "--no-plan-check",
+        action="store_true",
+        help="Skip the offline size/interference check that runs before each AEDT build",
+    )
+    parser.add_argument(
+        "--columnar",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Also write genes/derived features of the sweep as one memory-mappable columnar table",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=DATASET_LAYOUTS,
+        default=None,
+        help="Sample directory placement for a new --out root (default: the root's own, else flat)",
+    )
+    parser.add_argument(
+        "--catalog",
+        action="store_true",
+        help="Upsert each written sample's genes into <out>/type1/catalog.sqlite (see dataset_catalog_cli)",
+    )
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing sample output")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for non-AEDT sweeps (default: 1)")
 
     args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.jobs > 1 and args.aedt:
+        parser.error("--jobs > 1 cannot be combined with --aedt")
+    if args.aedt_pool_size < 0:
+        parser.error("--aedt-pool-size must be >= 0")
+    if args.aedt_recycle_after < 1:
+        parser.error("--aedt-recycle-after must be >= 1")
+    if args.unite_chunk_size < 2:
+        parser.error("--unite-chunk-size must be >= 2")
 
     seeds_list = _seed_list(args)
     cfg = Maxwell3dConfig(
@@ -51,18 +136,30 @@ def main(argv: list[str] | None = None) -> int:
         non_graphical=args.non_graphical,
         new_desktop=args.new_desktop,
         close_on_exit=args.close_on_exit,
+        unite_strategy=args.unite_strategy,
+        unite_chunk_size=args.unite_chunk_size,
+        build_mode=args.aedt_build_mode,
     )
 
-    for seed in seeds_list:
-        result = write_type1_dataset_sample(
-            args.spec,
-            seed=seed,
-            out_root=args.out,
-            project_name=args.project_name,
-            build_aedt=args.aedt,
-            maxwell_config=cfg,
-            overwrite=args.overwrite,
-        )
+    for result in write_type1_dataset_samples(
+        args.spec,
+        seeds_list,
+        out_root=args.out,
+        project_name=args.project_name,
+        build_aedt=args.aedt,
+        maxwell_config=cfg,
+        overwrite=args.overwrite,
+        jobs=args.jobs,
+        aedt_pool_size=args.aedt_pool_size,
+        aedt_recycle_after=args.aedt_recycle_after,
+        aedt_reuse_designs=args.aedt_reuse_designs,
+        parametric_coil=args.parametric_coil,
+        coil_emission=args.coil_emission,
+        plan_check=not args.no_plan_check,
+        columnar_out=args.columnar,
+        layout=args.layout,
+        catalog=args.catalog,
+    ):
         print(f"{result.status}: {result.sample_dir}")
 
     return 0
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from peetsfea.pipeline.layout import migrate_dataset_layout
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Move a flat peetsfea dataset root to the sharded layout")
+    parser.add_argument("out", type=Path, help="Dataset root output directory (the dataset_cli --out)")
+
+    args = parser.parse_args(argv)
+    result = migrate_dataset_layout(args.out)
+    print(f"moved: {result.moved}")
+    print(f"moved incomplete (no meta.json): {result.moved_incomplete}")
+    print(f"already sharded: {result.already_sharded}")
+    for name in result.skipped:
+        print(f"skipped (not a sample directory): {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
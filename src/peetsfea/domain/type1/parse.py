@@ -279,6 +279,14 @@ def parse_type1_spec_dict(data: dict[str, Any]) -> Type1Spec:
         ],
     )
 
+    sampler = str(tx_coil_data.get("sampler", "rejection_v1"))
+    if sampler not in ("rejection_v1", "feasible_v1"):
+        raise SpecValidationError("tx.coil.sampler must be 'rejection_v1' or 'feasible_v1'")
+
+    overlap_method = str(tx_coil_data.get("overlap_method", "grid"))
+    if overlap_method not in ("grid", "exact"):
+        raise SpecValidationError("tx.coil.overlap_method must be 'grid' or 'exact'")
+
     max_spiral_count = _as_int(tx_coil_data.get("max_spiral_count"), 2)
     if max_spiral_count != 2:
         raise SpecValidationError("tx.coil.max_spiral_count must be 2 (fixed)")
@@ -324,10 +332,21 @@ def parse_type1_spec_dict(data: dict[str, Any]) -> Type1Spec:
         tx_coil_data.get("inner_spacing_ratio_half"), "tx.coil.inner_spacing_ratio_half", half_len
     )
 
+    inductance_uh: tuple[float, float] | None = None
+    raw_inductance = tx_coil_data.get("inductance_uh")
+    if raw_inductance is not None:
+        if not isinstance(raw_inductance, list) or len(raw_inductance) != 2:
+            raise SpecValidationError("tx.coil.inductance_uh must be [min, max]")
+        inductance_uh = (_as_float(raw_inductance[0], 0.0), _as_float(raw_inductance[1], 0.0))
+        if not (0.0 <= inductance_uh[0] < inductance_uh[1]):
+            raise SpecValidationError("tx.coil.inductance_uh must satisfy 0 <= min < max")
+
     tx_coil = TxCoilSpec(
         schema=schema,
         type=str(tx_coil_data.get("type")),
         pattern=str(tx_coil_data.get("pattern")),
+        sampler=sampler,
+        overlap_method=overlap_method,
         min_trace_width_mm=_range_from_value(tx_coil_data.get("min_trace_width_mm"), tx_coil_data.get("min_trace_width_mm")),
         min_trace_gap_mm=_range_from_value(tx_coil_data.get("min_trace_gap_mm"), tx_coil_data.get("min_trace_gap_mm")),
         edge_clearance_mm=_range_from_value(tx_coil_data.get("edge_clearance_mm"), tx_coil_data.get("edge_clearance_mm")),
@@ -354,6 +373,7 @@ def parse_type1_spec_dict(data: dict[str, Any]) -> Type1Spec:
         inner_pcb_count=_int_range_from_value(tx_coil_data.get("inner_pcb_count"), tx_coil_data.get("inner_pcb_count")),
         inner_spacing_ratio_half=inner_spacing_ratio_half,
         instances=tuple(instances),
+        inductance_uh=inductance_uh,
     )
 
     _validate_range_spec("tx.coil.min_trace_width_mm", tx_coil.min_trace_width_mm)
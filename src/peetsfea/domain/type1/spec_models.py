@@ -91,6 +91,8 @@ class TxCoilSpec:
     schema: str
     type: str
     pattern: str
+    sampler: str  # "rejection_v1" (legacy) | "feasible_v1"
+    overlap_method: str  # derived top/bottom overlap estimate: "grid" (legacy) | "exact"
 
     # Manufacturing-ish constraints (gene ranges)
     min_trace_width_mm: RangeSpec
@@ -121,6 +123,8 @@ class TxCoilSpec:
     inner_pcb_count: IntRangeSpec
     inner_spacing_ratio_half: tuple[RangeSpec, ...]
     instances: tuple[TxCoilInstanceSpec, ...]
+    # Optional pre-screen: [min, max] analytic self-inductance per present instance (uH).
+    inductance_uh: tuple[float, float] | None = None
 
 
 @dataclass(frozen=True)
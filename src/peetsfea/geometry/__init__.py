@@ -1,4 +1,20 @@
-from .plan import BoxPlan, DesignVariable, GeometryPlan, ParametricBoxPlan, ParametricGeometryPlan
+from .plan import (
+    BoxPlan,
+    DesignVariable,
+    GeometryPlan,
+    ParametricBoxPlan,
+    ParametricGeometryPlan,
+    ParametricPolylinePlan,
+    parametric_plan_signature,
+)
+from .plan_eval import (
+    PlanBoxArrays,
+    PlanCheckReport,
+    PlanInterference,
+    check_parametric_plan,
+    evaluate_plan_boxes,
+    evaluate_plan_variables,
+)
 
 __all__ = [
     "BoxPlan",
@@ -6,4 +22,12 @@ __all__ = [
     "GeometryPlan",
     "ParametricBoxPlan",
     "ParametricGeometryPlan",
+    "ParametricPolylinePlan",
+    "PlanBoxArrays",
+    "PlanCheckReport",
+    "PlanInterference",
+    "check_parametric_plan",
+    "evaluate_plan_boxes",
+    "evaluate_plan_variables",
+    "parametric_plan_signature",
 ]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from fractions import Fraction
+
+# Linear expressions over named design variables: a sum of rational multiples of symbols plus
+# a rational constant. This is the only kind of expression the type1 builders produce, so it
+# replaces sympy there. `sstr` prints exactly what sympy's `sstr` printed for the same
+# expression (order="lex", sympy's default, or order="none": Add args in canonical order),
+# which keeps plans and their topology signatures byte-identical.
+
+Coefficient = int | Fraction
+
+# sympy `ordering_of_classes` ranks of the coefficient classes a Mul can carry.
+_HALF_RANK = 2
+_NEGATIVE_ONE_RANK = 5
+_INTEGER_RANK = 7
+_RATIONAL_RANK = 8
+
+
+class LinearExpr:
+    __slots__ = ("const", "terms")
+
+    def __init__(self, terms: dict[str, Fraction] | None = None, const: Fraction = Fraction(0)) -> None:
+        # terms: symbol name -> non-zero coefficient.
+        self.terms = terms if terms is not None else {}
+        self.const = const
+
+    def __add__(self, other: LinearExpr | Coefficient) -> LinearExpr:
+        rhs = _lift(other)
+        terms = dict(self.terms)
+        for name, coeff in rhs.terms.items():
+            value = terms.get(name, 0) + coeff
+            if value:
+                terms[name] = value
+            else:
+                terms.pop(name, None)
+        return LinearExpr(terms, self.const + rhs.const)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> LinearExpr:
+        return LinearExpr({name: -coeff for name, coeff in self.terms.items()}, -self.const)
+
+    def __sub__(self, other: LinearExpr | Coefficient) -> LinearExpr:
+        return self + -_lift(other)
+
+    def __rsub__(self, other: Coefficient) -> LinearExpr:
+        return _lift(other) + -self
+
+    def __mul__(self, other: Coefficient) -> LinearExpr:
+        if not isinstance(other, (int, Fraction)) or isinstance(other, bool):
+            return NotImplemented
+        if other == 0:
+            return LinearExpr()
+        factor = Fraction(other)
+        return LinearExpr({name: coeff * factor for name, coeff in self.terms.items()}, self.const * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Coefficient) -> LinearExpr:
+        if not isinstance(other, (int, Fraction)) or isinstance(other, bool):
+            return NotImplemented
+        return self * (1 / Fraction(other))
+
+    def __repr__(self) -> str:
+        return f"LinearExpr({sstr(self)!r})"
+
+
+def symbol(name: str) -> LinearExpr:
+    return LinearExpr({name: Fraction(1)})
+
+
+def _lift(value: LinearExpr | Coefficient) -> LinearExpr:
+    if isinstance(value, LinearExpr):
+        return value
+    if isinstance(value, (int, Fraction)) and not isinstance(value, bool):
+        return LinearExpr(const=Fraction(value))
+    raise TypeError(f"Unsupported operand for LinearExpr: {value!r}")
+
+
+def _print_term(name: str, coeff: Fraction) -> str:
+    # sympy Mul printing: -x, 3*x, x/2, -3*x/2.
+    sign = "-" if coeff < 0 else ""
+    magnitude = abs(coeff)
+    numerator = "" if magnitude.numerator == 1 else f"{magnitude.numerator}*"
+    denominator = "" if magnitude.denominator == 1 else f"/{magnitude.denominator}"
+    return f"{sign}{numerator}{name}{denominator}"
+
+
+def _canonical_key(item: tuple[str, Fraction]) -> tuple:
+    # sympy Basic.compare for Symbol / Mul(coeff, Symbol): Symbols first, then Muls by
+    # coefficient class rank, (p, q), then symbol name.
+    name, coeff = item
+    if coeff == 1:
+        return (0, 0, 0, 0, name)
+    if coeff == Fraction(1, 2):
+        rank = _HALF_RANK
+    elif coeff == -1:
+        rank = _NEGATIVE_ONE_RANK
+    elif coeff.denominator == 1:
+        rank = _INTEGER_RANK
+    else:
+        rank = _RATIONAL_RANK
+    return (1, rank, coeff.numerator, coeff.denominator, name)
+
+
+def sstr(expr: LinearExpr, order: str = "lex") -> str:
+    if order == "lex":
+        # Symbols alphabetically (monomials in lex order), the constant last.
+        parts = [_print_term(name, expr.terms[name]) for name in sorted(expr.terms)]
+        if expr.const:
+            # sympy special case: `c - k*x` with c > 0 keeps the constant first.
+            if len(parts) == 1 and expr.const > 0 and next(iter(expr.terms.values())) < 0:
+                parts.insert(0, str(expr.const))
+            else:
+                parts.append(str(expr.const))
+    elif order == "none":
+        # Add args: the constant first, then Basic.compare order.
+        parts = [str(expr.const)] if expr.const else []
+        parts.extend(_print_term(name, coeff) for name, coeff in sorted(expr.terms.items(), key=_canonical_key))
+    else:
+        raise ValueError(f"Unknown order: {order!r}")
+
+    if not parts:
+        return "0"
+    out = parts[0]
+    for part in parts[1:]:
+        if part.startswith("-"):
+            out += f" - {part[1:]}"
+        else:
+            out += f" + {part}"
+    return out
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field
+from hashlib import sha256
 
 
 @dataclass(frozen=True)
@@ -44,9 +46,55 @@ class ParametricBoxPlan:
     model: bool
 
 
+@dataclass(frozen=True)
+class ParametricPolylinePlan:
+    # Polyline swept with a cross-section (AEDT create_polyline + xsection_*).
+    name: str
+    points_expr: tuple[tuple[str, str, str], ...]
+    xsection_width: str
+    xsection_height: str
+    material: str
+    model: bool
+    xsection_type: str = "Rectangle"
+    xsection_orient: str = "Auto"
+    xsection_bend_type: str = "Corner"
+
+
 @dataclass(frozen=True)
 class ParametricGeometryPlan:
     units_length: str
     variables: list[DesignVariable]
     boxes: list[ParametricBoxPlan]
     operations: list[OperationPlan] = field(default_factory=list)
+    polylines: list[ParametricPolylinePlan] = field(default_factory=list)
+
+
+def parametric_plan_signature(plan: ParametricGeometryPlan) -> str:
+    # Topology signature: everything that decides which AEDT objects exist and how they are
+    # built (variable names/kinds, expression strings, boxes, operations), but not the values
+    # of independent variables. Two plans with the same signature differ only in variable edits.
+    payload = {
+        "units": plan.units_length,
+        "variables": [
+            [v.name, v.units, v.is_expression, v.value if v.is_expression else None] for v in plan.variables
+        ],
+        "boxes": [[b.name, list(b.corner_expr), list(b.size_expr), b.material, b.model] for b in plan.boxes],
+        "operations": [[o.op, list(o.targets), list(o.tools), o.keep_originals] for o in plan.operations],
+    }
+    if plan.polylines:
+        payload["polylines"] = [
+            [
+                p.name,
+                [list(pt) for pt in p.points_expr],
+                p.xsection_type,
+                p.xsection_orient,
+                p.xsection_width,
+                p.xsection_height,
+                p.xsection_bend_type,
+                p.material,
+                p.model,
+            ]
+            for p in plan.polylines
+        ]
+    data = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return sha256(data).hexdigest()
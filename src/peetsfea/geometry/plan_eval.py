@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import functools
+import re
+import time
+from collections.abc import Collection
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from peetsfea.geometry.plan import DesignVariable, ParametricGeometryPlan
+
+# Offline numeric view of a ParametricGeometryPlan: every variable / corner / size expression is
+# resolved against `plan.variables` (no AEDT), boxes become (n, 3) lo/hi arrays, and swept
+# polylines become one AABB per segment. `check_parametric_plan` then flags non-positive box
+# sizes and overlaps between different bodies (a body = one unite group, or a lone object),
+# so broken samples can be dropped before a desktop is launched.
+
+_TOL = 1e-9
+
+_LENGTH_SCALE_MM = {"nm": 1e-6, "um": 1e-3, "mm": 1.0, "cm": 10.0, "m": 1000.0, "mil": 0.0254, "in": 25.4}
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?P<unit>[A-Za-z]+)?"
+    r"|(?P<name>[A-Za-z_$][A-Za-z0-9_]*)"
+    r"|(?P<op>[-+*/()])"
+    r")"
+)
+
+
+def _unit_scale(unit: str | None, units: str) -> float:
+    if unit is None or unit == units:
+        return 1.0
+    try:
+        return _LENGTH_SCALE_MM[unit] / _LENGTH_SCALE_MM[units]
+    except KeyError:
+        raise ValueError(f"Unsupported length unit: {unit!r}") from None
+
+
+@functools.lru_cache(maxsize=65536)
+def _compile_expr(text: str, units: str) -> tuple[Any, tuple[str, ...]]:
+    # Only numbers, names and + - * / ( ) are accepted, so the translated Python expression
+    # has the same precedence and nothing else to execute.
+    parts: list[str] = []
+    names: list[str] = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"Cannot parse expression {text!r} at {pos}")
+        pos = m.end()
+        if m.group("num") is not None:
+            value = float(m.group("num")) * _unit_scale(m.group("unit"), units)
+            parts.append(repr(value))
+        elif m.group("name") is not None:
+            names.append(m.group("name"))
+            parts.append(f"v[{m.group('name')!r}]")
+        else:
+            parts.append(m.group("op"))
+    if not parts:
+        raise ValueError("Empty expression")
+    return compile(" ".join(parts), "<plan-expr>", "eval"), tuple(names)
+
+
+def _eval_expr(text: str, units: str, values: dict[str, float]) -> float:
+    code, _ = _compile_expr(text, units)
+    return float(eval(code, {"__builtins__": {}}, {"v": values}))
+
+
+def evaluate_plan_variables(plan: ParametricGeometryPlan) -> dict[str, float]:
+    units = plan.units_length
+    by_name: dict[str, DesignVariable] = {var.name: var for var in plan.variables}
+    values: dict[str, float] = {}
+    resolving: set[str] = set()
+
+    def resolve(name: str) -> float:
+        if name in values:
+            return values[name]
+        var = by_name.get(name)
+        if var is None:
+            raise ValueError(f"Unknown design variable: {name}")
+        if name in resolving:
+            raise ValueError(f"Cyclic design variable: {name}")
+        if isinstance(var.value, str):
+            resolving.add(name)
+            _, deps = _compile_expr(var.value, units)
+            for dep in deps:
+                resolve(dep)
+            value = _eval_expr(var.value, units, values)
+            resolving.discard(name)
+        else:
+            value = float(var.value) * _unit_scale(var.units, units)
+        values[name] = value
+        return value
+
+    for var in plan.variables:
+        resolve(var.name)
+    return values
+
+
+@dataclass(frozen=True)
+class PlanBoxArrays:
+    # One row per box, then one row per polyline segment ("{polyline}#{k}").
+    names: tuple[str, ...]
+    lo: np.ndarray
+    hi: np.ndarray
+    size: np.ndarray  # signed box size; polyline rows are always positive
+    materials: tuple[str, ...]
+    model: np.ndarray
+    # Body index per row and the body's AEDT name (first unite target or the object itself).
+    body: np.ndarray
+    body_names: tuple[str, ...]
+
+
+def _polyline_segment_bounds(
+    points: np.ndarray, width: float, height: float, name: str
+) -> tuple[np.ndarray, np.ndarray]:
+    # Rectangle cross-section swept along an axis-aligned planar path: height along the plane
+    # normal, width across the path; Corner bends reach w/2 past interior vertices only.
+    flat = np.flatnonzero(np.ptp(points, axis=0) <= _TOL)
+    step = points[1:] - points[:-1]
+    travel = np.argmax(np.abs(step), axis=1)
+    rows = np.arange(step.shape[0])
+    if len(flat) == 0 or np.any(np.count_nonzero(np.abs(step) > _TOL, axis=1) > 1):
+        raise ValueError(f"Only axis-aligned planar polylines are supported: {name}")
+    ext_lo = np.full(step.shape, 0.5 * width)
+    ext_lo[:, int(flat[0])] = 0.5 * height
+    ext_hi = ext_lo.copy()
+    forward = step[rows, travel] > 0
+    at_start = np.where(rows > 0, 0.5 * width, 0.0)
+    at_end = np.where(rows < len(rows) - 1, 0.5 * width, 0.0)
+    ext_lo[rows, travel] = np.where(forward, at_start, at_end)
+    ext_hi[rows, travel] = np.where(forward, at_end, at_start)
+    return np.minimum(points[:-1], points[1:]) - ext_lo, np.maximum(points[:-1], points[1:]) + ext_hi
+
+
+def _bodies(plan: ParametricGeometryPlan, names: list[str]) -> tuple[list[int], list[str], set[tuple[int, int]], set[str]]:
+    # Union-find over unite targets; subtract blank/tool body pairs are allowed to overlap and
+    # consumed tools no longer exist afterwards.
+    parent = list(range(len(names)))
+    index = {name: i for i, name in enumerate(names)}
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    subtracts: list[tuple[list[int], list[int]]] = []
+    consumed: set[str] = set()
+    for op in plan.operations:
+        targets = [index[name] for name in op.targets if name in index]
+        if op.op == "unite":
+            for i in targets[1:]:
+                root, other = find(targets[0]), find(i)
+                if root != other:
+                    # Keep the lower index as root so the body name is the unite anchor.
+                    parent[max(root, other)] = min(root, other)
+        elif op.op == "subtract":
+            tools = [index[name] for name in op.tools if name in index]
+            subtracts.append((targets, tools))
+            if not op.keep_originals:
+                consumed.update(op.tools)
+        else:
+            raise ValueError(f"Unknown operation: {op.op!r}")
+
+    roots = [find(i) for i in range(len(names))]
+    order = {root: k for k, root in enumerate(dict.fromkeys(roots))}
+    body = [order[root] for root in roots]
+    body_names = [names[root] for root in order]
+    allowed = {
+        (min(body[t], body[u]), max(body[t], body[u])) for blanks, tools in subtracts for t in blanks for u in tools
+    }
+    return body, body_names, allowed, consumed
+
+
+def evaluate_plan_boxes(plan: ParametricGeometryPlan, values: dict[str, float] | None = None) -> PlanBoxArrays:
+    units = plan.units_length
+    if values is None:
+        values = evaluate_plan_variables(plan)
+
+    box_values = np.array(
+        [[_eval_expr(e, units, values) for e in (*box.corner_expr, *box.size_expr)] for box in plan.boxes],
+        dtype=np.float64,
+    ).reshape(len(plan.boxes), 6)
+    corner, size = box_values[:, :3], box_values[:, 3:]
+    los = [np.minimum(corner, corner + size)]
+    his = [np.maximum(corner, corner + size)]
+    sizes = [size]
+    row_names = [box.name for box in plan.boxes]
+    row_object = list(range(len(plan.boxes)))
+    materials = [box.material for box in plan.boxes]
+    model = [box.model for box in plan.boxes]
+
+    object_names = [box.name for box in plan.boxes]
+    for line in plan.polylines:
+        points = np.array([[_eval_expr(e, units, values) for e in p] for p in line.points_expr], dtype=np.float64)
+        width = _eval_expr(line.xsection_width, units, values)
+        height = _eval_expr(line.xsection_height, units, values)
+        lo, hi = _polyline_segment_bounds(points, width, height, line.name)
+        los.append(lo)
+        his.append(hi)
+        sizes.append(hi - lo)
+        row_names.extend(f"{line.name}#{k}" for k in range(lo.shape[0]))
+        row_object.extend([len(object_names)] * lo.shape[0])
+        materials.extend([line.material] * lo.shape[0])
+        model.extend([line.model] * lo.shape[0])
+        object_names.append(line.name)
+
+    body, body_names, _, _ = _bodies(plan, object_names)
+    return PlanBoxArrays(
+        names=tuple(row_names),
+        lo=np.concatenate(los),
+        hi=np.concatenate(his),
+        size=np.concatenate(sizes),
+        materials=tuple(materials),
+        model=np.array(model, dtype=bool),
+        body=np.array([body[k] for k in row_object], dtype=np.int64),
+        body_names=tuple(body_names),
+    )
+
+
+@dataclass(frozen=True)
+class PlanInterference:
+    # Two bodies whose boxes overlap with positive volume (summed over the overlapping box pairs).
+    a: str
+    b: str
+    box_pairs: int
+    overlap_mm3: float
+
+
+@dataclass(frozen=True)
+class PlanCheckReport:
+    ok: bool
+    box_count: int
+    nonpositive: list[str]
+    interferences: list[PlanInterference]
+    duration_ms: float
+
+
+def _overlap(lo_a: np.ndarray, hi_a: np.ndarray, lo_b: np.ndarray, hi_b: np.ndarray) -> np.ndarray:
+    # (len(a), len(b), 3) per-axis overlap lengths; negative where the boxes are apart.
+    return np.minimum(hi_a[:, None, :], hi_b[None, :, :]) - np.maximum(lo_a[:, None, :], lo_b[None, :, :])
+
+
+def find_interferences(
+    lo: np.ndarray,
+    hi: np.ndarray,
+    body: np.ndarray,
+    *,
+    model: np.ndarray | None = None,
+    skip: np.ndarray | None = None,
+    allowed: Collection[tuple[int, int]] = (),
+    tol: float = _TOL,
+) -> list[tuple[int, int, int, float]]:
+    # Two-level check: body AABBs first (a body is usually hundreds of coil boxes), then
+    # all-pairs row overlap only for body pairs whose AABBs intersect. Touching faces
+    # (overlap <= tol on any axis), rows of the same body and, given `model`, pairs with a
+    # non-model row (never meshed) do not count. Returns (body_a, body_b, box_pairs, volume).
+    active = np.ones(lo.shape[0], dtype=bool) if skip is None else ~skip
+    rows = [np.flatnonzero(active & (body == k)) for k in range(int(body.max(initial=-1)) + 1)]
+    present = [k for k, r in enumerate(rows) if len(r)]
+    if len(present) < 2:
+        return []
+    body_lo = np.array([lo[rows[k]].min(axis=0) for k in present])
+    body_hi = np.array([hi[rows[k]].max(axis=0) for k in present])
+    candidates = np.all(_overlap(body_lo, body_hi, body_lo, body_hi) > tol, axis=2)
+
+    found: list[tuple[int, int, int, float]] = []
+    for p, q in zip(*np.nonzero(np.triu(candidates, k=1))):
+        a, b = present[p], present[q]
+        if (a, b) in allowed:
+            continue
+        rows_a, rows_b = rows[a], rows[b]
+        overlap = _overlap(lo[rows_a], hi[rows_a], lo[rows_b], hi[rows_b])
+        hit = np.all(overlap > tol, axis=2)
+        if model is not None:
+            hit &= model[rows_a][:, None] & model[rows_b][None, :]
+        count = int(np.count_nonzero(hit))
+        if count:
+            found.append((a, b, count, float(np.prod(overlap[hit], axis=1).sum())))
+    return found
+
+
+def check_parametric_plan(
+    plan: ParametricGeometryPlan,
+    *,
+    ignore: Collection[str] = (),
+    include_non_model: bool = False,
+    tol: float = _TOL,
+) -> PlanCheckReport:
+    # `ignore`: object names left out of the overlap check (e.g. envelope/region boxes).
+    # Overlaps involving a non-model object (e.g. Wall_NonModel, which coil traces may cross)
+    # are only reported with include_non_model=True.
+    start = time.perf_counter()
+    arrays = evaluate_plan_boxes(plan)
+    nonpositive = [arrays.names[k] for k in np.flatnonzero(np.any(arrays.size <= tol, axis=1))]
+
+    object_names = [box.name for box in plan.boxes] + [line.name for line in plan.polylines]
+    _, _, allowed, consumed = _bodies(plan, object_names)
+    skipped = set(ignore) | consumed
+    skip = np.array([name.split("#", 1)[0] in skipped for name in arrays.names], dtype=bool)
+    pairs = find_interferences(
+        arrays.lo,
+        arrays.hi,
+        arrays.body,
+        model=None if include_non_model else arrays.model,
+        skip=skip,
+        allowed=allowed,
+        tol=tol,
+    )
+    to_mm3 = _unit_scale(plan.units_length, "mm") ** 3
+    interferences = [
+        PlanInterference(
+            a=arrays.body_names[a], b=arrays.body_names[b], box_pairs=count, overlap_mm3=round(volume * to_mm3, 6)
+        )
+        for a, b, count, volume in pairs
+    ]
+    return PlanCheckReport(
+        ok=not nonpositive and not interferences,
+        box_count=len(arrays.names),
+        nonpositive=nonpositive,
+        interferences=interferences,
+        duration_ms=round((time.perf_counter() - start) * 1000.0, 3),
+    )
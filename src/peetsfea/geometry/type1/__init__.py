@@ -1,5 +1,16 @@
 from .builder import build_type1_parametric_geometry
-from .layer_modes import LayeredSpiral2D, Segment2D, layer_rect_spiral, layer_rect_spirals
+from .coil_cache import CoilGeometryCache, PlanarCoilGeometry, default_coil_geometry_cache, planar_coil_geometry
+from .inductance import CoilInductanceEstimate, SpiralInductanceEstimate, estimate_coil_inductance
+from .layer_modes import (
+    LayeredSpiral2D,
+    OverlapEstimate2D,
+    Segment2D,
+    SegmentArray,
+    estimate_overlap,
+    layer_rect_spiral,
+    layer_rect_spirals,
+)
+from .mutual import RxLoopParams, TxRxCouplingEstimate, estimate_tx_rx_coupling
 from .spiral_mask import (
     DdSplit,
     Rect2D,
@@ -8,21 +19,36 @@ from .spiral_mask import (
     build_planar_rect_spiral_masks,
     derive_rect_spiral,
     rect_spiral_polyline,
+    rect_spiral_polyline_array,
     split_dd_bounds,
 )
 
 __all__ = [
+    "CoilGeometryCache",
+    "CoilInductanceEstimate",
     "DdSplit",
     "LayeredSpiral2D",
+    "OverlapEstimate2D",
+    "PlanarCoilGeometry",
     "Rect2D",
     "RectSpiralDerived",
     "RectSpiralMask2D",
+    "RxLoopParams",
     "Segment2D",
+    "SegmentArray",
+    "SpiralInductanceEstimate",
+    "TxRxCouplingEstimate",
     "build_planar_rect_spiral_masks",
     "build_type1_parametric_geometry",
+    "default_coil_geometry_cache",
     "derive_rect_spiral",
+    "estimate_coil_inductance",
+    "estimate_overlap",
+    "estimate_tx_rx_coupling",
     "layer_rect_spiral",
     "layer_rect_spirals",
+    "planar_coil_geometry",
     "rect_spiral_polyline",
+    "rect_spiral_polyline_array",
     "split_dd_bounds",
 ]
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-import sympy as sp
+import functools
+from dataclasses import dataclass
+from fractions import Fraction
 
 from peetsfea.domain.type1.sampled_models import Type1Sample
+from peetsfea.geometry.expr import LinearExpr, sstr, symbol
 from peetsfea.geometry.plan import (
     BoxPlan,
     DesignVariable,
@@ -10,12 +13,21 @@ from peetsfea.geometry.plan import (
     OperationPlan,
     ParametricBoxPlan,
     ParametricGeometryPlan,
+    ParametricPolylinePlan,
 )
 from peetsfea.geometry.type1 import pcb_faces
-from peetsfea.geometry.type1.tx_coil_3d import build_tx_planar_trace_coils
+from peetsfea.geometry.type1.tx_coil_3d import (
+    build_tx_planar_trace_coils,
+    build_tx_polyline_trace_coils,
+)
+from peetsfea.geometry.type1.tx_coil_param import build_tx_parametric_trace_coils
 from peetsfea.logging_utils import log_action
 from peetsfea.sampling.rng import half_size
 
+COIL_EMISSIONS = ("boxes", "polyline")
+# Envelope boxes that contain other objects by design; left out of the offline plan check.
+PLAN_CHECK_IGNORE = ("TX_Module_Region",)
+
 
 def _add_box(
     boxes: list[BoxPlan],
@@ -46,60 +58,88 @@ def _lit(value: float, units: str) -> str:
     return f"{value}{units}"
 
 
-@log_action(
-    "build_type1_parametric_geometry",
-    lambda sample: {
-        "units": sample.units_length,
-        "tx_present": sample.tx_module.present,
-        "rx_present": sample.rx_module.present,
-        "pcb_layers": sample.tx_pcb.layer_count,
-    },
-)
-def build_type1_parametric_geometry(sample: Type1Sample) -> ParametricGeometryPlan:
-    units = sample.units_length
-    sym = sp.Symbol
-    half = sp.Rational(1, 2)  # pyright: ignore[reportOperatorIssue]
+# Everything outside the TX coil is a fixed set of expressions over the scene design variables;
+# which expressions/boxes exist only depends on the booleans below. One template is compiled per
+# signature and cached; per sample only the literal variable values (and the coil) are new.
 
-    def expr(value: sp.Expr) -> str:
-        return sp.sstr(value)
 
-    def var(name: str, value: float) -> DesignVariable:
-        return DesignVariable(name=name, value=value, units=units)
+@dataclass(frozen=True)
+class SceneSignature:
+    tv_present: bool
+    tv_model: bool
+    tx_present: bool
+    tx_model: bool
+    rx_present: bool
+    rx_model: bool
+    wall_present: bool
+    wall_model: bool
+    floor_present: bool
+    floor_model: bool
+    # TX faces carrying a coil PCB (pos_x, neg_x, pos_y, neg_y, pos_z, neg_z): they trim the core.
+    face_flags: tuple[bool, bool, bool, bool, bool, bool]
+
+
+@dataclass(frozen=True)
+class ScenePlanTemplate:
+    expressions: tuple[DesignVariable, ...]
+    boxes_before_coil: tuple[ParametricBoxPlan, ...]
+    boxes_after_coil: tuple[ParametricBoxPlan, ...]
+
+
+def _face_enabled(flag: bool, dim_a: float, dim_b: float) -> bool:
+    return flag and dim_a > 0 and dim_b > 0
+
+
+def _tx_face_flags(sample: Type1Sample) -> dict[str, bool]:
+    tx_thk_val = sample.tx_module.thickness_mm
+    tx_w_val = sample.tx_module.outer_w_mm
+    tx_h_val = sample.tx_module.outer_h_mm
+    return {
+        "pos_x": _face_enabled(sample.tx_coil.outer_faces.pos_x, tx_w_val, tx_h_val),
+        "neg_x": _face_enabled(sample.tx_coil.outer_faces.neg_x, tx_w_val, tx_h_val),
+        "pos_y": _face_enabled(sample.tx_coil.outer_faces.pos_y, tx_thk_val, tx_h_val),
+        "neg_y": _face_enabled(sample.tx_coil.outer_faces.neg_y, tx_thk_val, tx_h_val),
+        "pos_z": _face_enabled(sample.tx_coil.outer_faces.pos_z, tx_thk_val, tx_w_val),
+        "neg_z": _face_enabled(sample.tx_coil.outer_faces.neg_z, tx_thk_val, tx_w_val),
+    }
 
-    def dvar(name: str, value: sp.Expr) -> DesignVariable:
-        return DesignVariable(name=name, value=expr(value), is_expression=True)
 
-    def _face_enabled(flag: bool, dim_a: float, dim_b: float) -> bool:
-        if not flag or dim_a <= 0 or dim_b <= 0:
-            return False
-        return True
-
-    def _layer_sequence(
-        layer_count: int,
-        pcb_thk_s: sp.Expr,
-        outer_fr4_s: sp.Expr,
-        inner_fr4_s: sp.Expr,
-        copper_s: sp.Expr,
-    ) -> list[tuple[str, str, sp.Expr]]:
-        if layer_count == 1:
-            middle_fr4 = pcb_thk_s - (outer_fr4_s + inner_fr4_s + copper_s)  # pyright: ignore[reportOperatorIssue]
-            return [
-                ("FR4_Outer", "fr4", outer_fr4_s),
-                ("Cu_Outer", "copper", copper_s),
-                ("FR4_Middle", "fr4", middle_fr4),
-                ("FR4_Inner", "fr4", inner_fr4_s),
-            ]
-        middle_fr4 = pcb_thk_s - (outer_fr4_s + inner_fr4_s + copper_s + copper_s)  # pyright: ignore[reportOperatorIssue]
-        return [
-            ("FR4_Outer", "fr4", outer_fr4_s),
-            ("Cu_Outer", "copper", copper_s),
-            ("FR4_Middle", "fr4", middle_fr4),
-            ("Cu_Inner", "copper", copper_s),
-            ("FR4_Inner", "fr4", inner_fr4_s),
-        ]
+def scene_signature(sample: Type1Sample) -> SceneSignature:
+    flags = _tx_face_flags(sample)
+    return SceneSignature(
+        tv_present=sample.tv.present,
+        tv_model=sample.tv.model,
+        tx_present=sample.tx_module.present,
+        tx_model=sample.tx_module.model,
+        rx_present=sample.rx_module.present,
+        rx_model=sample.rx_module.model,
+        wall_present=sample.wall.present,
+        wall_model=sample.wall.model,
+        floor_present=sample.floor.present,
+        floor_model=sample.floor.model,
+        face_flags=(
+            flags["pos_x"],
+            flags["neg_x"],
+            flags["pos_y"],
+            flags["neg_y"],
+            flags["pos_z"],
+            flags["neg_z"],
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def scene_plan_template(signature: SceneSignature) -> ScenePlanTemplate:
+    sym = symbol
+    half = Fraction(1, 2)
+
+    def expr(value: LinearExpr) -> str:
+        return sstr(value)
+
+    def dvar(name: str, value: LinearExpr) -> DesignVariable:
+        return DesignVariable(name=name, value=expr(value), is_expression=True)
 
     wall_plane_x_s = sym("wall_plane_x")
-    floor_plane_z_s = sym("floor_plane_z")
     core_core_gap_s = sym("core_core_gap")
     tx_gap_from_tv_bottom_s = sym("tx_gap_from_tv_bottom")
 
@@ -113,7 +153,6 @@ def build_type1_parametric_geometry(sample: Type1Sample) -> ParametricGeometryPl
     tx_center_y_user_s = sym("tx_center_y_user")
     rx_center_y_user_s = sym("rx_center_y_user")
     tx_center_z_user_s = sym("tx_center_z_user")
-    rx_center_z_user_s = sym("rx_center_z_user")
 
     tv_cx_s = sym("tv_center_x")
     tv_cy_s = sym("tv_center_y")
@@ -136,162 +175,78 @@ def build_type1_parametric_geometry(sample: Type1Sample) -> ParametricGeometryPl
     floor_sx_s = sym("floor_sx")
     floor_sy_s = sym("floor_sy")
 
-    pcb_thk_val = sample.tx_pcb.total_thickness_mm or pcb_faces.PCB_THICKNESS_MM
-    fr4_outer_val = pcb_faces.FR4_OUTER_THICKNESS_MM
-    fr4_inner_val = pcb_faces.FR4_INNER_THICKNESS_MM
-    copper_val = pcb_faces.COPPER_THICKNESS_MM
-    air_gap_val = pcb_faces.AIR_GAP_MM
-
-    variables: list[DesignVariable] = [
-        var("wall_plane_x", sample.wall_plane_x_mm),
-        var("floor_plane_z", sample.floor_plane_z_mm),
-        var("core_core_gap", sample.core_core_gap_mm),
-        var("tx_gap_from_tv_bottom", sample.tx_gap_from_tv_bottom_mm),
-        var("pcb_thk", pcb_thk_val),
-        var("pcb_fr4_outer", fr4_outer_val),
-        var("pcb_fr4_inner", fr4_inner_val),
-        var("pcb_copper_thk", copper_val),
-        var("pcb_air_gap", air_gap_val),
-        var("tx_core_w", sample.tx_module.outer_w_mm),
-        var("tx_core_h", sample.tx_module.outer_h_mm),
-        var("rx_core_w", sample.rx_module.outer_w_mm),
-        var("rx_core_h", sample.rx_module.outer_h_mm),
-        var("tx_core_thk", sample.tx_module.thickness_mm),
-        var("rx_core_thk", sample.rx_module.thickness_mm),
-        var("tx_center_y_user", sample.tx_position.center_y_mm),
-        var("rx_center_y_user", sample.rx_position.center_y_mm),
-        var("tx_center_z_user", sample.tx_position.center_z_mm),
-        var("rx_center_z_user", sample.rx_position.center_z_mm),
-        var("tv_center_x", sample.tv.position.center_x_mm),
-        var("tv_center_y", sample.tv.position.center_y_mm),
-        var("tv_center_z", sample.tv.position.center_z_mm),
-        var("tv_w", sample.tv.width_mm),
-        var("tv_h", sample.tv.height_mm),
-        var("tv_thk", sample.tv.thickness_mm),
-        var("wall_center_x", sample.wall.position.center_x_mm),
-        var("wall_center_y", sample.wall.position.center_y_mm),
-        var("wall_center_z", sample.wall.position.center_z_mm),
-        var("wall_thk", sample.wall.thickness_mm),
-        var("wall_sy", sample.wall.size_y_mm),
-        var("wall_sz", sample.wall.size_z_mm),
-        var("floor_center_x", sample.floor.position.center_x_mm),
-        var("floor_center_y", sample.floor.position.center_y_mm),
-        var("floor_center_z", sample.floor.position.center_z_mm),
-        var("floor_thk", sample.floor.thickness_mm),
-        var("floor_sx", sample.floor.size_x_mm),
-        var("floor_sy", sample.floor.size_y_mm),
-    ]
-
-    if sample.tv.present:
-        tv_bottom_z_expr = tv_cz_s - tv_h_s * half  # pyright: ignore[reportOperatorIssue]
+    if signature.tv_present:
+        tv_bottom_z_expr = tv_cz_s - tv_h_s * half
         tx_center_y_expr = tv_cy_s
         rx_center_y_expr = tv_cy_s
-        tx_center_z_expr = tv_bottom_z_expr - tx_gap_from_tv_bottom_s - tx_core_h_s * half  # pyright: ignore[reportOperatorIssue]
-        rx_center_z_expr = tx_center_z_expr + tx_core_h_s * half + core_core_gap_s + rx_core_h_s * half  # pyright: ignore[reportOperatorIssue]
+        tx_center_z_expr = tv_bottom_z_expr - tx_gap_from_tv_bottom_s - tx_core_h_s * half
+        rx_center_z_expr = tx_center_z_expr + tx_core_h_s * half + core_core_gap_s + rx_core_h_s * half
     else:
         tx_center_y_expr = tx_center_y_user_s
         rx_center_y_expr = rx_center_y_user_s
         tx_center_z_expr = tx_center_z_user_s
-        rx_center_z_expr = tx_center_z_expr + tx_core_h_s * half + core_core_gap_s + rx_core_h_s * half  # pyright: ignore[reportOperatorIssue]
+        rx_center_z_expr = tx_center_z_expr + tx_core_h_s * half + core_core_gap_s + rx_core_h_s * half
 
-    tx_center_x_expr = wall_plane_x_s + tx_core_thk_s * half  # pyright: ignore[reportOperatorIssue]
-    tx_corner_y_expr = tx_center_y_expr - tx_core_w_s * half  # pyright: ignore[reportOperatorIssue]
-    tx_corner_z_expr = tx_center_z_expr - tx_core_h_s * half  # pyright: ignore[reportOperatorIssue]
-    rx_corner_y_expr = rx_center_y_expr - rx_core_w_s * half  # pyright: ignore[reportOperatorIssue]
-    rx_corner_z_expr = rx_center_z_expr - rx_core_h_s * half  # pyright: ignore[reportOperatorIssue]
+    tx_corner_y_expr = tx_center_y_expr - tx_core_w_s * half
+    tx_corner_z_expr = tx_center_z_expr - tx_core_h_s * half
+    rx_corner_y_expr = rx_center_y_expr - rx_core_w_s * half
+    rx_corner_z_expr = rx_center_z_expr - rx_core_h_s * half
 
-    tv_corner_x_expr = tv_cx_s - tv_thk_s * half  # pyright: ignore[reportOperatorIssue]
-    tv_corner_y_expr = tv_cy_s - tv_w_s * half  # pyright: ignore[reportOperatorIssue]
-    tv_corner_z_expr = tv_cz_s - tv_h_s * half  # pyright: ignore[reportOperatorIssue]
+    tv_corner_x_expr = tv_cx_s - tv_thk_s * half
+    tv_corner_y_expr = tv_cy_s - tv_w_s * half
+    tv_corner_z_expr = tv_cz_s - tv_h_s * half
 
-    wall_corner_x_expr = wall_cx_s - wall_thk_s * half  # pyright: ignore[reportOperatorIssue]
-    wall_corner_y_expr = wall_cy_s - wall_sy_s * half  # pyright: ignore[reportOperatorIssue]
-    wall_corner_z_expr = wall_cz_s - wall_sz_s * half  # pyright: ignore[reportOperatorIssue]
+    wall_corner_x_expr = wall_cx_s - wall_thk_s * half
+    wall_corner_y_expr = wall_cy_s - wall_sy_s * half
+    wall_corner_z_expr = wall_cz_s - wall_sz_s * half
 
-    floor_corner_x_expr = floor_cx_s - floor_sx_s * half  # pyright: ignore[reportOperatorIssue]
-    floor_corner_y_expr = floor_cy_s - floor_sy_s * half  # pyright: ignore[reportOperatorIssue]
-    floor_corner_z_expr = floor_cz_s - floor_thk_s * half  # pyright: ignore[reportOperatorIssue]
+    floor_corner_x_expr = floor_cx_s - floor_sx_s * half
+    floor_corner_y_expr = floor_cy_s - floor_sy_s * half
+    floor_corner_z_expr = floor_cz_s - floor_thk_s * half
 
     pcb_thk_s = sym("pcb_thk")
-    fr4_outer_s = sym("pcb_fr4_outer")
-    fr4_inner_s = sym("pcb_fr4_inner")
-    copper_s = sym("pcb_copper_thk")
     air_gap_s = sym("pcb_air_gap")
 
-    inward_offset_s = sp.Float(pcb_faces.INWARD_OFFSET_FACTOR) * pcb_thk_s * half  # pyright: ignore[reportOperatorIssue]
-    scale_s = sp.Float(pcb_faces.IN_PLANE_SCALE)
-
-    tx_thk_val = sample.tx_module.thickness_mm
-    tx_w_val = sample.tx_module.outer_w_mm
-    tx_h_val = sample.tx_module.outer_h_mm
-
-    face_flags = {
-        "pos_x": _face_enabled(sample.tx_coil.outer_faces.pos_x, tx_w_val, tx_h_val),
-        "neg_x": _face_enabled(sample.tx_coil.outer_faces.neg_x, tx_w_val, tx_h_val),
-        "pos_y": _face_enabled(sample.tx_coil.outer_faces.pos_y, tx_thk_val, tx_h_val),
-        "neg_y": _face_enabled(sample.tx_coil.outer_faces.neg_y, tx_thk_val, tx_h_val),
-        "pos_z": _face_enabled(sample.tx_coil.outer_faces.pos_z, tx_thk_val, tx_w_val),
-        "neg_z": _face_enabled(sample.tx_coil.outer_faces.neg_z, tx_thk_val, tx_w_val),
-    }
-
-    trim_dist_val = pcb_thk_val + air_gap_val
-    trim_x_pos_val = trim_dist_val if face_flags["pos_x"] else 0.0
-    trim_x_neg_val = trim_dist_val if face_flags["neg_x"] else 0.0
-    trim_y_pos_val = trim_dist_val if face_flags["pos_y"] else 0.0
-    trim_y_neg_val = trim_dist_val if face_flags["neg_y"] else 0.0
-    trim_z_pos_val = trim_dist_val if face_flags["pos_z"] else 0.0
-    trim_z_neg_val = trim_dist_val if face_flags["neg_z"] else 0.0
-
-    if sample.tx_module.present:
-        if tx_thk_val - trim_x_pos_val - trim_x_neg_val <= 0:
-            raise ValueError("TX module trimmed thickness must remain positive")
-        if tx_w_val - trim_y_pos_val - trim_y_neg_val <= 0:
-            raise ValueError("TX module trimmed width must remain positive")
-        if tx_h_val - trim_z_pos_val - trim_z_neg_val <= 0:
-            raise ValueError("TX module trimmed height must remain positive")
-
-    trim_dist_s = pcb_thk_s + air_gap_s  # pyright: ignore[reportOperatorIssue]
-    trim_x_pos = trim_dist_s if face_flags["pos_x"] else sp.Float(0.0)
-    trim_x_neg = trim_dist_s if face_flags["neg_x"] else sp.Float(0.0)
-    trim_y_pos = trim_dist_s if face_flags["pos_y"] else sp.Float(0.0)
-    trim_y_neg = trim_dist_s if face_flags["neg_y"] else sp.Float(0.0)
-    trim_z_pos = trim_dist_s if face_flags["pos_z"] else sp.Float(0.0)
-    trim_z_neg = trim_dist_s if face_flags["neg_z"] else sp.Float(0.0)
-
-    tx_corner_x_trim_expr = wall_plane_x_s + trim_x_neg  # pyright: ignore[reportOperatorIssue]
-    tx_corner_y_trim_expr = tx_corner_y_expr + trim_y_neg  # pyright: ignore[reportOperatorIssue]
-    tx_corner_z_trim_expr = tx_corner_z_expr + trim_z_neg  # pyright: ignore[reportOperatorIssue]
-    tx_core_thk_trim_expr = tx_core_thk_s - trim_x_pos - trim_x_neg  # pyright: ignore[reportOperatorIssue]
-    tx_core_w_trim_expr = tx_core_w_s - trim_y_pos - trim_y_neg  # pyright: ignore[reportOperatorIssue]
-    tx_core_h_trim_expr = tx_core_h_s - trim_z_pos - trim_z_neg  # pyright: ignore[reportOperatorIssue]
-
-    variables.extend(
-        [
-            dvar("tx_center_y", tx_center_y_expr),
-            dvar("rx_center_y", rx_center_y_expr),
-            dvar("tx_center_z", tx_center_z_expr),
-            dvar("rx_center_z", rx_center_z_expr),
-            dvar("tx_corner_y", tx_corner_y_expr),
-            dvar("tx_corner_z", tx_corner_z_expr),
-            dvar("rx_corner_y", rx_corner_y_expr),
-            dvar("rx_corner_z", rx_corner_z_expr),
-            dvar("tv_corner_x", tv_corner_x_expr),
-            dvar("tv_corner_y", tv_corner_y_expr),
-            dvar("tv_corner_z", tv_corner_z_expr),
-            dvar("wall_corner_x", wall_corner_x_expr),
-            dvar("wall_corner_y", wall_corner_y_expr),
-            dvar("wall_corner_z", wall_corner_z_expr),
-            dvar("floor_corner_x", floor_corner_x_expr),
-            dvar("floor_corner_y", floor_corner_y_expr),
-            dvar("floor_corner_z", floor_corner_z_expr),
-        ]
+    pos_x, neg_x, pos_y, neg_y, pos_z, neg_z = signature.face_flags
+    trim_dist_s = pcb_thk_s + air_gap_s
+    trim_x_pos = trim_dist_s if pos_x else LinearExpr()
+    trim_x_neg = trim_dist_s if neg_x else LinearExpr()
+    trim_y_pos = trim_dist_s if pos_y else LinearExpr()
+    trim_y_neg = trim_dist_s if neg_y else LinearExpr()
+    trim_z_pos = trim_dist_s if pos_z else LinearExpr()
+    trim_z_neg = trim_dist_s if neg_z else LinearExpr()
+
+    tx_corner_x_trim_expr = wall_plane_x_s + trim_x_neg
+    tx_corner_y_trim_expr = tx_corner_y_expr + trim_y_neg
+    tx_corner_z_trim_expr = tx_corner_z_expr + trim_z_neg
+    tx_core_thk_trim_expr = tx_core_thk_s - trim_x_pos - trim_x_neg
+    tx_core_w_trim_expr = tx_core_w_s - trim_y_pos - trim_y_neg
+    tx_core_h_trim_expr = tx_core_h_s - trim_z_pos - trim_z_neg
+
+    expressions = (
+        dvar("tx_center_y", tx_center_y_expr),
+        dvar("rx_center_y", rx_center_y_expr),
+        dvar("tx_center_z", tx_center_z_expr),
+        dvar("rx_center_z", rx_center_z_expr),
+        dvar("tx_corner_y", tx_corner_y_expr),
+        dvar("tx_corner_z", tx_corner_z_expr),
+        dvar("rx_corner_y", rx_corner_y_expr),
+        dvar("rx_corner_z", rx_corner_z_expr),
+        dvar("tv_corner_x", tv_corner_x_expr),
+        dvar("tv_corner_y", tv_corner_y_expr),
+        dvar("tv_corner_z", tv_corner_z_expr),
+        dvar("wall_corner_x", wall_corner_x_expr),
+        dvar("wall_corner_y", wall_corner_y_expr),
+        dvar("wall_corner_z", wall_corner_z_expr),
+        dvar("floor_corner_x", floor_corner_x_expr),
+        dvar("floor_corner_y", floor_corner_y_expr),
+        dvar("floor_corner_z", floor_corner_z_expr),
     )
 
-    boxes: list[ParametricBoxPlan] = []
-    operations: list[OperationPlan] = []
-    if sample.tx_module.present:
-        if not sample.tx_module.model:
-            boxes.append(
+    before: list[ParametricBoxPlan] = []
+    if signature.tx_present:
+        if not signature.tx_model:
+            before.append(
                 ParametricBoxPlan(
                     name="TX_Module_Region",
                     corner_expr=(
@@ -304,7 +259,7 @@ def build_type1_parametric_geometry(sample: Type1Sample) -> ParametricGeometryPl
                     model=False,
                 )
             )
-        boxes.append(
+        before.append(
             ParametricBoxPlan(
                 name="TX_Core_Region",
                 corner_expr=(
@@ -314,16 +269,13 @@ def build_type1_parametric_geometry(sample: Type1Sample) -> ParametricGeometryPl
                 ),
                 size_expr=(expr(tx_core_thk_trim_expr), expr(tx_core_w_trim_expr), expr(tx_core_h_trim_expr)),
                 material="core",
-                model=sample.tx_module.model,
+                model=signature.tx_model,
             )
         )
 
-        tx_coil_boxes, tx_coil_ops = build_tx_planar_trace_coils(sample)
-        boxes.extend(tx_coil_boxes)
-        operations.extend(tx_coil_ops)
-
-    if sample.rx_module.present:
-        boxes.append(
+    after: list[ParametricBoxPlan] = []
+    if signature.rx_present:
+        after.append(
             ParametricBoxPlan(
                 name="RX_Module_Region",
                 corner_expr=(
@@ -333,41 +285,158 @@ def build_type1_parametric_geometry(sample: Type1Sample) -> ParametricGeometryPl
                 ),
                 size_expr=(expr(rx_core_thk_s), expr(rx_core_w_s), expr(rx_core_h_s)),
                 material="core",
-                model=sample.rx_module.model,
+                model=signature.rx_model,
             )
         )
 
-    if sample.tv.present:
-        boxes.append(
+    if signature.tv_present:
+        after.append(
             ParametricBoxPlan(
                 name="TV_NonModel",
                 corner_expr=(expr(tv_corner_x_expr), expr(tv_corner_y_expr), expr(tv_corner_z_expr)),
                 size_expr=(expr(tv_thk_s), expr(tv_w_s), expr(tv_h_s)),
                 material="vacuum",
-                model=sample.tv.model,
+                model=signature.tv_model,
             )
         )
 
-    if sample.wall.present:
-        boxes.append(
+    if signature.wall_present:
+        after.append(
             ParametricBoxPlan(
                 name="Wall_NonModel",
                 corner_expr=(expr(wall_corner_x_expr), expr(wall_corner_y_expr), expr(wall_corner_z_expr)),
                 size_expr=(expr(wall_thk_s), expr(wall_sy_s), expr(wall_sz_s)),
                 material="vacuum",
-                model=sample.wall.model,
+                model=signature.wall_model,
             )
         )
 
-    if sample.floor.present:
-        boxes.append(
+    if signature.floor_present:
+        after.append(
             ParametricBoxPlan(
                 name="Floor_NonModel",
                 corner_expr=(expr(floor_corner_x_expr), expr(floor_corner_y_expr), expr(floor_corner_z_expr)),
                 size_expr=(expr(floor_sx_s), expr(floor_sy_s), expr(floor_thk_s)),
                 material="vacuum",
-                model=sample.floor.model,
+                model=signature.floor_model,
             )
         )
 
-    return ParametricGeometryPlan(units_length=units, variables=variables, boxes=boxes, operations=operations)
+    return ScenePlanTemplate(
+        expressions=expressions,
+        boxes_before_coil=tuple(before),
+        boxes_after_coil=tuple(after),
+    )
+
+
+def _scene_variables(sample: Type1Sample) -> list[DesignVariable]:
+    units = sample.units_length
+
+    def var(name: str, value: float) -> DesignVariable:
+        return DesignVariable(name=name, value=value, units=units)
+
+    return [
+        var("wall_plane_x", sample.wall_plane_x_mm),
+        var("floor_plane_z", sample.floor_plane_z_mm),
+        var("core_core_gap", sample.core_core_gap_mm),
+        var("tx_gap_from_tv_bottom", sample.tx_gap_from_tv_bottom_mm),
+        var("pcb_thk", sample.tx_pcb.total_thickness_mm or pcb_faces.PCB_THICKNESS_MM),
+        var("pcb_fr4_outer", pcb_faces.FR4_OUTER_THICKNESS_MM),
+        var("pcb_fr4_inner", pcb_faces.FR4_INNER_THICKNESS_MM),
+        var("pcb_copper_thk", pcb_faces.COPPER_THICKNESS_MM),
+        var("pcb_air_gap", pcb_faces.AIR_GAP_MM),
+        var("tx_core_w", sample.tx_module.outer_w_mm),
+        var("tx_core_h", sample.tx_module.outer_h_mm),
+        var("rx_core_w", sample.rx_module.outer_w_mm),
+        var("rx_core_h", sample.rx_module.outer_h_mm),
+        var("tx_core_thk", sample.tx_module.thickness_mm),
+        var("rx_core_thk", sample.rx_module.thickness_mm),
+        var("tx_center_y_user", sample.tx_position.center_y_mm),
+        var("rx_center_y_user", sample.rx_position.center_y_mm),
+        var("tx_center_z_user", sample.tx_position.center_z_mm),
+        var("rx_center_z_user", sample.rx_position.center_z_mm),
+        var("tv_center_x", sample.tv.position.center_x_mm),
+        var("tv_center_y", sample.tv.position.center_y_mm),
+        var("tv_center_z", sample.tv.position.center_z_mm),
+        var("tv_w", sample.tv.width_mm),
+        var("tv_h", sample.tv.height_mm),
+        var("tv_thk", sample.tv.thickness_mm),
+        var("wall_center_x", sample.wall.position.center_x_mm),
+        var("wall_center_y", sample.wall.position.center_y_mm),
+        var("wall_center_z", sample.wall.position.center_z_mm),
+        var("wall_thk", sample.wall.thickness_mm),
+        var("wall_sy", sample.wall.size_y_mm),
+        var("wall_sz", sample.wall.size_z_mm),
+        var("floor_center_x", sample.floor.position.center_x_mm),
+        var("floor_center_y", sample.floor.position.center_y_mm),
+        var("floor_center_z", sample.floor.position.center_z_mm),
+        var("floor_thk", sample.floor.thickness_mm),
+        var("floor_sx", sample.floor.size_x_mm),
+        var("floor_sy", sample.floor.size_y_mm),
+    ]
+
+
+@log_action(
+    "build_type1_parametric_geometry",
+    lambda sample, **kwargs: {
+        "units": sample.units_length,
+        "tx_present": sample.tx_module.present,
+        "rx_present": sample.rx_module.present,
+        "pcb_layers": sample.tx_pcb.layer_count,
+        "parametric_coil": kwargs.get("parametric_coil", False),
+        "coil_emission": kwargs.get("coil_emission", "boxes"),
+    },
+)
+def build_type1_parametric_geometry(
+    sample: Type1Sample,
+    *,
+    parametric_coil: bool = False,
+    coil_emission: str = "boxes",
+) -> ParametricGeometryPlan:
+    # parametric_coil: emit TX coil boxes as expressions of per-instance design variables
+    # (tx_coil_param.py) instead of literal coordinates.
+    # coil_emission: "boxes" (one box per trace segment) | "polyline" (one swept polyline per
+    # layer run; literal coordinates only).
+    if coil_emission not in COIL_EMISSIONS:
+        raise ValueError(f"coil_emission must be one of {COIL_EMISSIONS}")
+    if coil_emission == "polyline" and parametric_coil:
+        raise ValueError("coil_emission='polyline' is not supported with parametric_coil")
+    signature = scene_signature(sample)
+
+    if sample.tx_module.present:
+        trim_dist_val = (sample.tx_pcb.total_thickness_mm or pcb_faces.PCB_THICKNESS_MM) + pcb_faces.AIR_GAP_MM
+        pos_x, neg_x, pos_y, neg_y, pos_z, neg_z = (trim_dist_val if flag else 0.0 for flag in signature.face_flags)
+        if sample.tx_module.thickness_mm - pos_x - neg_x <= 0:
+            raise ValueError("TX module trimmed thickness must remain positive")
+        if sample.tx_module.outer_w_mm - pos_y - neg_y <= 0:
+            raise ValueError("TX module trimmed width must remain positive")
+        if sample.tx_module.outer_h_mm - pos_z - neg_z <= 0:
+            raise ValueError("TX module trimmed height must remain positive")
+
+    template = scene_plan_template(signature)
+    variables = _scene_variables(sample)
+    variables.extend(template.expressions)
+
+    boxes: list[ParametricBoxPlan] = list(template.boxes_before_coil)
+    polylines: list[ParametricPolylinePlan] = []
+    operations: list[OperationPlan] = []
+    if sample.tx_module.present:
+        if parametric_coil:
+            tx_coil_vars, tx_coil_boxes, tx_coil_ops = build_tx_parametric_trace_coils(sample)
+            variables.extend(tx_coil_vars)
+        elif coil_emission == "polyline":
+            tx_coil_polylines, tx_coil_boxes, tx_coil_ops = build_tx_polyline_trace_coils(sample)
+            polylines.extend(tx_coil_polylines)
+        else:
+            tx_coil_boxes, tx_coil_ops = build_tx_planar_trace_coils(sample)
+        boxes.extend(tx_coil_boxes)
+        operations.extend(tx_coil_ops)
+    boxes.extend(template.boxes_after_coil)
+
+    return ParametricGeometryPlan(
+        units_length=sample.units_length,
+        variables=variables,
+        boxes=boxes,
+        operations=operations,
+        polylines=polylines,
+    )
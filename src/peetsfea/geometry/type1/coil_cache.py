@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+from peetsfea.domain.type1.sampled_models import TxCoilInstanceSample
+from peetsfea.geometry.type1.layer_modes import (
+    LayeredSpiral2D,
+    Segment2D,
+    SegmentArray,
+    estimate_overlap,
+    layer_rect_spirals,
+)
+from peetsfea.geometry.type1.spiral_mask import (
+    DdSplit,
+    RectSpiralMask2D,
+    build_planar_rect_spiral_masks,
+)
+from peetsfea.geometry.type1.topology import TopologyReport2D, topology_from_segments
+
+# One accepted seed builds the same planar coil for every present instance in the sampler
+# (acceptance checks), the 3D builder, derive_tx_coil_features and the debug snapshot.
+# The cache is keyed by face size + the instance's coil genes + the effective layer mode,
+# so every call site with the same inputs gets the same frozen masks/layered/topology.
+# Entries with overlap estimates are keyed by the overlap method as well.
+
+CoilGeometryKey = tuple
+
+
+@dataclass(frozen=True)
+class PlanarCoilGeometry:
+    dd: DdSplit | None
+    layer_mode_idx_effective: int
+    masks: tuple[RectSpiralMask2D, ...]
+    layered: tuple[LayeredSpiral2D, ...]
+    # Whole-instance graph; for DD coils includes the planned series bridge (as in tx_coil_3d).
+    topology_total: TopologyReport2D
+
+
+@dataclass(frozen=True)
+class CoilGeometryCacheStats:
+    hits: int
+    misses: int
+    size: int
+
+
+def instance_dd_split(inst: TxCoilInstanceSample) -> DdSplit | None:
+    if inst.spiral_count != 2:
+        return None
+    return DdSplit(axis_idx=inst.dd_split_axis_idx, gap_mm=inst.dd_gap_mm, ratio=inst.dd_split_ratio)
+
+
+def effective_layer_mode_idx(inst: TxCoilInstanceSample, pcb_layer_count: int) -> int:
+    effective_trace_layers = min(pcb_layer_count, inst.trace_layer_count)
+    return inst.layer_mode_idx if effective_trace_layers >= 2 else 0
+
+
+def coil_geometry_key(
+    inst: TxCoilInstanceSample,
+    *,
+    face_u_size_mm: float,
+    face_v_size_mm: float,
+    pcb_layer_count: int,
+) -> CoilGeometryKey:
+    dd = instance_dd_split(inst)
+    return (
+        face_u_size_mm,
+        face_v_size_mm,
+        inst.spiral_count,
+        inst.spiral_turns,
+        inst.spiral_direction_idx,
+        inst.spiral_start_edge_idx,
+        inst.edge_clearance_mm,
+        inst.fill_scale,
+        inst.pitch_duty,
+        inst.min_trace_width_mm,
+        inst.min_trace_gap_mm,
+        (dd.axis_idx, dd.gap_mm, dd.ratio) if dd is not None else None,
+        effective_layer_mode_idx(inst, pcb_layer_count),
+        inst.radial_split_top_turn_fraction,
+        inst.radial_split_outer_is_top,
+    )
+
+
+def _topology_total(spiral_count: int, layered: tuple[LayeredSpiral2D, ...]) -> TopologyReport2D:
+    parts: list[SegmentArray | list[Segment2D]] = []
+    for lay in layered:
+        parts.append(lay.top_segments)
+        parts.append(lay.bottom_segments)
+    if spiral_count == 2 and len(layered) >= 2:
+        p0 = layered[0].terminal_b
+        p1 = layered[1].terminal_a
+        if p0[0] == p1[0] or p0[1] == p1[1]:
+            parts.append([Segment2D(a=p0, b=p1, width_mm=0.0)])
+        else:
+            mid = (p1[0], p0[1])
+            parts.append([Segment2D(a=p0, b=mid, width_mm=0.0), Segment2D(a=mid, b=p1, width_mm=0.0)])
+    return topology_from_segments(SegmentArray.concat(parts))
+
+
+class CoilGeometryCache:
+    def __init__(self, maxsize: int = 256) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._masks: OrderedDict[CoilGeometryKey, tuple[RectSpiralMask2D, ...]] = OrderedDict()
+        self._entries: OrderedDict[CoilGeometryKey, PlanarCoilGeometry] = OrderedDict()
+        # Pooled AEDT sweeps write samples from several threads.
+        self._lock = threading.RLock()
+
+    def _put(self, table: OrderedDict, key: CoilGeometryKey, value) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.maxsize:
+            table.popitem(last=False)
+
+    def masks(
+        self,
+        inst: TxCoilInstanceSample,
+        *,
+        face_u_size_mm: float,
+        face_v_size_mm: float,
+        pcb_layer_count: int,
+    ) -> tuple[RectSpiralMask2D, ...]:
+        with self._lock:
+            return self._masks_locked(
+                inst, face_u_size_mm=face_u_size_mm, face_v_size_mm=face_v_size_mm, pcb_layer_count=pcb_layer_count
+            )
+
+    def _masks_locked(
+        self,
+        inst: TxCoilInstanceSample,
+        *,
+        face_u_size_mm: float,
+        face_v_size_mm: float,
+        pcb_layer_count: int,
+    ) -> tuple[RectSpiralMask2D, ...]:
+        # Raises ValueError like build_planar_rect_spiral_masks (failures are not cached).
+        key = coil_geometry_key(
+            inst, face_u_size_mm=face_u_size_mm, face_v_size_mm=face_v_size_mm, pcb_layer_count=pcb_layer_count
+        )
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.masks
+        if key in self._masks:
+            self.hits += 1
+            self._masks.move_to_end(key)
+            return self._masks[key]
+        self.misses += 1
+        return self._build_masks(key, inst, face_u_size_mm=face_u_size_mm, face_v_size_mm=face_v_size_mm)
+
+    def _build_masks(
+        self,
+        key: CoilGeometryKey,
+        inst: TxCoilInstanceSample,
+        *,
+        face_u_size_mm: float,
+        face_v_size_mm: float,
+    ) -> tuple[RectSpiralMask2D, ...]:
+        masks = self._masks.get(key)
+        if masks is not None:
+            return masks
+        masks = build_planar_rect_spiral_masks(
+            face_u_size_mm=face_u_size_mm,
+            face_v_size_mm=face_v_size_mm,
+            spiral_count=inst.spiral_count,
+            turns=inst.spiral_turns,
+            direction_idx=inst.spiral_direction_idx,
+            start_edge_idx=inst.spiral_start_edge_idx,
+            edge_clearance_mm=inst.edge_clearance_mm,
+            fill_scale=inst.fill_scale,
+            pitch_duty=inst.pitch_duty,
+            min_trace_width_mm=inst.min_trace_width_mm,
+            min_trace_gap_mm=inst.min_trace_gap_mm,
+            dd=instance_dd_split(inst),
+        )
+        self._put(self._masks, key, masks)
+        return masks
+
+    def get(
+        self,
+        inst: TxCoilInstanceSample,
+        *,
+        face_u_size_mm: float,
+        face_v_size_mm: float,
+        pcb_layer_count: int,
+        with_overlap: bool = False,
+        overlap_method: str = "grid",
+    ) -> PlanarCoilGeometry:
+        with self._lock:
+            return self._get_locked(
+                inst,
+                face_u_size_mm=face_u_size_mm,
+                face_v_size_mm=face_v_size_mm,
+                pcb_layer_count=pcb_layer_count,
+                with_overlap=with_overlap,
+                overlap_method=overlap_method,
+            )
+
+    def _get_locked(
+        self,
+        inst: TxCoilInstanceSample,
+        *,
+        face_u_size_mm: float,
+        face_v_size_mm: float,
+        pcb_layer_count: int,
+        with_overlap: bool,
+        overlap_method: str,
+    ) -> PlanarCoilGeometry:
+        key = coil_geometry_key(
+            inst, face_u_size_mm=face_u_size_mm, face_v_size_mm=face_v_size_mm, pcb_layer_count=pcb_layer_count
+        )
+        lookup = (*key, overlap_method) if with_overlap else key
+        entry = self._entries.get(lookup)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(lookup)
+            return entry
+
+        self.misses += 1
+        base = self._entries.get(key)
+        if base is None:
+            base = self._build_entry(
+                key, inst, face_u_size_mm=face_u_size_mm, face_v_size_mm=face_v_size_mm, pcb_layer_count=pcb_layer_count
+            )
+        if not with_overlap:
+            return base
+        # The overlap estimate only depends on the cached segments.
+        layered = tuple(
+            replace(l, overlap_estimate=estimate_overlap(l.top_segments, l.bottom_segments, method=overlap_method))
+            for l in base.layered
+        )
+        entry = replace(base, layered=layered)
+        self._put(self._entries, lookup, entry)
+        return entry
+
+    def _build_entry(
+        self,
+        key: CoilGeometryKey,
+        inst: TxCoilInstanceSample,
+        *,
+        face_u_size_mm: float,
+        face_v_size_mm: float,
+        pcb_layer_count: int,
+    ) -> PlanarCoilGeometry:
+        masks = self._build_masks(key, inst, face_u_size_mm=face_u_size_mm, face_v_size_mm=face_v_size_mm)
+        layer_mode_idx = effective_layer_mode_idx(inst, pcb_layer_count)
+        layered = layer_rect_spirals(
+            masks,
+            layer_mode_idx=layer_mode_idx,
+            radial_split_top_turn_fraction=inst.radial_split_top_turn_fraction,
+            radial_split_outer_is_top=inst.radial_split_outer_is_top,
+            with_overlap=False,
+        )
+        entry = PlanarCoilGeometry(
+            dd=instance_dd_split(inst),
+            layer_mode_idx_effective=layer_mode_idx,
+            masks=masks,
+            layered=layered,
+            topology_total=_topology_total(inst.spiral_count, layered),
+        )
+        self._masks.pop(key, None)
+        self._put(self._entries, key, entry)
+        return entry
+
+    def stats(self) -> CoilGeometryCacheStats:
+        with self._lock:
+            return CoilGeometryCacheStats(
+                hits=self.hits, misses=self.misses, size=len(self._entries) + len(self._masks)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._masks.clear()
+            self._entries.clear()
+
+
+_DEFAULT_CACHE = CoilGeometryCache()
+
+
+def default_coil_geometry_cache() -> CoilGeometryCache:
+    return _DEFAULT_CACHE
+
+
+def planar_coil_geometry(
+    inst: TxCoilInstanceSample,
+    *,
+    face_u_size_mm: float,
+    face_v_size_mm: float,
+    pcb_layer_count: int,
+    with_overlap: bool = False,
+    overlap_method: str = "grid",
+) -> PlanarCoilGeometry:
+    return _DEFAULT_CACHE.get(
+        inst,
+        face_u_size_mm=face_u_size_mm,
+        face_v_size_mm=face_v_size_mm,
+        pcb_layer_count=pcb_layer_count,
+        with_overlap=with_overlap,
+        overlap_method=overlap_method,
+    )
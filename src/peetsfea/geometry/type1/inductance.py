@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from peetsfea.geometry.type1.coil_cache import PlanarCoilGeometry
+from peetsfea.geometry.type1.pcb_faces import COPPER_THICKNESS_MM
+from peetsfea.geometry.type1.spiral_mask import RectSpiralMask2D
+
+# Analytic self-inductance of the planar TX coil, for pre-screening before AEDT:
+# - modified Wheeler and current-sheet (Mohan et al., square coefficients) per spiral, with a
+#   rectangular spiral mapped to the square of equal perimeter;
+# - Greenhouse summation over the straight segments of the series path (both DD spirals and
+#   the bridge): sum of segment self terms plus signed mutual terms of every parallel pair.
+# Free space, single layer (the 2-layer split is ignored), DC current distribution.
+
+MU0_H_PER_M = 4e-7 * math.pi
+# mu0/(4*pi) in H/mm: the Neumann integral below is evaluated in mm.
+_MU0_4PI_H_PER_MM = 1e-10
+
+# Modified Wheeler (K1, K2) and current-sheet (c1..c4) coefficients for square spirals.
+_WHEELER_K1, _WHEELER_K2 = 2.34, 2.75
+_SHEET_C1, _SHEET_C2, _SHEET_C3, _SHEET_C4 = 1.27, 2.07, 0.18, 0.13
+# Geometric mean distance of a rectangular cross-section from itself, as a fraction of (w + t).
+_RECT_GMD = 0.2235
+
+
+@dataclass(frozen=True)
+class SpiralInductanceEstimate:
+    d_out_mm: float
+    d_in_mm: float
+    fill_ratio: float
+    wheeler_uh: float
+    current_sheet_uh: float
+    greenhouse_uh: float
+
+
+@dataclass(frozen=True)
+class CoilInductanceEstimate:
+    spirals: tuple[SpiralInductanceEstimate, ...]
+    # Whole instance (DD: both spirals + bridge in series).
+    greenhouse_uh: float
+    segment_count: int
+
+
+def rect_spiral_diameters(
+    u_size_mm: np.ndarray | float,
+    v_size_mm: np.ndarray | float,
+    turns: np.ndarray | int,
+    pitch_mm: np.ndarray | float,
+    trace_width_mm: np.ndarray | float,
+) -> tuple[np.ndarray, np.ndarray]:
+    # (d_out, d_in) of the equal-perimeter square; sizes are the centreline bounds of the spiral.
+    turns = np.asarray(turns, dtype=np.float64)
+    pitch = np.asarray(pitch_mm, dtype=np.float64)
+    width = np.asarray(trace_width_mm, dtype=np.float64)
+    side = 0.5 * (np.asarray(u_size_mm, dtype=np.float64) + np.asarray(v_size_mm, dtype=np.float64))
+    d_out = side + width
+    d_in = np.maximum(side - 2.0 * (turns - 1.0) * pitch - width, 0.0)
+    return d_out, d_in
+
+
+def wheeler_inductance_h(turns: np.ndarray | int, d_out_mm: np.ndarray | float, d_in_mm: np.ndarray | float) -> np.ndarray:
+    turns = np.asarray(turns, dtype=np.float64)
+    d_out = np.asarray(d_out_mm, dtype=np.float64) * 1e-3
+    d_in = np.asarray(d_in_mm, dtype=np.float64) * 1e-3
+    d_avg = 0.5 * (d_out + d_in)
+    rho = (d_out - d_in) / (d_out + d_in)
+    return _WHEELER_K1 * MU0_H_PER_M * turns**2 * d_avg / (1.0 + _WHEELER_K2 * rho)
+
+
+def current_sheet_inductance_h(
+    turns: np.ndarray | int, d_out_mm: np.ndarray | float, d_in_mm: np.ndarray | float
+) -> np.ndarray:
+    turns = np.asarray(turns, dtype=np.float64)
+    d_out = np.asarray(d_out_mm, dtype=np.float64) * 1e-3
+    d_in = np.asarray(d_in_mm, dtype=np.float64) * 1e-3
+    d_avg = 0.5 * (d_out + d_in)
+    rho = (d_out - d_in) / (d_out + d_in)
+    return (
+        0.5
+        * MU0_H_PER_M
+        * turns**2
+        * d_avg
+        * _SHEET_C1
+        * (np.log(_SHEET_C2 / rho) + _SHEET_C3 * rho + _SHEET_C4 * rho**2)
+    )
+
+
+def _parallel_filament_integral(a0: np.ndarray, a1: np.ndarray, b0: np.ndarray, b1: np.ndarray, d: np.ndarray) -> np.ndarray:
+    # Neumann double integral of 1/r for parallel filaments [a0, a1] and [b0, b1] at distance d.
+    def g(s: np.ndarray) -> np.ndarray:
+        return s * np.arcsinh(s / d) - np.sqrt(s * s + d * d)
+
+    return g(a1 - b0) - g(a1 - b1) - g(a0 - b0) + g(a0 - b1)
+
+
+def greenhouse_inductance_h(
+    segments: np.ndarray,
+    trace_width_mm: np.ndarray | float,
+    thickness_mm: float = COPPER_THICKNESS_MM,
+) -> float:
+    # segments: (n, 4) u0, v0, u1, v1 of axis-aligned segments in current order (mm).
+    seg = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    width = np.broadcast_to(np.asarray(trace_width_mm, dtype=np.float64), (seg.shape[0],))
+    total = 0.0
+    for axis in (0, 1):
+        along = seg[:, [axis, axis + 2]]
+        across = seg[:, 1 - axis]
+        pick = np.abs(along[:, 1] - along[:, 0]) > 0
+        if not pick.any():
+            continue
+        lo = np.minimum(along[pick, 0], along[pick, 1])
+        hi = np.maximum(along[pick, 0], along[pick, 1])
+        sign = np.sign(along[pick, 1] - along[pick, 0])
+        gmd = _RECT_GMD * (width[pick] + thickness_mm)
+        # Self terms use the GMD of the cross-section; mutual terms the centreline distance,
+        # never below the GMD (collinear neighbours).
+        d = np.abs(across[pick][:, None] - across[pick][None, :])
+        d = np.maximum(d, np.maximum(gmd[:, None], gmd[None, :]))
+        integral = _parallel_filament_integral(lo[:, None], hi[:, None], lo[None, :], hi[None, :], d)
+        total += float(np.sum(sign[:, None] * sign[None, :] * integral))
+    return total * _MU0_4PI_H_PER_MM
+
+
+def _polyline_segments(points: tuple[tuple[float, float], ...]) -> np.ndarray:
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return np.concatenate([pts[:-1], pts[1:]], axis=1)
+
+
+def _bridge_segments(p0: tuple[float, float], p1: tuple[float, float]) -> np.ndarray:
+    # Same L-shaped DD series bridge as coil_cache/tx_coil_3d.
+    if p0[0] == p1[0] or p0[1] == p1[1]:
+        return np.array([[p0[0], p0[1], p1[0], p1[1]]], dtype=np.float64)
+    mid = (p1[0], p0[1])
+    return np.array([[p0[0], p0[1], mid[0], mid[1]], [mid[0], mid[1], p1[0], p1[1]]], dtype=np.float64)
+
+
+def series_path_segments(coil: PlanarCoilGeometry) -> tuple[np.ndarray, np.ndarray]:
+    # ((n, 4) u0, v0, u1, v1 in current order, (n,) trace widths) of the whole instance.
+    parts: list[np.ndarray] = []
+    widths: list[np.ndarray] = []
+    for idx, mask in enumerate(coil.masks):
+        if idx > 0:
+            bridge = _bridge_segments(coil.masks[idx - 1].polyline[-1], mask.polyline[0])
+            parts.append(bridge)
+            widths.append(np.full(bridge.shape[0], coil.masks[idx - 1].derived.trace_width_mm))
+        seg = _polyline_segments(mask.polyline)
+        parts.append(seg)
+        widths.append(np.full(seg.shape[0], mask.derived.trace_width_mm))
+    return np.concatenate(parts), np.concatenate(widths)
+
+
+def estimate_spiral_inductance(mask: RectSpiralMask2D) -> SpiralInductanceEstimate:
+    derived = mask.derived
+    d_out, d_in = rect_spiral_diameters(
+        derived.bounds.u_size, derived.bounds.v_size, mask.turns, derived.pitch_mm, derived.trace_width_mm
+    )
+    greenhouse = greenhouse_inductance_h(_polyline_segments(mask.polyline), derived.trace_width_mm)
+    return SpiralInductanceEstimate(
+        d_out_mm=float(d_out),
+        d_in_mm=float(d_in),
+        fill_ratio=float((d_out - d_in) / (d_out + d_in)),
+        wheeler_uh=float(wheeler_inductance_h(mask.turns, d_out, d_in)) * 1e6,
+        current_sheet_uh=float(current_sheet_inductance_h(mask.turns, d_out, d_in)) * 1e6,
+        greenhouse_uh=greenhouse * 1e6,
+    )
+
+
+def estimate_coil_inductance(coil: PlanarCoilGeometry) -> CoilInductanceEstimate:
+    segments, widths = series_path_segments(coil)
+    return CoilInductanceEstimate(
+        spirals=tuple(estimate_spiral_inductance(mask) for mask in coil.masks),
+        greenhouse_uh=greenhouse_inductance_h(segments, widths) * 1e6,
+        segment_count=int(segments.shape[0]),
+    )
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 
+import numpy as np
+
 from peetsfea.geometry.type1.spiral_mask import Point2D, RectSpiralMask2D
 
 
@@ -12,6 +15,106 @@ class Segment2D:
     width_mm: float
 
 
+PointKey = tuple[float, float]
+
+
+class SegmentArray:
+    # Read-only (N, 5) float64 array of axis-aligned trace segments: u0, v0, u1, v1, width_mm.
+    # Spiral/layer code keeps segments in this form; Segment2D views are only built for
+    # iteration/serialization.
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray) -> None:
+        arr = np.array(data, dtype=np.float64).reshape(-1, 5)
+        arr.flags.writeable = False
+        self.data = arr
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment2D]) -> SegmentArray:
+        return cls(np.array([(s.a[0], s.a[1], s.b[0], s.b[1], s.width_mm) for s in segments], dtype=np.float64))
+
+    @classmethod
+    def from_polyline(cls, points: np.ndarray, width_mm: float) -> SegmentArray:
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = max(0, len(pts) - 1)
+        data = np.empty((n, 5), dtype=np.float64)
+        data[:, 0:2] = pts[:-1]
+        data[:, 2:4] = pts[1:]
+        data[:, 4] = width_mm
+        return cls(data)
+
+    @classmethod
+    def concat(cls, arrays: Iterable[SegmentArray | Iterable[Segment2D]]) -> SegmentArray:
+        parts = [as_segment_array(a).data for a in arrays]
+        if not parts:
+            return cls(np.empty((0, 5), dtype=np.float64))
+        return cls(np.concatenate(parts, axis=0))
+
+    def __len__(self) -> int:
+        return int(self.data.shape[0])
+
+    def __iter__(self) -> Iterator[Segment2D]:
+        return iter(self.to_segments())
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return SegmentArray(self.data[idx])
+        u0, v0, u1, v1, w = self.data[idx].tolist()
+        return Segment2D(a=(u0, v0), b=(u1, v1), width_mm=w)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SegmentArray):
+            return NotImplemented
+        return np.array_equal(self.data, other.data)
+
+    def __hash__(self) -> int:
+        return hash(self.data.tobytes())
+
+    def __repr__(self) -> str:
+        return f"SegmentArray(n={len(self)})"
+
+    def to_segments(self) -> tuple[Segment2D, ...]:
+        return tuple(
+            Segment2D(a=(u0, v0), b=(u1, v1), width_mm=w) for u0, v0, u1, v1, w in self.data.tolist()
+        )
+
+    def lengths(self) -> np.ndarray:
+        d = self.data
+        return np.abs(d[:, 2] - d[:, 0]) + np.abs(d[:, 3] - d[:, 1])
+
+    def total_length(self) -> float:
+        # Sequential accumulation (not pairwise np.sum) so totals match a plain Python loop.
+        lengths = self.lengths()
+        return float(np.add.accumulate(lengths)[-1]) if len(lengths) else 0.0
+
+    def rects(self) -> np.ndarray:
+        # (N, 4): u_min, u_max, v_min, v_max of each trace footprint.
+        d = self.data
+        if np.any((d[:, 0] != d[:, 2]) & (d[:, 1] != d[:, 3])):
+            raise ValueError("Only axis-aligned segments are supported")
+        half = d[:, 4] * 0.5
+        out = np.empty((len(d), 4), dtype=np.float64)
+        out[:, 0] = np.minimum(d[:, 0], d[:, 2]) - half
+        out[:, 1] = np.maximum(d[:, 0], d[:, 2]) + half
+        out[:, 2] = np.minimum(d[:, 1], d[:, 3]) - half
+        out[:, 3] = np.maximum(d[:, 1], d[:, 3]) + half
+        return out
+
+    def endpoint_keys(self, *, ndigits: int = 6) -> list[tuple[PointKey, PointKey]]:
+        # Python round() (correctly rounded) rather than np.round so keys match the
+        # dataclass-based helpers exactly.
+        return [
+            ((round(u0, ndigits), round(v0, ndigits)), (round(u1, ndigits), round(v1, ndigits)))
+            for u0, v0, u1, v1 in self.data[:, 0:4].tolist()
+        ]
+
+
+def as_segment_array(segments: SegmentArray | Iterable[Segment2D]) -> SegmentArray:
+    if isinstance(segments, SegmentArray):
+        return segments
+    return SegmentArray.from_segments(segments)
+
+
 @dataclass(frozen=True)
 class OverlapEstimate2D:
     top_area_est_mm2: float
@@ -24,53 +127,118 @@ class OverlapEstimate2D:
 @dataclass(frozen=True)
 class LayeredSpiral2D:
     layer_mode_idx: int
-    top_segments: tuple[Segment2D, ...]
-    bottom_segments: tuple[Segment2D, ...]
+    top_segments: SegmentArray
+    bottom_segments: SegmentArray
     via_points: tuple[Point2D, ...]
     terminal_a: Point2D
     terminal_b: Point2D
     terminal_a_is_top: bool
     terminal_b_is_top: bool
-    overlap_estimate: OverlapEstimate2D
+    overlap_estimate: OverlapEstimate2D | None  # None when built with with_overlap=False
 
 
-@dataclass(frozen=True)
-class _Rect:
-    u_min: float
-    u_max: float
-    v_min: float
-    v_max: float
-
-
-def _segment_rect(seg: Segment2D) -> _Rect:
-    (u1, v1) = seg.a
-    (u2, v2) = seg.b
-    half = seg.width_mm * 0.5
-    if u1 == u2 and v1 == v2:
-        return _Rect(u1 - half, u1 + half, v1 - half, v1 + half)
-    if v1 == v2:
-        u_min = min(u1, u2) - half
-        u_max = max(u1, u2) + half
-        return _Rect(u_min, u_max, v1 - half, v1 + half)
-    if u1 == u2:
-        v_min = min(v1, v2) - half
-        v_max = max(v1, v2) + half
-        return _Rect(u1 - half, u1 + half, v_min, v_max)
-    raise ValueError("Only axis-aligned segments are supported")
-
-
-def _estimate_overlap(
-    top: tuple[Segment2D, ...],
-    bottom: tuple[Segment2D, ...],
+OVERLAP_METHODS = ("grid", "exact")
+
+
+def _union_intervals(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    merged: list[tuple[float, float]] = []
+    for lo, hi in sorted(intervals):
+        if merged and lo <= merged[-1][1]:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _intersection_length(a: list[tuple[float, float]], b: list[tuple[float, float]]) -> float:
+    # a, b: sorted, disjoint interval lists (output of _union_intervals).
+    total = 0.0
+    i = j = 0
+    while i < len(a) and j < len(b):
+        lo = max(a[i][0], b[j][0])
+        hi = min(a[i][1], b[j][1])
+        if hi > lo:
+            total += hi - lo
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+def _exact_overlap(top: SegmentArray, bottom: SegmentArray) -> OverlapEstimate2D:
+    # Coordinate-compressed sweep along u: between two consecutive rect u-edges the set of
+    # covering rects is constant, so each slab contributes slab_width * covered v-length.
+    rects = [(r, True) for r in top.rects().tolist()] + [(r, False) for r in bottom.rects().tolist()]
+    rects = [(r, is_top) for r, is_top in rects if r[1] > r[0] and r[3] > r[2]]
+
+    events: dict[float, list[int]] = {}
+    for idx, (r, _) in enumerate(rects):
+        events.setdefault(r[0], []).append(idx)
+        events.setdefault(r[1], []).append(~idx)
+
+    active: set[int] = set()
+    top_area = 0.0
+    bottom_area = 0.0
+    overlap_area = 0.0
+    u_prev = 0.0
+    for u in sorted(events):
+        if active:
+            du = u - u_prev
+            top_v = _union_intervals([(rects[k][0][2], rects[k][0][3]) for k in active if rects[k][1]])
+            bottom_v = _union_intervals([(rects[k][0][2], rects[k][0][3]) for k in active if not rects[k][1]])
+            top_area += du * sum(hi - lo for lo, hi in top_v)
+            bottom_area += du * sum(hi - lo for lo, hi in bottom_v)
+            overlap_area += du * _intersection_length(top_v, bottom_v)
+        for idx in events[u]:
+            if idx >= 0:
+                active.add(idx)
+            else:
+                active.discard(~idx)
+        u_prev = u
+
+    denom = min(top_area, bottom_area)
+    return OverlapEstimate2D(
+        top_area_est_mm2=top_area,
+        bottom_area_est_mm2=bottom_area,
+        overlap_area_est_mm2=overlap_area,
+        overlap_ratio_est=(overlap_area / denom) if denom > 0 else 0.0,
+        grid_step_mm=0.0,
+    )
+
+
+def _grid_coverage(rects: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # (nx, ny) bool: grid point (u[i], v[j]) lies in at least one rect (closed intervals).
+    if len(rects) == 0:
+        return np.zeros((len(u), len(v)), dtype=bool)
+    in_u = (rects[:, 0:1] <= u[None, :]) & (u[None, :] <= rects[:, 1:2])
+    in_v = (rects[:, 2:3] <= v[None, :]) & (v[None, :] <= rects[:, 3:4])
+    return (in_u.T.astype(np.float32) @ in_v.astype(np.float32)) > 0
+
+
+def estimate_overlap(
+    top: SegmentArray | tuple[Segment2D, ...],
+    bottom: SegmentArray | tuple[Segment2D, ...],
     *,
+    method: str = "grid",
     default_grid_step_mm: float = 2.0,
     max_points: int = 120_000,
 ) -> OverlapEstimate2D:
-    top_rects = [_segment_rect(s) for s in top]
-    bottom_rects = [_segment_rect(s) for s in bottom]
-
-    rects = top_rects + bottom_rects
-    if not rects:
+    # method="grid": legacy point-sampling estimate (kept as default for reproducible datasets).
+    # method="exact": exact union/intersection areas; grid_step_mm is reported as 0.
+    top = as_segment_array(top)
+    bottom = as_segment_array(bottom)
+    if method == "exact":
+        return _exact_overlap(top, bottom)
+    if method != "grid":
+        raise ValueError(f"overlap method must be one of {OVERLAP_METHODS}")
+
+    top_rects = top.rects()
+    bottom_rects = bottom.rects()
+
+    rects = np.concatenate([top_rects, bottom_rects], axis=0)
+    if len(rects) == 0:
         return OverlapEstimate2D(
             top_area_est_mm2=0.0,
             bottom_area_est_mm2=0.0,
@@ -79,10 +247,10 @@ def _estimate_overlap(
             grid_step_mm=default_grid_step_mm,
         )
 
-    u_min = min(r.u_min for r in rects)
-    u_max = max(r.u_max for r in rects)
-    v_min = min(r.v_min for r in rects)
-    v_max = max(r.v_max for r in rects)
+    u_min = float(rects[:, 0].min())
+    u_max = float(rects[:, 1].max())
+    v_min = float(rects[:, 2].min())
+    v_max = float(rects[:, 3].max())
     span_u = u_max - u_min
     span_v = v_max - v_min
     if span_u <= 0 or span_v <= 0:
@@ -99,28 +267,15 @@ def _estimate_overlap(
     ny = max(1, int(span_v / grid) + 1)
     grid = max(grid, span_u / float(nx), span_v / float(ny))
 
-    def contains(rects_: list[_Rect], u: float, v: float) -> bool:
-        for r in rects_:
-            if r.u_min <= u <= r.u_max and r.v_min <= v <= r.v_max:
-                return True
-        return False
-
-    top_count = 0
-    bottom_count = 0
-    overlap_count = 0
-
-    for ix in range(nx):
-        u = u_min + (ix + 0.5) * grid
-        for iy in range(ny):
-            v = v_min + (iy + 0.5) * grid
-            in_top = contains(top_rects, u, v)
-            in_bottom = contains(bottom_rects, u, v)
-            if in_top:
-                top_count += 1
-            if in_bottom:
-                bottom_count += 1
-            if in_top and in_bottom:
-                overlap_count += 1
+    # Same sample points as the per-point loop: u_min + (ix + 0.5) * grid.
+    u = u_min + (np.arange(nx, dtype=np.float64) + 0.5) * grid
+    v = v_min + (np.arange(ny, dtype=np.float64) + 0.5) * grid
+    in_top = _grid_coverage(top_rects, u, v)
+    in_bottom = _grid_coverage(bottom_rects, u, v)
+
+    top_count = int(np.count_nonzero(in_top))
+    bottom_count = int(np.count_nonzero(in_bottom))
+    overlap_count = int(np.count_nonzero(in_top & in_bottom))
 
     cell_area = grid * grid
     top_area = float(top_count) * cell_area
@@ -138,12 +293,35 @@ def _estimate_overlap(
     )
 
 
+def turn_layer_assignment(
+    turns: int,
+    *,
+    layer_mode_idx: int,
+    radial_split_top_turn_fraction: float,
+    radial_split_outer_is_top: bool,
+) -> list[bool]:
+    # Per turn (outermost first): True => top, False => bottom.
+    if layer_mode_idx == 0:
+        return [True] * turns
+    if layer_mode_idx == 2:
+        return [(t % 2) == 0 for t in range(turns)]
+    top_turns = int(round(float(turns) * radial_split_top_turn_fraction))
+    top_turns = max(0, min(turns, top_turns))
+    if top_turns == 0:
+        top_turns = 1
+    if radial_split_outer_is_top:
+        return [t < top_turns for t in range(turns)]
+    return [t >= (turns - top_turns) for t in range(turns)]
+
+
 def layer_rect_spiral(
     mask: RectSpiralMask2D,
     *,
     layer_mode_idx: int,
     radial_split_top_turn_fraction: float,
     radial_split_outer_is_top: bool,
+    overlap_method: str = "grid",
+    with_overlap: bool = True,
 ) -> LayeredSpiral2D:
     if layer_mode_idx not in (0, 1, 2):
         raise ValueError("layer_mode_idx must be 0(single_layer_top), 1(radial_split), or 2(alternate_turns)")
@@ -156,34 +334,21 @@ def layer_rect_spiral(
     if len(mask.polyline) != 1 + 4 * turns:
         raise ValueError("mask.polyline must have length (1 + 4*turns)")
 
-    # True => top, False => bottom
-    assign_top: list[bool]
-    if layer_mode_idx == 0:
-        assign_top = [True] * turns
-    elif layer_mode_idx == 2:
-        assign_top = [(t % 2) == 0 for t in range(turns)]
-    else:
-        top_turns = int(round(float(turns) * radial_split_top_turn_fraction))
-        top_turns = max(0, min(turns, top_turns))
-        if top_turns == 0:
-            top_turns = 1
-        if radial_split_outer_is_top:
-            assign_top = [t < top_turns for t in range(turns)]
-        else:
-            assign_top = [t >= (turns - top_turns) for t in range(turns)]
+    assign_top = turn_layer_assignment(
+        turns,
+        layer_mode_idx=layer_mode_idx,
+        radial_split_top_turn_fraction=radial_split_top_turn_fraction,
+        radial_split_outer_is_top=radial_split_outer_is_top,
+    )
 
     width = mask.derived.trace_width_mm
-    top_segments: list[Segment2D] = []
-    bottom_segments: list[Segment2D] = []
     via_points: list[Point2D] = []
 
-    for seg_idx, (a, b) in enumerate(zip(mask.polyline[:-1], mask.polyline[1:])):
-        turn_idx = seg_idx // 4
-        segment = Segment2D(a=a, b=b, width_mm=width)
-        if assign_top[turn_idx]:
-            top_segments.append(segment)
-        else:
-            bottom_segments.append(segment)
+    # Segment k belongs to turn k // 4.
+    segments = SegmentArray.from_polyline(np.asarray(mask.polyline, dtype=np.float64), width)
+    seg_is_top = np.repeat(np.asarray(assign_top, dtype=bool), 4)
+    top_segments = SegmentArray(segments.data[seg_is_top])
+    bottom_segments = SegmentArray(segments.data[~seg_is_top])
 
     for t in range(turns - 1):
         if assign_top[t] != assign_top[t + 1]:
@@ -194,12 +359,14 @@ def layer_rect_spiral(
     terminal_a_is_top = assign_top[0]
     terminal_b_is_top = assign_top[-1]
 
-    overlap_estimate = _estimate_overlap(tuple(top_segments), tuple(bottom_segments))
+    overlap_estimate = None
+    if with_overlap:
+        overlap_estimate = estimate_overlap(top_segments, bottom_segments, method=overlap_method)
 
     return LayeredSpiral2D(
         layer_mode_idx=layer_mode_idx,
-        top_segments=tuple(top_segments),
-        bottom_segments=tuple(bottom_segments),
+        top_segments=top_segments,
+        bottom_segments=bottom_segments,
         via_points=tuple(via_points),
         terminal_a=terminal_a,
         terminal_b=terminal_b,
@@ -215,6 +382,8 @@ def layer_rect_spirals(
     layer_mode_idx: int,
     radial_split_top_turn_fraction: float,
     radial_split_outer_is_top: bool,
+    overlap_method: str = "grid",
+    with_overlap: bool = True,
 ) -> tuple[LayeredSpiral2D, ...]:
     return tuple(
         layer_rect_spiral(
@@ -222,6 +391,8 @@ def layer_rect_spirals(
             layer_mode_idx=layer_mode_idx,
             radial_split_top_turn_fraction=radial_split_top_turn_fraction,
             radial_split_outer_is_top=radial_split_outer_is_top,
+            overlap_method=overlap_method,
+            with_overlap=with_overlap,
         )
         for mask in masks
     )
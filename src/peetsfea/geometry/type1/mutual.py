@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from peetsfea.domain.type1.sampled_models import TxCoilInstanceSample, Type1Sample
+from peetsfea.geometry.type1.coil_cache import PlanarCoilGeometry, planar_coil_geometry
+from peetsfea.geometry.type1.inductance import (
+    estimate_coil_inductance,
+    greenhouse_inductance_h,
+    series_path_segments,
+)
+from peetsfea.geometry.type1.pcb_faces import COPPER_THICKNESS_MM, PCB_THICKNESS_MM
+from peetsfea.geometry.type1.tx_coil_3d import TxFaceFrame, tx_coil_face_frame_for_name
+
+# TX -> RX coupling estimate without a solve: Neumann double integral
+#   M = mu0/(4*pi) * sum_ij  dl_i . dl_j / |r_i - r_j|
+# over filament pieces (Gauss-Legendre points on every piece, all pairs at once in NumPy).
+# TX filaments are the centrelines of the trace boxes build_tx_planar_trace_coils emits (top
+# copper layer, series order incl. the DD bridge); the RX side is a parametrised rectangular
+# loop in the RX module mid-plane. k = M / sqrt(L_tx * L_rx) with the Greenhouse self terms.
+# Free space: the core/TV materials are not modelled, so k is a ranking feature, not a result.
+
+_MU0_4PI_H_PER_MM = 1e-10
+_MIN_PIECE_MM = 2.0
+
+
+@dataclass(frozen=True)
+class RxLoopParams:
+    # Loop size as a fraction of the RX module width/height; wire width for its self term.
+    fill: float = 0.9
+    wire_width_mm: float = 2.0
+
+
+_DEFAULT_RX_LOOP = RxLoopParams()
+
+
+@dataclass(frozen=True)
+class InstanceCoupling:
+    name: str
+    face: str
+    tx_inductance_uh: float
+    mutual_uh: float
+    k: float
+
+
+@dataclass(frozen=True)
+class TxRxCouplingEstimate:
+    rx_loop: RxLoopParams
+    rx_inductance_uh: float
+    # One entry per present TX coil instance (each instance is its own winding).
+    instances: tuple[InstanceCoupling, ...]
+
+    @property
+    def k_max_abs(self) -> float:
+        return max((abs(inst.k) for inst in self.instances), default=0.0)
+
+
+def _instance_geometry(sample: Type1Sample, coil: TxCoilInstanceSample) -> tuple[TxFaceFrame, PlanarCoilGeometry]:
+    frame = tx_coil_face_frame_for_name(sample, coil.face)
+    geometry = planar_coil_geometry(
+        coil,
+        face_u_size_mm=frame.face_u_size_mm,
+        face_v_size_mm=frame.face_v_size_mm,
+        pcb_layer_count=sample.tx_pcb.layer_count,
+    )
+    return frame, geometry
+
+
+def tx_coil_filaments(sample: Type1Sample, coil: TxCoilInstanceSample) -> np.ndarray:
+    # (n, 2, 3) start/end points (mm) of the instance's series path in 3D.
+    frame, geometry = _instance_geometry(sample, coil)
+    segments, _ = series_path_segments(geometry)
+    pcb_thk = sample.tx_pcb.total_thickness_mm or PCB_THICKNESS_MM
+    top_cu_center_n = frame.center_xyz_mm[frame.normal_axis] + frame.normal_sign * 0.5 * (pcb_thk - COPPER_THICKNESS_MM)
+
+    out = np.empty((segments.shape[0], 2, 3), dtype=np.float64)
+    for end in (0, 1):
+        out[:, end, frame.u_axis] = frame.center_xyz_mm[frame.u_axis] + segments[:, 2 * end]
+        out[:, end, frame.v_axis] = frame.center_xyz_mm[frame.v_axis] + segments[:, 2 * end + 1]
+        out[:, end, frame.normal_axis] = top_cu_center_n
+    return out
+
+
+def rx_loop_filaments(sample: Type1Sample, params: RxLoopParams | None = None) -> np.ndarray:
+    # Rectangle in the RX module mid-plane (x = wall plane + thickness/2), counter-clockwise in (y, z).
+    params = params or _DEFAULT_RX_LOOP
+    x = sample.wall_plane_x_mm + 0.5 * sample.rx_module.thickness_mm
+    cy = sample.rx_position.center_y_mm
+    cz = sample.rx_position.center_z_mm
+    hy = 0.5 * params.fill * sample.rx_module.outer_w_mm
+    hz = 0.5 * params.fill * sample.rx_module.outer_h_mm
+    corners = np.array(
+        [[x, cy - hy, cz - hz], [x, cy + hy, cz - hz], [x, cy + hy, cz + hz], [x, cy - hy, cz + hz]],
+        dtype=np.float64,
+    )
+    return np.stack([corners, np.roll(corners, -1, axis=0)], axis=1)
+
+
+def _quadrature_points(filaments: np.ndarray, max_piece_mm: float, order: int) -> tuple[np.ndarray, np.ndarray]:
+    # Split every filament into pieces <= max_piece_mm, then `order` Gauss-Legendre points per
+    # piece. Returns (points (m, 3), weighted tangents dl (m, 3)).
+    start = filaments[:, 0]
+    delta = filaments[:, 1] - start
+    length = np.linalg.norm(delta, axis=1)
+    pieces = np.maximum(1, np.ceil(length / max_piece_mm)).astype(np.int64)
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    nodes = 0.5 * (nodes + 1.0)
+    weights = 0.5 * weights
+
+    owner = np.repeat(np.arange(len(filaments)), pieces)
+    index = np.arange(len(owner)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    t = (index[:, None] + nodes[None, :]) / pieces[owner][:, None]
+    points = start[owner][:, None, :] + t[:, :, None] * delta[owner][:, None, :]
+    dl = (weights[None, :, None] / pieces[owner][:, None, None]) * delta[owner][:, None, :]
+    return points.reshape(-1, 3), dl.reshape(-1, 3)
+
+
+def _bbox_gap_mm(a: np.ndarray, b: np.ndarray) -> float:
+    lo_a, hi_a = a.reshape(-1, 3).min(axis=0), a.reshape(-1, 3).max(axis=0)
+    lo_b, hi_b = b.reshape(-1, 3).min(axis=0), b.reshape(-1, 3).max(axis=0)
+    return float(np.linalg.norm(np.maximum(0.0, np.maximum(lo_a - hi_b, lo_b - hi_a))))
+
+
+def neumann_mutual_h(
+    a: np.ndarray,
+    b: np.ndarray,
+    *,
+    max_piece_mm: float | None = None,
+    order: int = 4,
+    block: int = 2048,
+) -> float:
+    # a, b: (n, 2, 3) filament start/end points in mm; the loops must not touch.
+    # max_piece_mm=None: half the bounding-box gap between the two sets (>= 2 mm); 4-point
+    # Gauss-Legendre on pieces no longer than the distance is accurate to ~1e-7.
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if max_piece_mm is None:
+        max_piece_mm = max(_MIN_PIECE_MM, 0.5 * _bbox_gap_mm(a, b))
+    pa, dla = _quadrature_points(a, max_piece_mm, order)
+    pb, dlb = _quadrature_points(b, max_piece_mm, order)
+    total = 0.0
+    for start in range(0, len(pa), block):
+        stop = min(start + block, len(pa))
+        r = np.linalg.norm(pa[start:stop, None, :] - pb[None, :, :], axis=2)
+        total += float(np.sum((dla[start:stop] @ dlb.T) / r))
+    return total * _MU0_4PI_H_PER_MM
+
+
+def rx_loop_inductance_h(sample: Type1Sample, params: RxLoopParams | None = None) -> float:
+    params = params or _DEFAULT_RX_LOOP
+    loop = rx_loop_filaments(sample, params)
+    segments = np.concatenate([loop[:, 0, 1:], loop[:, 1, 1:]], axis=1)
+    return greenhouse_inductance_h(segments, params.wire_width_mm, thickness_mm=params.wire_width_mm)
+
+
+def estimate_tx_rx_coupling(
+    sample: Type1Sample,
+    params: RxLoopParams | None = None,
+) -> TxRxCouplingEstimate | None:
+    # None when either module is absent.
+    params = params or _DEFAULT_RX_LOOP
+    if not sample.tx_module.present or not sample.rx_module.present:
+        return None
+    rx = rx_loop_filaments(sample, params)
+    l_rx = rx_loop_inductance_h(sample, params)
+    instances: list[InstanceCoupling] = []
+    for coil in sample.tx_coil.instances:
+        if not coil.present:
+            continue
+        _, geometry = _instance_geometry(sample, coil)
+        l_tx = estimate_coil_inductance(geometry).greenhouse_uh * 1e-6
+        mutual = neumann_mutual_h(tx_coil_filaments(sample, coil), rx)
+        instances.append(
+            InstanceCoupling(
+                name=coil.name,
+                face=coil.face,
+                tx_inductance_uh=l_tx * 1e6,
+                mutual_uh=mutual * 1e6,
+                k=mutual / math.sqrt(l_tx * l_rx),
+            )
+        )
+    return TxRxCouplingEstimate(rx_loop=params, rx_inductance_uh=l_rx * 1e6, instances=tuple(instances))
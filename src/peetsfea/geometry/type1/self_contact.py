@@ -1,53 +1,17 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass
+import heapq
 
-from peetsfea.geometry.type1.layer_modes import Segment2D
+from peetsfea.geometry.type1.layer_modes import Segment2D, SegmentArray, as_segment_array
 
 
-PointKey = tuple[float, float]
+Rect = tuple[float, float, float, float]  # u_min, u_max, v_min, v_max
 
 
-def _key(point: tuple[float, float], *, ndigits: int = 6) -> PointKey:
-    return (round(point[0], ndigits), round(point[1], ndigits))
-
-
-@dataclass(frozen=True)
-class Rect2D:
-    u_min: float
-    u_max: float
-    v_min: float
-    v_max: float
-
-
-def _segment_rect(seg: Segment2D) -> Rect2D:
-    (u1, v1) = seg.a
-    (u2, v2) = seg.b
-    half = seg.width_mm * 0.5
-
-    if u1 == u2 and v1 == v2:
-        return Rect2D(u1 - half, u1 + half, v1 - half, v1 + half)
-
-    if v1 == v2:
-        u_min = min(u1, u2) - half
-        u_max = max(u1, u2) + half
-        return Rect2D(u_min, u_max, v1 - half, v1 + half)
-
-    if u1 == u2:
-        v_min = min(v1, v2) - half
-        v_max = max(v1, v2) + half
-        return Rect2D(u1 - half, u1 + half, v_min, v_max)
-
-    raise ValueError("Only axis-aligned segments are supported")
-
-
-def _rects_intersect(a: Rect2D, b: Rect2D) -> bool:
-    return not (
-        a.u_max < b.u_min
-        or b.u_max < a.u_min
-        or a.v_max < b.v_min
-        or b.v_max < a.v_min
-    )
+def _rects_intersect(a: Rect, b: Rect) -> bool:
+    return not (a[1] < b[0] or b[1] < a[0] or a[3] < b[2] or b[3] < a[2])
 
 
 @dataclass(frozen=True)
@@ -58,27 +22,59 @@ class SelfContactReport2D:
 
 
 def detect_self_contact(
-    segments: tuple[Segment2D, ...],
+    segments: SegmentArray | tuple[Segment2D, ...],
     *,
     ndigits: int = 6,
     max_pairs: int = 30,
 ) -> SelfContactReport2D:
-    if not segments:
+    segments = as_segment_array(segments)
+    if not len(segments):
         return SelfContactReport2D(detected=False, pair_count=0, example_pairs=())
 
-    rects = [_segment_rect(seg) for seg in segments]
-    endpoints = [({_key(seg.a, ndigits=ndigits), _key(seg.b, ndigits=ndigits)}) for seg in segments]
-
+    rects: list[Rect] = [tuple(r) for r in segments.rects().tolist()]
+    endpoints = [{ka, kb} for ka, kb in segments.endpoint_keys(ndigits=ndigits)]
+
+    # Sort-and-sweep along u. Active rects are split into "flat" ones (no taller than wide,
+    # i.e. horizontal traces, which stay active across most of the sweep) kept sorted by
+    # v_min so only a v-window needs checking, and "tall" ones (vertical traces, which
+    # leave the active set after ~one trace width) scanned linearly.
+    flat = [(r[3] - r[2]) <= (r[1] - r[0]) for r in rects]
+    flat_h_max = max((r[3] - r[2] for r, f in zip(rects, flat) if f), default=0.0)
+    # Widen the window slightly so float rounding of v_max - v_min never drops a candidate;
+    # every candidate is still checked with _rects_intersect.
+    window = flat_h_max * (1.0 + 1e-9) + 1e-9
+
+    active_flat: list[tuple[float, int]] = []
+    active_tall: list[int] = []
+    expiry: list[tuple[float, int]] = []
     pairs: list[tuple[int, int]] = []
-    count = 0
-    for i in range(len(segments)):
-        for j in range(i + 1, len(segments)):
-            if endpoints[i].intersection(endpoints[j]):
-                continue
-            if _rects_intersect(rects[i], rects[j]):
-                count += 1
-                if len(pairs) < max_pairs:
-                    pairs.append((i, j))
-
-    return SelfContactReport2D(detected=(count > 0), pair_count=count, example_pairs=tuple(pairs))
 
+    for i in sorted(range(len(rects)), key=lambda k: (rects[k][0], k)):
+        r = rects[i]
+        while expiry and expiry[0][0] < r[0]:
+            _, k = heapq.heappop(expiry)
+            if flat[k]:
+                del active_flat[bisect_left(active_flat, (rects[k][2], k))]
+            else:
+                active_tall.remove(k)
+
+        lo = bisect_left(active_flat, (r[2] - window, -1))
+        hi = bisect_right(active_flat, (r[3], len(rects)))
+        candidates = [k for _, k in active_flat[lo:hi]]
+        candidates.extend(active_tall)
+        for k in candidates:
+            if endpoints[i].intersection(endpoints[k]):
+                continue
+            if _rects_intersect(r, rects[k]):
+                pairs.append((k, i) if k < i else (i, k))
+
+        heapq.heappush(expiry, (r[1], i))
+        if flat[i]:
+            insort(active_flat, (r[2], i))
+        else:
+            active_tall.append(i)
+
+    # Same ordering as a plain i<j double loop, so pair_count/example_pairs are unchanged.
+    pairs.sort()
+    count = len(pairs)
+    return SelfContactReport2D(detected=(count > 0), pair_count=count, example_pairs=tuple(pairs[:max_pairs]))
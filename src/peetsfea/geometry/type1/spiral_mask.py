@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class Rect2D:
@@ -115,14 +117,14 @@ def derive_rect_spiral(
     return RectSpiralDerived(bounds=bounds, pitch_mm=pitch, trace_width_mm=width, trace_gap_mm=gap)
 
 
-def rect_spiral_polyline(
+def rect_spiral_polyline_array(
     *,
     bounds: Rect2D,
     turns: int,
     pitch_mm: float,
     start_edge_idx: int,
     direction_idx: int,
-) -> tuple[Point2D, ...]:
+) -> np.ndarray:
     if turns <= 0:
         raise ValueError("turns must be > 0")
     if pitch_mm <= 0:
@@ -159,55 +161,131 @@ def rect_spiral_polyline(
         }
         turn_delta = -1  # right turn
 
-    (u, v), direction = start_map[start_edge_idx]
-
-    points: list[Point2D] = [(u, v)]
-
-    left = u_min
-    right = u_max
-    bottom = v_min
-    top = v_max
-
-    def move_to_boundary(direction_: int, u0: float, v0: float) -> tuple[float, float]:
-        if direction_ == east:
-            return right, v0
-        if direction_ == west:
-            return left, v0
-        if direction_ == north:
-            return u0, top
-        if direction_ == south:
-            return u0, bottom
-        raise RuntimeError("Invalid direction")
-
-    def shrink_used_boundary(direction_: int, u0: float, v0: float) -> None:
-        nonlocal left, right, bottom, top
-        if direction_ in (east, west):
-            if v0 == bottom:
-                bottom += pitch_mm
-            elif v0 == top:
-                top -= pitch_mm
-            else:
-                raise RuntimeError("Spiral state error: expected v on top/bottom boundary")
+    (u0, v0), d0 = start_map[start_edge_idx]
+
+    # Move k heads in direction d_k = d0 + k*turn_delta towards the boundary on that side,
+    # travelling along the boundary of direction d_k - turn_delta, which is then pulled in
+    # by one pitch. So each boundary moves once every 4 moves; its value after n moves is
+    # the n-th running sum (accumulate keeps the same rounding as repeated `+= pitch`).
+    n_moves = 4 * turns
+    steps = np.full(turns, pitch_mm, dtype=np.float64)
+    boundary = np.empty((4, turns + 1), dtype=np.float64)
+    boundary[east] = np.subtract.accumulate(np.concatenate(([u_max], steps)))
+    boundary[north] = np.subtract.accumulate(np.concatenate(([v_max], steps)))
+    boundary[west] = np.add.accumulate(np.concatenate(([u_min], steps)))
+    boundary[south] = np.add.accumulate(np.concatenate(([v_min], steps)))
+
+    k = np.arange(n_moves)
+    # Number of times boundary b has moved before move k (b moves on moves j with
+    # d_j - turn_delta == b, i.e. j = (b + turn_delta - d0) * turn_delta mod 4).
+    moved = np.empty((4, n_moves), dtype=np.int64)
+    for b in (east, north, west, south):
+        phase = ((b + turn_delta - d0) * turn_delta) % 4
+        moved[b] = (k - phase + 3) // 4
+
+    left = boundary[west][moved[west]]
+    right = boundary[east][moved[east]]
+    bottom = boundary[south][moved[south]]
+    top = boundary[north][moved[north]]
+    if np.any((left >= right) | (bottom >= top)):
+        raise ValueError("Spiral does not fit: bounds collapsed before completing requested turns")
+
+    dirs = (d0 + k * turn_delta) % 4
+    target = boundary[dirs, moved[dirs, k]]
+    horizontal = (dirs == east) | (dirs == west)
+
+    points = np.empty((n_moves + 1, 2), dtype=np.float64)
+    points[0] = (u0, v0)
+    # Moves alternate horizontal/vertical, so the coordinate a move keeps is the one the
+    # previous move set (or the start point for move 0).
+    u = np.where(horizontal, target, np.nan)
+    v = np.where(horizontal, np.nan, target)
+    if horizontal[0]:
+        v[0] = v0
+    else:
+        u[0] = u0
+    u[1:] = np.where(horizontal[1:], u[1:], u[:-1])
+    v[1:] = np.where(horizontal[1:], v[:-1], v[1:])
+    points[1:, 0] = u
+    points[1:, 1] = v
+
+    # Zero-length moves are dropped, as in the step-by-step walk.
+    keep = np.ones(n_moves + 1, dtype=bool)
+    keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+    return points[keep]
+
+
+# Symbolic vertex coordinate: (side, moves) = the boundary on `side` pulled inward by
+# `moves` pitches, i.e. u_max - m*p (E), v_max - m*p (N), u_min + m*p (W), v_min + m*p (S).
+SpiralTerm = tuple[int, int]
+SIDE_EAST, SIDE_NORTH, SIDE_WEST, SIDE_SOUTH = 0, 1, 2, 3
+
+
+def rect_spiral_vertex_terms(
+    *,
+    turns: int,
+    start_edge_idx: int,
+    direction_idx: int,
+) -> tuple[tuple[SpiralTerm, SpiralTerm], ...]:
+    # (u_term, v_term) for every vertex of rect_spiral_polyline (same walk, no zero-length drop).
+    if turns <= 0:
+        raise ValueError("turns must be > 0")
+    if start_edge_idx not in (0, 1, 2, 3):
+        raise ValueError("start_edge_idx must be in {0,1,2,3}")
+    if direction_idx not in (0, 1):
+        raise ValueError("direction_idx must be 0(CW) or 1(CCW)")
+
+    east, north, west, south = SIDE_EAST, SIDE_NORTH, SIDE_WEST, SIDE_SOUTH
+    if direction_idx == 1:
+        start_map = {
+            3: ((west, south), east),
+            0: ((east, south), north),
+            2: ((east, north), west),
+            1: ((west, north), south),
+        }
+        turn_delta = 1
+    else:
+        start_map = {
+            3: ((east, south), west),
+            0: ((east, north), south),
+            2: ((west, north), east),
+            1: ((west, south), north),
+        }
+        turn_delta = -1
+
+    (u_side, v_side), d0 = start_map[start_edge_idx]
+    u_term: SpiralTerm = (u_side, 0)
+    v_term: SpiralTerm = (v_side, 0)
+    vertices = [(u_term, v_term)]
+    moved = [0, 0, 0, 0]
+    for k in range(4 * turns):
+        d = (d0 + k * turn_delta) % 4
+        if d in (east, west):
+            u_term = (d, moved[d])
         else:
-            if u0 == left:
-                left += pitch_mm
-            elif u0 == right:
-                right -= pitch_mm
-            else:
-                raise RuntimeError("Spiral state error: expected u on left/right boundary")
-
-    for _ in range(turns):
-        for _ in range(4):
-            if left >= right or bottom >= top:
-                raise ValueError("Spiral does not fit: bounds collapsed before completing requested turns")
-            u_next, v_next = move_to_boundary(direction, u, v)
-            if (u_next, v_next) != points[-1]:
-                points.append((u_next, v_next))
-            shrink_used_boundary(direction, u_next, v_next)
-            direction = (direction + turn_delta) % 4
-            u, v = u_next, v_next
-
-    return tuple(points)
+            v_term = (d, moved[d])
+        vertices.append((u_term, v_term))
+        # The boundary this move travelled along is pulled in by one pitch.
+        moved[(d - turn_delta) % 4] += 1
+    return tuple(vertices)
+
+
+def rect_spiral_polyline(
+    *,
+    bounds: Rect2D,
+    turns: int,
+    pitch_mm: float,
+    start_edge_idx: int,
+    direction_idx: int,
+) -> tuple[Point2D, ...]:
+    points = rect_spiral_polyline_array(
+        bounds=bounds,
+        turns=turns,
+        pitch_mm=pitch_mm,
+        start_edge_idx=start_edge_idx,
+        direction_idx=direction_idx,
+    )
+    return tuple((u, v) for u, v in points.tolist())
 
 
 def split_dd_bounds(
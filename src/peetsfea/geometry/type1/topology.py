@@ -2,14 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from peetsfea.geometry.type1.layer_modes import Segment2D
-
-
-PointKey = tuple[float, float]
-
-
-def _key(point: tuple[float, float], *, ndigits: int = 6) -> PointKey:
-    return (round(point[0], ndigits), round(point[1], ndigits))
+from peetsfea.geometry.type1.layer_modes import PointKey, Segment2D, SegmentArray, as_segment_array
 
 
 @dataclass(frozen=True)
@@ -20,23 +13,18 @@ class TopologyReport2D:
 
 
 def topology_from_segments(
-    segments: tuple[Segment2D, ...],
+    segments: SegmentArray | tuple[Segment2D, ...],
     *,
     ndigits: int = 6,
 ) -> TopologyReport2D:
     adj: dict[PointKey, set[PointKey]] = {}
 
-    def add_edge(a: tuple[float, float], b: tuple[float, float]) -> None:
-        ka = _key(a, ndigits=ndigits)
-        kb = _key(b, ndigits=ndigits)
+    for ka, kb in as_segment_array(segments).endpoint_keys(ndigits=ndigits):
         if ka == kb:
-            return
+            continue
         adj.setdefault(ka, set()).add(kb)
         adj.setdefault(kb, set()).add(ka)
 
-    for seg in segments:
-        add_edge(seg.a, seg.b)
-
     if not adj:
         return TopologyReport2D(component_count=0, endpoints_count=0, has_branch=False)
 
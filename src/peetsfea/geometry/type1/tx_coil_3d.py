@@ -3,8 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from peetsfea.domain.type1.sampled_models import TxCoilInstanceSample, Type1Sample
-from peetsfea.geometry.plan import OperationPlan, ParametricBoxPlan
-from peetsfea.geometry.type1.layer_modes import LayeredSpiral2D, Segment2D, layer_rect_spirals
+from peetsfea.geometry.plan import OperationPlan, ParametricBoxPlan, ParametricPolylinePlan
+from peetsfea.geometry.type1.coil_cache import planar_coil_geometry
+from peetsfea.geometry.type1.layer_modes import Segment2D, turn_layer_assignment
 from peetsfea.geometry.type1.pcb_faces import (
     ASPECT_MIN_RATIO,
     COPPER_THICKNESS_MM,
@@ -12,7 +13,7 @@ from peetsfea.geometry.type1.pcb_faces import (
     INWARD_OFFSET_FACTOR,
     PCB_THICKNESS_MM,
 )
-from peetsfea.geometry.type1.spiral_mask import DdSplit, RectSpiralMask2D, build_planar_rect_spiral_masks
+from peetsfea.geometry.type1.spiral_mask import RectSpiralMask2D
 
 
 def _num(value: float) -> str:
@@ -192,7 +193,7 @@ def _sign(value: float) -> int:
     return 0
 
 
-def _terminal_out_dir_from_mask(mask: RectSpiralMask2D, which: str) -> tuple[str, int]:
+def terminal_out_dir_from_mask(mask: RectSpiralMask2D, which: str) -> tuple[str, int]:
     if which not in ("a", "b"):
         raise ValueError("which must be 'a' or 'b'")
     if len(mask.polyline) < 2:
@@ -216,12 +217,67 @@ def _terminal_out_dir_from_mask(mask: RectSpiralMask2D, which: str) -> tuple[str
     return "v", _sign(dv)
 
 
+def _layer_runs(assign_top: list[bool], top: bool) -> list[tuple[int, int]]:
+    # Contiguous turns on one layer as polyline vertex ranges [start, end] (4 vertices per turn).
+    runs: list[tuple[int, int]] = []
+    t = 0
+    while t < len(assign_top):
+        if assign_top[t] != top:
+            t += 1
+            continue
+        start = t
+        while t < len(assign_top) and assign_top[t] == top:
+            t += 1
+        runs.append((4 * start, 4 * t))
+    return runs
+
+
+def _extend_ends(points: list[tuple[float, float]], amount: float) -> list[tuple[float, float]]:
+    # Box strips reach half a trace width past each end; a swept polyline stops at its ends.
+    def pushed(p: tuple[float, float], q: tuple[float, float]) -> tuple[float, float]:
+        du = p[0] - q[0]
+        dv = p[1] - q[1]
+        return (p[0] + _sign(du) * amount, p[1] + _sign(dv) * amount)
+
+    out = list(points)
+    out[0] = pushed(points[0], points[1])
+    out[-1] = pushed(points[-1], points[-2])
+    return out
+
+
 def build_tx_planar_trace_coil(
     sample: Type1Sample,
     coil: TxCoilInstanceSample,
     *,
     name_prefix: str = "TX_Coil",
     frame: TxFaceFrame | None = None,
+) -> tuple[list[ParametricBoxPlan], list[OperationPlan]]:
+    return _build_tx_trace_coil(sample, coil, name_prefix=name_prefix, frame=frame, polylines=None)
+
+
+def build_tx_polyline_trace_coil(
+    sample: Type1Sample,
+    coil: TxCoilInstanceSample,
+    *,
+    name_prefix: str = "TX_Coil",
+    frame: TxFaceFrame | None = None,
+) -> tuple[list[ParametricPolylinePlan], list[ParametricBoxPlan], list[OperationPlan]]:
+    # Same coil, but each run of turns on one layer is a single swept polyline; vias, tabs and
+    # the DD bridge stay boxes. Object count is O(layer runs) instead of O(4*turns): one or two
+    # runs per spiral for single-layer/radial-split, but one run per turn for alternating
+    # turns, where consecutive same-layer turns are only connected through the other layer.
+    polylines: list[ParametricPolylinePlan] = []
+    boxes, operations = _build_tx_trace_coil(sample, coil, name_prefix=name_prefix, frame=frame, polylines=polylines)
+    return polylines, boxes, operations
+
+
+def _build_tx_trace_coil(
+    sample: Type1Sample,
+    coil: TxCoilInstanceSample,
+    *,
+    name_prefix: str,
+    frame: TxFaceFrame | None,
+    polylines: list[ParametricPolylinePlan] | None,
 ) -> tuple[list[ParametricBoxPlan], list[OperationPlan]]:
     if not sample.tx_module.present or not coil.present:
         return [], []
@@ -233,34 +289,15 @@ def build_tx_planar_trace_coil(
     if frame is None:
         return [], []
 
-    dd = None
-    if coil.spiral_count == 2:
-        dd = DdSplit(axis_idx=coil.dd_split_axis_idx, gap_mm=coil.dd_gap_mm, ratio=coil.dd_split_ratio)
-
-    masks = build_planar_rect_spiral_masks(
+    coil_geometry = planar_coil_geometry(
+        coil,
         face_u_size_mm=frame.face_u_size_mm,
         face_v_size_mm=frame.face_v_size_mm,
-        spiral_count=coil.spiral_count,
-        turns=coil.spiral_turns,
-        direction_idx=coil.spiral_direction_idx,
-        start_edge_idx=coil.spiral_start_edge_idx,
-        edge_clearance_mm=coil.edge_clearance_mm,
-        fill_scale=coil.fill_scale,
-        pitch_duty=coil.pitch_duty,
-        min_trace_width_mm=coil.min_trace_width_mm,
-        min_trace_gap_mm=coil.min_trace_gap_mm,
-        dd=dd,
+        pcb_layer_count=sample.tx_pcb.layer_count,
     )
-
+    masks = coil_geometry.masks
+    layered = coil_geometry.layered
     effective_trace_layers = min(sample.tx_pcb.layer_count, coil.trace_layer_count)
-    layer_mode_idx = coil.layer_mode_idx if effective_trace_layers >= 2 else 0
-
-    layered = layer_rect_spirals(
-        masks,
-        layer_mode_idx=layer_mode_idx,
-        radial_split_top_turn_fraction=coil.radial_split_top_turn_fraction,
-        radial_split_outer_is_top=coil.radial_split_outer_is_top,
-    )
 
     face_center_xyz = list(frame.center_xyz_mm)
     face_center_n = face_center_xyz[frame.normal_axis]
@@ -300,12 +337,12 @@ def build_tx_planar_trace_coil(
         unite_targets.append(name)
 
     def add_segment(
-        seg: Segment2D,
+        rect: tuple[float, float, float, float],
         *,
         n_center_mm: float,
         name: str,
     ) -> None:
-        u_min, u_max, v_min, v_max = _segment_rect(seg)
+        u_min, u_max, v_min, v_max = rect
         corner = [0.0, 0.0, 0.0]
         size = [0.0, 0.0, 0.0]
 
@@ -350,16 +387,73 @@ def build_tx_planar_trace_coil(
             return
         add_via(point_uv, name=name, size_mm=size_mm)
 
+    def add_polyline(
+        points_uv: list[tuple[float, float]],
+        *,
+        n_center_mm: float,
+        name: str,
+        width_mm: float,
+    ) -> None:
+        assert polylines is not None
+        points: list[tuple[str, str, str]] = []
+        for u, v in _extend_ends(points_uv, 0.5 * width_mm):
+            xyz = ["", "", ""]
+            xyz[frame.u_axis] = _lit(frame.center_xyz_mm[frame.u_axis] + u, units)
+            xyz[frame.v_axis] = _lit(frame.center_xyz_mm[frame.v_axis] + v, units)
+            xyz[frame.normal_axis] = _lit(n_center_mm, units)
+            points.append((xyz[0], xyz[1], xyz[2]))
+        polylines.append(
+            ParametricPolylinePlan(
+                name=name,
+                points_expr=tuple(points),
+                xsection_width=_lit(width_mm, units),
+                xsection_height=_lit(copper_thk, units),
+                material="copper",
+                model=True,
+            )
+        )
+        unite_targets.append(name)
+
     seg_i = 0
     via_i = 0
 
+    if polylines is not None:
+        line_i = 0
+        for idx, mask in enumerate(masks):
+            assign_top = turn_layer_assignment(
+                mask.turns,
+                layer_mode_idx=coil_geometry.layer_mode_idx_effective,
+                radial_split_top_turn_fraction=coil.radial_split_top_turn_fraction,
+                radial_split_outer_is_top=coil.radial_split_outer_is_top,
+            )
+            width = mask.derived.trace_width_mm
+            layers = [(True, top_cu_center_n, "Top")]
+            if effective_trace_layers >= 2:
+                layers.append((False, bot_cu_center_n, "Bot"))
+            for top, n_center, label in layers:
+                for start, end in _layer_runs(assign_top, top):
+                    add_polyline(
+                        list(mask.polyline[start : end + 1]),
+                        n_center_mm=n_center,
+                        name=f"{name_prefix}_{label}Line_{idx}_{line_i:05d}",
+                        width_mm=width,
+                    )
+                    line_i += 1
+
     for idx, (mask, lay) in enumerate(zip(masks, layered)):
-        for seg in lay.top_segments:
-            add_segment(seg, n_center_mm=top_cu_center_n, name=f"{name_prefix}_Top_{idx}_{seg_i:05d}")
+        if polylines is not None:
+            # Traces already emitted as polylines; only layer-change vias remain.
+            if effective_trace_layers >= 2:
+                for p in lay.via_points:
+                    add_via(p, name=f"{name_prefix}_Via_{idx}_{via_i:05d}", size_mm=mask.derived.trace_width_mm)
+                    via_i += 1
+            continue
+        for rect in lay.top_segments.rects().tolist():
+            add_segment(rect, n_center_mm=top_cu_center_n, name=f"{name_prefix}_Top_{idx}_{seg_i:05d}")
             seg_i += 1
         if effective_trace_layers >= 2:
-            for seg in lay.bottom_segments:
-                add_segment(seg, n_center_mm=bot_cu_center_n, name=f"{name_prefix}_Bot_{idx}_{seg_i:05d}")
+            for rect in lay.bottom_segments.rects().tolist():
+                add_segment(rect, n_center_mm=bot_cu_center_n, name=f"{name_prefix}_Bot_{idx}_{seg_i:05d}")
                 seg_i += 1
 
             via_size = mask.derived.trace_width_mm
@@ -416,7 +510,7 @@ def build_tx_planar_trace_coil(
     # Terminal A: spiral 0 start
     mask_a = masks[0]
     lay_a = layered[0]
-    out_axis_a, out_sign_a = _terminal_out_dir_from_mask(mask_a, "a")
+    out_axis_a, out_sign_a = terminal_out_dir_from_mask(mask_a, "a")
     add_terminal_tab(
         lay_a.terminal_a,
         out_axis=out_axis_a,
@@ -434,7 +528,7 @@ def build_tx_planar_trace_coil(
     # Terminal B: last spiral end
     mask_b = masks[-1]
     lay_b = layered[-1]
-    out_axis_b, out_sign_b = _terminal_out_dir_from_mask(mask_b, "b")
+    out_axis_b, out_sign_b = terminal_out_dir_from_mask(mask_b, "b")
     add_terminal_tab(
         lay_b.terminal_b,
         out_axis=out_axis_b,
@@ -469,19 +563,19 @@ def build_tx_planar_trace_coil(
 
         if p0[0] == p1[0] or p0[1] == p1[1]:
             add_segment(
-                Segment2D(a=p0, b=p1, width_mm=bridge_width),
+                _segment_rect(Segment2D(a=p0, b=p1, width_mm=bridge_width)),
                 n_center_mm=top_cu_center_n,
                 name=f"{name_prefix}_Bridge_00000",
             )
         else:
             mid = (p1[0], p0[1])
             add_segment(
-                Segment2D(a=p0, b=mid, width_mm=bridge_width),
+                _segment_rect(Segment2D(a=p0, b=mid, width_mm=bridge_width)),
                 n_center_mm=top_cu_center_n,
                 name=f"{name_prefix}_Bridge_00000",
             )
             add_segment(
-                Segment2D(a=mid, b=p1, width_mm=bridge_width),
+                _segment_rect(Segment2D(a=mid, b=p1, width_mm=bridge_width)),
                 n_center_mm=top_cu_center_n,
                 name=f"{name_prefix}_Bridge_00001",
             )
@@ -503,22 +597,45 @@ def build_tx_planar_trace_coils(
     *,
     name_prefix: str = "TX_Coil",
 ) -> tuple[list[ParametricBoxPlan], list[OperationPlan]]:
+    _, boxes, operations = _build_tx_trace_coils(sample, name_prefix=name_prefix, polyline=False)
+    return boxes, operations
+
+
+def build_tx_polyline_trace_coils(
+    sample: Type1Sample,
+    *,
+    name_prefix: str = "TX_Coil",
+) -> tuple[list[ParametricPolylinePlan], list[ParametricBoxPlan], list[OperationPlan]]:
+    return _build_tx_trace_coils(sample, name_prefix=name_prefix, polyline=True)
+
+
+def _build_tx_trace_coils(
+    sample: Type1Sample,
+    *,
+    name_prefix: str,
+    polyline: bool,
+) -> tuple[list[ParametricPolylinePlan], list[ParametricBoxPlan], list[OperationPlan]]:
     present_instances = [inst for inst in sample.tx_coil.instances if inst.present]
     if not present_instances:
-        return [], []
+        return [], [], []
 
+    polylines: list[ParametricPolylinePlan] = []
     boxes: list[ParametricBoxPlan] = []
     operations: list[OperationPlan] = []
     for idx, inst in enumerate(present_instances):
         frame = tx_coil_face_frame_for_name(sample, inst.face)
         prefix = name_prefix if idx == 0 else f"{name_prefix}_{inst.name}"
+        coil_polylines: list[ParametricPolylinePlan] | None = [] if polyline else None
         try:
-            coil_boxes, coil_ops = build_tx_planar_trace_coil(sample, inst, name_prefix=prefix, frame=frame)
+            coil_boxes, coil_ops = _build_tx_trace_coil(
+                sample, inst, name_prefix=prefix, frame=frame, polylines=coil_polylines
+            )
         except ValueError:
             if idx == 0:
                 raise
             continue
+        polylines.extend(coil_polylines or [])
         boxes.extend(coil_boxes)
         operations.extend(coil_ops)
 
-    return boxes, operations
+    return polylines, boxes, operations
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+from peetsfea.domain.type1.sampled_models import TxCoilInstanceSample, Type1Sample
+from peetsfea.geometry.expr import LinearExpr, sstr, symbol
+from peetsfea.geometry.plan import DesignVariable, OperationPlan, ParametricBoxPlan
+from peetsfea.geometry.type1.coil_cache import planar_coil_geometry
+from peetsfea.geometry.type1.layer_modes import turn_layer_assignment
+from peetsfea.geometry.type1.pcb_faces import COPPER_THICKNESS_MM, PCB_THICKNESS_MM
+from peetsfea.geometry.type1.spiral_mask import (
+    SIDE_EAST,
+    SIDE_NORTH,
+    SIDE_SOUTH,
+    SIDE_WEST,
+    SpiralTerm,
+    rect_spiral_vertex_terms,
+)
+from peetsfea.geometry.type1.tx_coil_3d import (
+    TxFaceFrame,
+    terminal_out_dir_from_mask,
+    tx_coil_face_frame_for_name,
+)
+
+# Parametric variant of `build_tx_planar_trace_coil`: the same boxes (names, order, unite),
+# but every coordinate is an expression of a few per-instance design variables
+#   {var}_cu / {var}_cv              face centre along the frame's u/v axes
+#   {var}_n_top / _n_bot / _n_via    copper/via corner along the face normal
+#   {var}_cu_thk / _pcb_thk          copper and PCB thickness
+#   {var}_s{i}_umin/_umax/_vmin/_vmax/_pitch/_w   spiral i centreline bounds, pitch, trace width
+#   {var}_tab_a / _tab_b             terminal tab length/width
+# Vertex coordinates come from `rect_spiral_vertex_terms`, so the expression strings only
+# depend on turns/start edge/direction/layer assignment (+ DD bridge shape), not on sizes.
+# Two samples with the same strings differ only in variable values.
+
+
+def _coil_var_prefix(name_prefix: str) -> str:
+    return name_prefix.lower()
+
+
+def build_tx_parametric_trace_coil(
+    sample: Type1Sample,
+    coil: TxCoilInstanceSample,
+    *,
+    name_prefix: str = "TX_Coil",
+    frame: TxFaceFrame | None = None,
+) -> tuple[list[DesignVariable], list[ParametricBoxPlan], list[OperationPlan]]:
+    if not sample.tx_module.present or not coil.present:
+        return [], [], []
+
+    units = sample.units_length
+    pcb_thk = sample.tx_pcb.total_thickness_mm or PCB_THICKNESS_MM
+    copper_thk = COPPER_THICKNESS_MM
+    frame = frame or tx_coil_face_frame_for_name(sample, coil.face)
+
+    coil_geometry = planar_coil_geometry(
+        coil,
+        face_u_size_mm=frame.face_u_size_mm,
+        face_v_size_mm=frame.face_v_size_mm,
+        pcb_layer_count=sample.tx_pcb.layer_count,
+    )
+    masks = coil_geometry.masks
+    effective_trace_layers = min(sample.tx_pcb.layer_count, coil.trace_layer_count)
+
+    face_center_n = frame.center_xyz_mm[frame.normal_axis]
+    outer_edge = face_center_n + frame.normal_sign * 0.5 * pcb_thk
+    inner_edge = outer_edge - frame.normal_sign * pcb_thk
+    top_cu_center_n = outer_edge - frame.normal_sign * 0.5 * copper_thk
+    bot_cu_center_n = outer_edge - frame.normal_sign * (pcb_thk - 0.5 * copper_thk)
+
+    prefix = _coil_var_prefix(name_prefix)
+    variables: list[DesignVariable] = []
+
+    def var(name: str, value: float) -> LinearExpr:
+        full = f"{prefix}_{name}"
+        variables.append(DesignVariable(name=full, value=value, units=units))
+        return symbol(full)
+
+    cu_s = var("cu", frame.center_xyz_mm[frame.u_axis])
+    cv_s = var("cv", frame.center_xyz_mm[frame.v_axis])
+    n_top_s = var("n_top", top_cu_center_n - 0.5 * copper_thk)
+    n_bot_s = var("n_bot", bot_cu_center_n - 0.5 * copper_thk)
+    n_via_s = var("n_via", min(outer_edge, inner_edge))
+    cu_thk_s = var("cu_thk", copper_thk)
+    pcb_thk_s = var("pcb_thk", max(outer_edge, inner_edge) - min(outer_edge, inner_edge))
+
+    # Per spiral: side value symbols (E, N, W, S), pitch, width, numeric width, vertex terms.
+    spirals: list[tuple[dict[int, LinearExpr], LinearExpr, LinearExpr, float, tuple]] = []
+    for idx, mask in enumerate(masks):
+        us = [p[0] for p in mask.polyline]
+        vs = [p[1] for p in mask.polyline]
+        sides: dict[int, LinearExpr] = {
+            SIDE_EAST: var(f"s{idx}_umax", max(us)),
+            SIDE_NORTH: var(f"s{idx}_vmax", max(vs)),
+            SIDE_WEST: var(f"s{idx}_umin", min(us)),
+            SIDE_SOUTH: var(f"s{idx}_vmin", min(vs)),
+        }
+        pitch_s = var(f"s{idx}_pitch", mask.derived.pitch_mm)
+        w_s = var(f"s{idx}_w", mask.derived.trace_width_mm)
+        terms = rect_spiral_vertex_terms(
+            turns=mask.turns,
+            start_edge_idx=mask.start_edge_idx,
+            direction_idx=mask.direction_idx,
+        )
+        if len(terms) != len(mask.polyline):
+            raise ValueError("Spiral polyline does not match its symbolic vertex terms")
+        spirals.append((sides, pitch_s, w_s, mask.derived.trace_width_mm, terms))
+
+    def coord(spiral_idx: int, term: SpiralTerm) -> LinearExpr:
+        sides, pitch_s, _, _, _ = spirals[spiral_idx]
+        side, moves = term
+        if side in (SIDE_EAST, SIDE_NORTH):
+            return sides[side] - moves * pitch_s
+        return sides[side] + moves * pitch_s
+
+    def expr(value: LinearExpr) -> str:
+        # order="none": same strings as the sympy-based version (Add args in canonical order).
+        return sstr(value, order="none")
+
+    boxes: list[ParametricBoxPlan] = []
+    unite_targets: list[str] = []
+
+    def add_box(name: str, *, uvn_corner: tuple[LinearExpr, ...], uvn_size: tuple[LinearExpr, ...]) -> None:
+        corner: list[str] = ["", "", ""]
+        size: list[str] = ["", "", ""]
+        for axis, c, s in zip((frame.u_axis, frame.v_axis, frame.normal_axis), uvn_corner, uvn_size):
+            corner[axis] = expr(c)
+            size[axis] = expr(s)
+        boxes.append(
+            ParametricBoxPlan(
+                name=name,
+                corner_expr=(corner[0], corner[1], corner[2]),
+                size_expr=(size[0], size[1], size[2]),
+                material="copper",
+                model=True,
+            )
+        )
+        unite_targets.append(name)
+
+    # A point is ((u_expr, u_value), (v_expr, v_value)); values only pick min/max ends.
+    Point = tuple[tuple[LinearExpr, float], tuple[LinearExpr, float]]
+
+    def point(spiral_idx: int, vertex_idx: int) -> Point:
+        terms = spirals[spiral_idx][4]
+        mask = masks[spiral_idx]
+        u_term, v_term = terms[vertex_idx]
+        u_val, v_val = mask.polyline[vertex_idx]
+        return (coord(spiral_idx, u_term), u_val), (coord(spiral_idx, v_term), v_val)
+
+    def add_segment(a: Point, b: Point, *, w_s: LinearExpr, n_corner: LinearExpr, name: str) -> None:
+        half = w_s / 2
+        (au, av), (bu, bv) = a, b
+        if au[1] == bu[1]:
+            lo, hi = (av, bv) if av[1] <= bv[1] else (bv, av)
+            uvn_corner = (cu_s + au[0] - half, cv_s + lo[0] - half, n_corner)
+            uvn_size = (w_s, hi[0] - lo[0] + w_s, cu_thk_s)
+        elif av[1] == bv[1]:
+            lo, hi = (au, bu) if au[1] <= bu[1] else (bu, au)
+            uvn_corner = (cu_s + lo[0] - half, cv_s + av[0] - half, n_corner)
+            uvn_size = (hi[0] - lo[0] + w_s, w_s, cu_thk_s)
+        else:
+            raise ValueError("Only axis-aligned segments are supported")
+        add_box(name, uvn_corner=uvn_corner, uvn_size=uvn_size)
+
+    def add_via(p: Point, *, size_s: LinearExpr, name: str) -> None:
+        half = size_s / 2
+        (u, _), (v, _) = p
+        add_box(
+            name,
+            uvn_corner=(cu_s + u - half, cv_s + v - half, n_via_s),
+            uvn_size=(size_s, size_s, pcb_thk_s),
+        )
+
+    def assignment(spiral_idx: int) -> list[bool]:
+        return turn_layer_assignment(
+            masks[spiral_idx].turns,
+            layer_mode_idx=coil_geometry.layer_mode_idx_effective,
+            radial_split_top_turn_fraction=coil.radial_split_top_turn_fraction,
+            radial_split_outer_is_top=coil.radial_split_outer_is_top,
+        )
+
+    seg_i = 0
+    via_i = 0
+    for idx, mask in enumerate(masks):
+        w_s = spirals[idx][2]
+        assign_top = assignment(idx)
+        n_segments = len(mask.polyline) - 1
+        for k in range(n_segments):
+            if assign_top[k // 4]:
+                add_segment(
+                    point(idx, k),
+                    point(idx, k + 1),
+                    w_s=w_s,
+                    n_corner=n_top_s,
+                    name=f"{name_prefix}_Top_{idx}_{seg_i:05d}",
+                )
+                seg_i += 1
+        if effective_trace_layers >= 2:
+            for k in range(n_segments):
+                if not assign_top[k // 4]:
+                    add_segment(
+                        point(idx, k),
+                        point(idx, k + 1),
+                        w_s=w_s,
+                        n_corner=n_bot_s,
+                        name=f"{name_prefix}_Bot_{idx}_{seg_i:05d}",
+                    )
+                    seg_i += 1
+            for t in range(mask.turns - 1):
+                if assign_top[t] != assign_top[t + 1]:
+                    add_via(point(idx, 4 * (t + 1)), size_s=w_s, name=f"{name_prefix}_Via_{idx}_{via_i:05d}")
+                    via_i += 1
+
+    # Same choice as min(trace_width) in the literal builder; which spiral wins is part of the topology.
+    bridge_idx = min(range(len(masks)), key=lambda i: spirals[i][3])
+    bridge_w_s = spirals[bridge_idx][2]
+
+    def ensure_on_top(p: Point, *, is_top: bool, name: str) -> None:
+        if effective_trace_layers < 2 or is_top:
+            return
+        add_via(p, size_s=bridge_w_s, name=name)
+
+    def add_terminal_tab(p: Point, *, spiral_idx: int, which: str, name: str) -> None:
+        out_axis, out_sign = terminal_out_dir_from_mask(masks[spiral_idx], which)
+        width = spirals[spiral_idx][3]
+        tab_s = var(f"tab_{which}", max(3.0 * width, 1.0))
+        w_s = spirals[spiral_idx][2]
+        overlap = w_s / 2
+        half_tab = tab_s / 2
+        (u, _), (v, _) = p
+        if out_axis == "u":
+            u_lo = u - overlap if out_sign > 0 else u - tab_s
+            uvn_corner = (cu_s + u_lo, cv_s + v - half_tab, n_top_s)
+            uvn_size = (tab_s + overlap, tab_s, cu_thk_s)
+        else:
+            v_lo = v - overlap if out_sign > 0 else v - tab_s
+            uvn_corner = (cu_s + u - half_tab, cv_s + v_lo, n_top_s)
+            uvn_size = (tab_s, tab_s + overlap, cu_thk_s)
+        add_box(name, uvn_corner=uvn_corner, uvn_size=uvn_size)
+
+    last = len(masks) - 1
+    assign_first = assignment(0)
+    assign_last = assignment(last)
+
+    # Terminal A: spiral 0 start
+    term_a = point(0, 0)
+    add_terminal_tab(term_a, spiral_idx=0, which="a", name=name_prefix)
+    ensure_on_top(term_a, is_top=assign_first[0], name=f"{name_prefix}_Terminal_A_Via")
+
+    # Terminal B: last spiral end
+    term_b = point(last, len(masks[last].polyline) - 1)
+    add_terminal_tab(term_b, spiral_idx=last, which="b", name=f"{name_prefix}_Terminal_B_Tab")
+    ensure_on_top(term_b, is_top=assign_last[-1], name=f"{name_prefix}_Terminal_B_Via")
+
+    if coil.spiral_count == 2:
+        # Series connect: spiral0(B) -> spiral1(A) on top layer
+        p0 = point(0, len(masks[0].polyline) - 1)
+        p1 = point(1, 0)
+        ensure_on_top(p0, is_top=assign_first[-1], name=f"{name_prefix}_DD_Conn_Via0")
+        ensure_on_top(p1, is_top=assignment(1)[0], name=f"{name_prefix}_DD_Conn_Via1")
+
+        if p0[0][1] == p1[0][1] or p0[1][1] == p1[1][1]:
+            add_segment(p0, p1, w_s=bridge_w_s, n_corner=n_top_s, name=f"{name_prefix}_Bridge_00000")
+        else:
+            mid: Point = (p1[0], p0[1])
+            add_segment(p0, mid, w_s=bridge_w_s, n_corner=n_top_s, name=f"{name_prefix}_Bridge_00000")
+            add_segment(mid, p1, w_s=bridge_w_s, n_corner=n_top_s, name=f"{name_prefix}_Bridge_00001")
+
+    if not unite_targets:
+        return [], [], []
+
+    if name_prefix in unite_targets:
+        unite_targets = [name_prefix] + [n for n in unite_targets if n != name_prefix]
+
+    return variables, boxes, [OperationPlan(op="unite", targets=unite_targets)]
+
+
+def build_tx_parametric_trace_coils(
+    sample: Type1Sample,
+    *,
+    name_prefix: str = "TX_Coil",
+) -> tuple[list[DesignVariable], list[ParametricBoxPlan], list[OperationPlan]]:
+    present_instances = [inst for inst in sample.tx_coil.instances if inst.present]
+    if not present_instances:
+        return [], [], []
+
+    variables: list[DesignVariable] = []
+    boxes: list[ParametricBoxPlan] = []
+    operations: list[OperationPlan] = []
+    for idx, inst in enumerate(present_instances):
+        frame = tx_coil_face_frame_for_name(sample, inst.face)
+        prefix = name_prefix if idx == 0 else f"{name_prefix}_{inst.name}"
+        try:
+            coil_vars, coil_boxes, coil_ops = build_tx_parametric_trace_coil(
+                sample, inst, name_prefix=prefix, frame=frame
+            )
+        except ValueError:
+            if idx == 0:
+                raise
+            continue
+        variables.extend(coil_vars)
+        boxes.extend(coil_boxes)
+        operations.extend(coil_ops)
+
+    return variables, boxes, operations
@@ -1,20 +1,37 @@
 from .runner import (
     Type1AedtResult,
     Type1RunResult,
+    Type1SpecContext,
     build_project_name,
+    load_type1_spec_context,
     run_type1,
     run_type1_aedt_from_path,
     run_type1_from_path,
 )
-from .dataset import Type1DatasetWriteResult, write_type1_dataset_sample
+from .catalog import GeneCatalog, build_gene_catalog
+from .columnar import ColumnarFeatureSink, flatten_sample_features, read_columnar_features
+from .layout import DatasetLayout, migrate_dataset_layout
+from .manifest import DatasetManifest
+from .dataset import Type1DatasetWriteResult, write_type1_dataset_sample, write_type1_dataset_samples
 
 __all__ = [
+    "ColumnarFeatureSink",
+    "DatasetLayout",
+    "DatasetManifest",
+    "GeneCatalog",
     "Type1AedtResult",
     "Type1DatasetWriteResult",
     "Type1RunResult",
+    "Type1SpecContext",
+    "build_gene_catalog",
     "build_project_name",
+    "flatten_sample_features",
+    "load_type1_spec_context",
+    "migrate_dataset_layout",
+    "read_columnar_features",
     "run_type1",
     "run_type1_aedt_from_path",
     "run_type1_from_path",
     "write_type1_dataset_sample",
+    "write_type1_dataset_samples",
 ]
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Self
+
+from peetsfea.pipeline.layout import DatasetLayout
+
+# SQLite catalog of sampled genes (type1/catalog.sqlite) for selecting seeds without opening
+# every genes.json. Three tables, one row per sample / TX coil instance / spiral:
+#   samples   (full_name PK, seed, spec_hash, version, project_name, status, <sample genes>)
+#   instances (full_name, instance, <instance genes>)
+#   spirals   (full_name, instance, spiral_idx, turns, start_edge_idx, direction_idx, ...)
+# Gene columns are the flattened Type1Sample fields joined with "_" (core_core_gap_mm,
+# tx_pcb_layer_count, spiral_count, ...); derived.json scalars sit next to them with a
+# "derived_" prefix (derived_coupling_k_max_abs, derived_inductance_estimate_greenhouse_uh).
+# Columns are added as new fields appear, so the catalog follows schema changes.
+
+CATALOG_FILE = "catalog.sqlite"
+# (table, column) pairs that get an index as soon as the column exists.
+CATALOG_INDEXES: tuple[tuple[str, str], ...] = (
+    ("samples", "seed"),
+    ("samples", "spec_hash"),
+    ("samples", "core_core_gap_mm"),
+    ("samples", "derived_coupling_k_max_abs"),
+    ("instances", "spiral_count"),
+    ("instances", "layer_mode_idx"),
+    ("spirals", "turns"),
+)
+
+_KEYS = {
+    "samples": ("full_name",),
+    "instances": ("full_name", "instance"),
+    "spirals": ("full_name", "instance", "spiral_idx"),
+}
+# Per-spiral gene lists of an instance; entry i belongs to spiral i.
+_SPIRAL_GENES = {"spiral_turns": "turns", "spiral_start_edge_idx": "start_edge_idx", "spiral_direction_idx": "direction_idx"}
+_BUSY_TIMEOUT_S = 60.0
+
+
+def _flatten(value: Any, prefix: str, out: dict[str, Any]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(item, f"{prefix}_{key}" if prefix else key, out)
+    elif isinstance(value, (list, tuple)):
+        for idx, item in enumerate(value):
+            _flatten(item, f"{prefix}_{idx}", out)
+    elif value is not None:
+        out[prefix] = int(value) if isinstance(value, bool) else value
+
+
+def _without(data: dict[str, Any] | None, *keys: str) -> dict[str, Any]:
+    return {key: value for key, value in (data or {}).items() if key not in keys}
+
+
+def sample_dir_status(sample_dir: Path) -> str:
+    # Status of a finished sample from its files: error (run failed), rejected (failed the
+    # offline plan check, never built) or ok.
+    if not (sample_dir / "genes.json").exists():
+        return "error"
+    results_path = sample_dir / "maxwell" / "results.json"
+    if results_path.exists() and json.loads(results_path.read_text(encoding="utf-8")).get("stage") == "plan_check":
+        return "rejected"
+    return "ok"
+
+
+def catalog_rows(
+    meta: dict[str, Any],
+    status: str,
+    genes: dict[str, Any] | None,
+    derived: dict[str, Any] | None,
+) -> dict[str, list[dict[str, Any]]]:
+    # meta.json / genes.json / derived.json of one sample -> rows per table.
+    full_name = meta["full_name"]
+    sample_genes = (genes or {}).get("sample") or {}
+    tx_coil_derived = (derived or {}).get("tx_coil") or {}
+    coupling = (derived or {}).get("coupling") or {}
+
+    sample_row: dict[str, Any] = {
+        "full_name": full_name,
+        "seed": meta["seed"],
+        "spec_hash": meta["spec_hash"],
+        "version": meta["peetsfea_version"],
+        "project_name": meta["project_name"],
+        "status": status,
+    }
+    _flatten(_without(sample_genes, "tx_coil"), "", sample_row)
+    _flatten(_without(sample_genes.get("tx_coil"), "instances"), "tx_coil", sample_row)
+    _flatten(_without(tx_coil_derived, "instances"), "derived_tx_coil", sample_row)
+    _flatten(_without(coupling, "instances"), "derived_coupling", sample_row)
+
+    derived_by_name = {inst.get("name"): inst for inst in tx_coil_derived.get("instances") or []}
+    coupling_by_name = {inst.get("name"): inst for inst in coupling.get("instances") or []}
+    instance_rows: list[dict[str, Any]] = []
+    spiral_rows: list[dict[str, Any]] = []
+    for inst in (sample_genes.get("tx_coil") or {}).get("instances") or []:
+        name = inst["name"]
+        inst_derived = derived_by_name.get(name) or {}
+        inductance = inst_derived.get("inductance_estimate") or {}
+        row: dict[str, Any] = {"full_name": full_name, "instance": name}
+        _flatten(_without(inst, "name", *_SPIRAL_GENES), "", row)
+        _flatten(_without(inst_derived, "name", "spirals", "inductance_estimate"), "derived", row)
+        _flatten(_without(inductance, "spirals"), "derived_inductance_estimate", row)
+        _flatten(_without(coupling_by_name.get(name), "name", "face"), "derived_coupling", row)
+        instance_rows.append(row)
+
+        per_spiral = inst_derived.get("spirals") or []
+        per_spiral_inductance = inductance.get("spirals") or []
+        for idx in range(int(inst.get("spiral_count") or 0)):
+            spiral: dict[str, Any] = {"full_name": full_name, "instance": name, "spiral_idx": idx}
+            for gene, column in _SPIRAL_GENES.items():
+                values = inst.get(gene) or []
+                if idx < len(values):
+                    spiral[column] = values[idx]
+            if idx < len(per_spiral):
+                _flatten(_without(per_spiral[idx], "turns", "start_edge_idx", "direction_idx"), "derived", spiral)
+            if idx < len(per_spiral_inductance):
+                _flatten(per_spiral_inductance[idx], "derived_inductance", spiral)
+            spiral_rows.append(spiral)
+
+    return {"samples": [sample_row], "instances": instance_rows, "spirals": spiral_rows}
+
+
+def _sql_type(value: Any) -> str:
+    if isinstance(value, int):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    return "TEXT"
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class GeneCatalog:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Writers in several processes (dataset --jobs) serialise on the database lock.
+        self._conn = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT_S, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for table, keys in _KEYS.items():
+            key_sql = ", ".join(f"{_quote(key)} {'INTEGER' if key == 'spiral_idx' else 'TEXT'} NOT NULL" for key in keys)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({key_sql}, PRIMARY KEY ({', '.join(map(_quote, keys))}))"
+            )
+
+    @classmethod
+    def for_dataset(cls, out_root: Path) -> GeneCatalog:
+        return cls(DatasetLayout.open(out_root).root / CATALOG_FILE)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def columns(self, table: str) -> list[str]:
+        if table not in _KEYS:
+            raise ValueError(f"Unknown catalog table: {table!r}")
+        return [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+
+    def _ensure_columns(self, table: str, rows: list[dict[str, Any]]) -> None:
+        existing = set(self.columns(table))
+        for row in rows:
+            for name, value in row.items():
+                if name in existing:
+                    continue
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(name)} {_sql_type(value)}")
+                existing.add(name)
+                if (table, name) in CATALOG_INDEXES:
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{name}')} ON {table} ({_quote(name)})"
+                    )
+
+    def upsert(
+        self,
+        meta: dict[str, Any],
+        status: str,
+        genes: dict[str, Any] | None,
+        derived: dict[str, Any] | None,
+    ) -> None:
+        # Replaces every row of the sample in one transaction.
+        tables = catalog_rows(meta, status, genes, derived)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in _KEYS:
+                self._conn.execute(f"DELETE FROM {table} WHERE full_name = ?", (meta["full_name"],))
+            for table, rows in tables.items():
+                self._ensure_columns(table, rows)
+                for row in rows:
+                    names = ", ".join(map(_quote, row))
+                    marks = ", ".join("?" for _ in row)
+                    self._conn.execute(f"INSERT INTO {table} ({names}) VALUES ({marks})", tuple(row.values()))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def add_sample_dir(self, sample_dir: Path) -> bool:
+        # From the files of a finished sample; False if it is not complete on disk.
+        meta_path = sample_dir / "meta.json"
+        if not meta_path.exists():
+            return False
+        genes_path = sample_dir / "genes.json"
+        derived_path = sample_dir / "derived.json"
+        self.upsert(
+            json.loads(meta_path.read_text(encoding="utf-8")),
+            sample_dir_status(sample_dir),
+            json.loads(genes_path.read_text(encoding="utf-8")) if genes_path.exists() else None,
+            json.loads(derived_path.read_text(encoding="utf-8")) if derived_path.exists() else None,
+        )
+        return True
+
+    def select_seeds(
+        self,
+        sample: str | None = None,
+        *,
+        instance: str | None = None,
+        spiral: str | None = None,
+        params: dict[str, Any] | None = None,
+        spec_hash: str | None = None,
+        version: str | None = None,
+        status: str | None = "ok",
+    ) -> list[int]:
+        # SQL conditions per table level, with :named parameters; a spiral condition must hold
+        # for a spiral of an instance that satisfies the instance condition, e.g.
+        #   select_seeds("core_core_gap_mm < :gap", instance="spiral_count = 2",
+        #                spiral="turns >= 15", params={"gap": 106})
+        where = [f"({sample})" if sample else "1"]
+        bound: dict[str, Any] = dict(params or {})
+        for column, value in (("spec_hash", spec_hash), ("version", version), ("status", status)):
+            if value is not None:
+                where.append(f"s.{column} = :_{column}")
+                bound[f"_{column}"] = value
+        if instance or spiral:
+            spiral_sql = ""
+            if spiral:
+                spiral_sql = (
+                    " AND EXISTS (SELECT 1 FROM spirals p WHERE p.full_name = i.full_name"
+                    f" AND p.instance = i.instance AND ({spiral}))"
+                )
+            where.append(
+                f"EXISTS (SELECT 1 FROM instances i WHERE i.full_name = s.full_name AND ({instance or '1'}){spiral_sql})"
+            )
+        sql = f"SELECT DISTINCT s.seed FROM samples s WHERE {' AND '.join(where)} ORDER BY s.seed"
+        return [int(row[0]) for row in self._conn.execute(sql, bound)]
+
+
+def build_gene_catalog(out_root: Path, sample_dirs: Iterable[Path] | None = None) -> int:
+    # (Re)index existing sample directories of either layout; returns the number added.
+    count = 0
+    with GeneCatalog.for_dataset(out_root) as catalog:
+        for sample_dir in sample_dirs if sample_dirs is not None else DatasetLayout.open(out_root).iter_sample_dirs():
+            count += catalog.add_sample_dir(sample_dir)
+    return count
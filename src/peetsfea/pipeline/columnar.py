@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Literal, Self
+
+import numpy as np
+
+# Columnar copy of the per-sample JSON features for training: genes.json + derived.json are
+# flattened to one scalar per column ("genes.sample.tx_pcb.layer_count",
+# "derived.tx_coil.instances.neg_x.spirals.0.turns", ...), rows are buffered and written in
+# batches (one .npz row group per batch under _parts/), and `close()` consolidates the groups
+# into one .npy file per column plus schema.json. Readers memory-map the columns, so loading
+# a sweep is one small JSON parse plus page-ins of the columns actually used.
+# Plain NumPy formats: pyarrow/Parquet is not a dependency of this package.
+# Every leaf is a column, so the table is wide: ~1000 columns (.npy files) for a sweep of
+# examples/type1.toml, ~110 derived + ~40 gene columns per coil instance name and ~40 per
+# spiral index. The column set is the union over the sweep: it follows the spec's instance
+# names and the largest spiral count / optional fields actually drawn, so two sweeps of one
+# spec can differ in columns. Select columns from schema.json (or use the gene catalog for
+# scalar queries) rather than assuming a fixed layout.
+
+COLUMNAR_FORMAT = "peetsfea.columnar.v1"
+_SCHEMA_FILE = "schema.json"
+_PARTS_DIR = "_parts"
+_NAMES_KEY = "__names__"
+
+
+def _flatten(value: Any, prefix: str, out: dict[str, Any]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(item, f"{prefix}.{key}", out)
+    elif isinstance(value, (list, tuple)):
+        # Named entries (coil instances) are keyed by name so columns stay aligned across
+        # samples with different present instances; everything else by position.
+        for idx, item in enumerate(value):
+            name = item.get("name") if isinstance(item, dict) else None
+            _flatten(item, f"{prefix}.{name if isinstance(name, str) else idx}", out)
+    elif value is not None:
+        out[prefix] = value
+
+
+def flatten_sample_features(
+    genes: dict[str, Any] | None,
+    derived: dict[str, Any] | None,
+    **scalars: Any,
+) -> dict[str, Any]:
+    # One row: extra scalars (seed, status, ...) first, then genes.* and derived.* leaves.
+    row: dict[str, Any] = {key: value for key, value in scalars.items() if value is not None}
+    if genes is not None:
+        _flatten(genes, "genes", row)
+    if derived is not None:
+        _flatten(derived, "derived", row)
+    return row
+
+
+def _column_array(values: list[Any]) -> np.ndarray:
+    # None marks a missing value. bool/int columns with gaps are widened to float64 (NaN).
+    present = [v for v in values if v is not None]
+    if any(isinstance(v, str) for v in present):
+        return np.array(["" if v is None else str(v) for v in values], dtype=str)
+    missing = len(present) != len(values)
+    if not missing and all(isinstance(v, (bool, np.bool_)) for v in present):
+        return np.array(values, dtype=np.bool_)
+    if not missing and all(isinstance(v, (int, np.integer)) for v in present):
+        return np.array(values, dtype=np.int64)
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+def _merge_dtype(dtypes: list[np.dtype], complete: bool) -> np.dtype:
+    # Column dtype over all row groups; `complete` is False if some group lacks the column.
+    if any(dt.kind == "U" for dt in dtypes):
+        width = max(dt.itemsize // 4 if dt.kind == "U" else 32 for dt in dtypes)
+        return np.dtype(f"<U{max(1, width)}")
+    if not complete or any(dt.kind == "f" for dt in dtypes):
+        return np.dtype(np.float64)
+    if all(dt.kind == "b" for dt in dtypes):
+        return np.dtype(np.bool_)
+    return np.dtype(np.int64)
+
+
+def _fill_value(dtype: np.dtype) -> Any:
+    return "" if dtype.kind == "U" else np.nan
+
+
+class ColumnarFeatureSink:
+    def __init__(self, path: Path, *, batch_rows: int = 1024) -> None:
+        if batch_rows < 1:
+            raise ValueError("batch_rows must be >= 1")
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._pending: list[dict[str, Any]] = []
+        self._parts: list[tuple[Path, int]] = []
+        parts_dir = self.path / _PARTS_DIR
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        parts_dir.mkdir(parents=True)
+
+    def append(self, row: dict[str, Any]) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        names: list[str] = []
+        seen: set[str] = set()
+        for row in self._pending:
+            for name in row:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+        arrays: dict[str, np.ndarray] = {
+            f"c{idx}": _column_array([row.get(name) for row in self._pending]) for idx, name in enumerate(names)
+        }
+        arrays[_NAMES_KEY] = np.array(names, dtype=str)
+        part = self.path / _PARTS_DIR / f"part-{len(self._parts):05d}.npz"
+        np.savez(part, allow_pickle=False, **arrays)
+        self._parts.append((part, len(self._pending)))
+        self.rows += len(self._pending)
+        self._pending = []
+
+    def close(self) -> Path:
+        self.flush()
+        # Pass 1: union schema over the row groups (names, dtypes) without loading data.
+        dtypes: dict[str, list[np.dtype]] = {}
+        for part, _ in self._parts:
+            with np.load(part) as group:
+                for idx, name in enumerate(group[_NAMES_KEY].tolist()):
+                    dtypes.setdefault(name, []).append(group[f"c{idx}"].dtype)
+        names = sorted(dtypes)
+        merged = {name: _merge_dtype(dtypes[name], len(dtypes[name]) == len(self._parts)) for name in names}
+
+        for stale in self.path.glob("c*.npy"):
+            stale.unlink()
+        columns: list[dict[str, Any]] = []
+        outputs: dict[str, np.memmap] = {}
+        for idx, name in enumerate(names):
+            file_name = f"c{idx:05d}.npy"
+            column = np.lib.format.open_memmap(self.path / file_name, mode="w+", dtype=merged[name], shape=(self.rows,))
+            if len(dtypes[name]) != len(self._parts):
+                column[:] = _fill_value(merged[name])
+            outputs[name] = column
+            columns.append({"name": name, "dtype": merged[name].str, "file": file_name})
+
+        # Pass 2: copy each row group into its slice of every column.
+        start = 0
+        for part, count in self._parts:
+            with np.load(part) as group:
+                for idx, name in enumerate(group[_NAMES_KEY].tolist()):
+                    outputs[name][start : start + count] = group[f"c{idx}"].astype(merged[name])
+            start += count
+        for column in outputs.values():
+            column.flush()
+        outputs.clear()
+
+        (self.path / _SCHEMA_FILE).write_text(
+            json.dumps({"format": COLUMNAR_FORMAT, "rows": self.rows, "columns": columns}, indent=2),
+            encoding="utf-8",
+        )
+        shutil.rmtree(self.path / _PARTS_DIR, ignore_errors=True)
+        return self.path
+
+    def discard(self) -> None:
+        self._pending = []
+        shutil.rmtree(self.path / _PARTS_DIR, ignore_errors=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Only a complete sweep is consolidated; an aborted one leaves the previous table as is.
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def read_columnar_features(
+    path: Path,
+    columns: list[str] | None = None,
+    *,
+    mmap: bool = True,
+) -> dict[str, np.ndarray]:
+    schema = json.loads((Path(path) / _SCHEMA_FILE).read_text(encoding="utf-8"))
+    if schema.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"Not a {COLUMNAR_FORMAT} table: {path}")
+    files = {col["name"]: col["file"] for col in schema["columns"]}
+    if columns is None:
+        columns = list(files)
+    unknown = [name for name in columns if name not in files]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+    mode: Literal["r"] | None = "r" if mmap else None
+    return {name: np.load(Path(path) / files[name], mmap_mode=mode) for name in columns}
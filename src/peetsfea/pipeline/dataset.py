@@ -4,19 +4,35 @@ import json
 import platform
 import sys
 import traceback
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from hashlib import sha256
 from pathlib import Path
 from typing import Any
 
 from peetsfea.aedt.maxwell3d_adapter import Maxwell3dConfig, apply_parametric_geometry_plan
-from peetsfea.geometry.type1.layer_modes import Segment2D, layer_rect_spirals
+from peetsfea.aedt.session_pool import AedtBackend, AedtSessionPool
+from peetsfea.geometry.plan_eval import check_parametric_plan
+from peetsfea.geometry.type1.builder import PLAN_CHECK_IGNORE
+from peetsfea.geometry.type1.coil_cache import default_coil_geometry_cache, planar_coil_geometry
+from peetsfea.geometry.type1.inductance import estimate_coil_inductance
+from peetsfea.geometry.type1.layer_modes import SegmentArray
+from peetsfea.geometry.type1.mutual import estimate_tx_rx_coupling
 from peetsfea.geometry.type1.self_contact import detect_self_contact
-from peetsfea.geometry.type1.spiral_mask import DdSplit, build_planar_rect_spiral_masks
 from peetsfea.geometry.type1.topology import topology_from_segments
 from peetsfea.geometry.type1.tx_coil_3d import tx_coil_face_frame_for_name
-from peetsfea.pipeline.runner import PEETSFEA_VERSION, build_project_name, run_type1_from_path
+from peetsfea.logging_utils import get_logger
+from peetsfea.pipeline.catalog import CATALOG_FILE, GeneCatalog, sample_dir_status
+from peetsfea.pipeline.columnar import ColumnarFeatureSink, flatten_sample_features
+from peetsfea.pipeline.layout import DatasetLayout
+from peetsfea.pipeline.manifest import DatasetManifest
+from peetsfea.pipeline.runner import (
+    Type1SpecContext,
+    build_project_name,
+    load_type1_spec_context,
+    run_type1,
+)
 from peetsfea.pipeline.serialize import to_dict
 
 
@@ -24,10 +40,6 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def _toml_hash(path: Path) -> str:
-    return sha256(path.read_bytes()).hexdigest()[:6]
-
-
 def _write_json(path: Path, data: Any) -> None:
     path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
 
@@ -39,16 +51,7 @@ def _polyline_length_mm(polyline: tuple[tuple[float, float], ...]) -> float:
     return length
 
 
-def _segments_length_mm(segments: tuple[Segment2D, ...]) -> float:
-    length = 0.0
-    for seg in segments:
-        (u0, v0) = seg.a
-        (u1, v1) = seg.b
-        length += abs(u1 - u0) + abs(v1 - v0)
-    return length
-
-
-def derive_tx_coil_features(sample) -> dict[str, Any]:
+def derive_tx_coil_features(sample, *, overlap_method: str = "grid") -> dict[str, Any]:
     present_instances = [inst for inst in sample.tx_coil.instances if inst.present]
     if not present_instances:
         return {"status": "no_instance_present"}
@@ -59,24 +62,14 @@ def derive_tx_coil_features(sample) -> dict[str, Any]:
         except Exception as exc:
             return {"status": "error", "name": inst.name, "face": inst.face, "error_type": type(exc).__name__, "error": str(exc)}
 
-        dd = None
-        if inst.spiral_count == 2:
-            dd = DdSplit(axis_idx=inst.dd_split_axis_idx, gap_mm=inst.dd_gap_mm, ratio=inst.dd_split_ratio)
-
         try:
-            masks = build_planar_rect_spiral_masks(
+            coil_geometry = planar_coil_geometry(
+                inst,
                 face_u_size_mm=frame.face_u_size_mm,
                 face_v_size_mm=frame.face_v_size_mm,
-                spiral_count=inst.spiral_count,
-                turns=inst.spiral_turns,
-                direction_idx=inst.spiral_direction_idx,
-                start_edge_idx=inst.spiral_start_edge_idx,
-                edge_clearance_mm=inst.edge_clearance_mm,
-                fill_scale=inst.fill_scale,
-                pitch_duty=inst.pitch_duty,
-                min_trace_width_mm=inst.min_trace_width_mm,
-                min_trace_gap_mm=inst.min_trace_gap_mm,
-                dd=dd,
+                pcb_layer_count=sample.tx_pcb.layer_count,
+                with_overlap=True,
+                overlap_method=overlap_method,
             )
         except Exception as exc:
             return {
@@ -87,32 +80,19 @@ def derive_tx_coil_features(sample) -> dict[str, Any]:
                 "error": str(exc),
             }
 
+        dd = coil_geometry.dd
+        masks = coil_geometry.masks
+        layered = coil_geometry.layered
         effective_trace_layers = min(sample.tx_pcb.layer_count, inst.trace_layer_count)
-        layer_mode_idx_effective = inst.layer_mode_idx if effective_trace_layers >= 2 else 0
-
-        try:
-            layered = layer_rect_spirals(
-                masks,
-                layer_mode_idx=layer_mode_idx_effective,
-                radial_split_top_turn_fraction=inst.radial_split_top_turn_fraction,
-                radial_split_outer_is_top=inst.radial_split_outer_is_top,
-            )
-        except Exception as exc:
-            return {
-                "status": "error",
-                "name": inst.name,
-                "face": inst.face,
-                "error_type": type(exc).__name__,
-                "error": str(exc),
-            }
+        layer_mode_idx_effective = coil_geometry.layer_mode_idx_effective
 
         per_spiral: list[dict[str, Any]] = []
         for mask, lay in zip(masks, layered):
-            self_top = detect_self_contact(tuple(lay.top_segments))
-            self_bottom = detect_self_contact(tuple(lay.bottom_segments))
-            topology_all = topology_from_segments(tuple(lay.top_segments) + tuple(lay.bottom_segments))
-            topology_top = topology_from_segments(tuple(lay.top_segments))
-            topology_bottom = topology_from_segments(tuple(lay.bottom_segments))
+            self_top = detect_self_contact(lay.top_segments)
+            self_bottom = detect_self_contact(lay.bottom_segments)
+            topology_all = topology_from_segments(SegmentArray.concat((lay.top_segments, lay.bottom_segments)))
+            topology_top = topology_from_segments(lay.top_segments)
+            topology_bottom = topology_from_segments(lay.bottom_segments)
             per_spiral.append(
                 {
                     "turns": mask.turns,
@@ -122,8 +102,8 @@ def derive_tx_coil_features(sample) -> dict[str, Any]:
                     "trace_width_mm": mask.derived.trace_width_mm,
                     "trace_gap_mm": mask.derived.trace_gap_mm,
                     "polyline_length_mm": _polyline_length_mm(mask.polyline),
-                    "top_length_mm": _segments_length_mm(lay.top_segments),
-                    "bottom_length_mm": _segments_length_mm(lay.bottom_segments),
+                    "top_length_mm": lay.top_segments.total_length(),
+                    "bottom_length_mm": lay.bottom_segments.total_length(),
                     "via_count": len(lay.via_points),
                     "terminal_a": lay.terminal_a,
                     "terminal_b": lay.terminal_b,
@@ -142,20 +122,7 @@ def derive_tx_coil_features(sample) -> dict[str, Any]:
 
         # Total topology estimate (2D graph on segment endpoints).
         # For DD coils, include the planned series-connection bridge (as in tx_coil_3d).
-        total_segments: list[Segment2D] = []
-        for lay in layered:
-            total_segments.extend(lay.top_segments)
-            total_segments.extend(lay.bottom_segments)
-        if inst.spiral_count == 2 and len(layered) >= 2:
-            p0 = layered[0].terminal_b
-            p1 = layered[1].terminal_a
-            if p0[0] == p1[0] or p0[1] == p1[1]:
-                total_segments.append(Segment2D(a=p0, b=p1, width_mm=0.0))
-            else:
-                mid = (p1[0], p0[1])
-                total_segments.append(Segment2D(a=p0, b=mid, width_mm=0.0))
-                total_segments.append(Segment2D(a=mid, b=p1, width_mm=0.0))
-        topology_total = topology_from_segments(tuple(total_segments))
+        topology_total = coil_geometry.topology_total
         open_path_total_est_ok = (
             topology_total.component_count == 1
             and topology_total.endpoints_count == 2
@@ -191,6 +158,7 @@ def derive_tx_coil_features(sample) -> dict[str, Any]:
             "open_path_total_est_ok": open_path_total_est_ok,
             "overlap_total_estimate": overlap_total,
             "self_contact_total": self_contact_total,
+            "inductance_estimate": to_dict(estimate_coil_inductance(coil_geometry)),
             "material_diagnostics": {
                 "material_before_ops": None,
                 "material_after_ops": None,
@@ -210,14 +178,71 @@ def derive_tx_coil_features(sample) -> dict[str, Any]:
         "outer_faces": to_dict(sample.tx_coil.outer_faces),
     }
 
+
+def derive_coupling_features(sample) -> dict[str, Any]:
+    # Free-space TX -> RX coupling estimate (geometry/type1/mutual.py), for ranking seeds.
+    try:
+        estimate = estimate_tx_rx_coupling(sample)
+    except Exception as exc:
+        return {"status": "error", "error_type": type(exc).__name__, "error": str(exc)}
+    if estimate is None:
+        return {"status": "module_not_present"}
+    return {
+        "status": "ok",
+        "rx_loop": to_dict(estimate.rx_loop),
+        "rx_inductance_uh": estimate.rx_inductance_uh,
+        "instances": [to_dict(inst) for inst in estimate.instances],
+        "k_max_abs": estimate.k_max_abs,
+    }
+
+
 @dataclass(frozen=True)
 class Type1DatasetWriteResult:
     sample_dir: Path
-    status: str  # ok | skipped | error
+    status: str  # ok | skipped | error | rejected (failed the plan check)
+    # Flattened genes/derived row (collect_features=True), consumed by the columnar sink.
+    features: dict[str, Any] | None = None
+
+
+def _read_json_if_exists(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def _sample_complete(sample_dir: Path) -> bool:
+    # meta.json is written last; the extra check catches samples of older runs, which wrote
+    # meta.json first and may have crashed before any output.
+    return (sample_dir / "meta.json").exists() and (
+        (sample_dir / "genes.json").exists() or (sample_dir / "run_error.json").exists()
+    )
+
+
+def _skipped_result(sample_dir: Path, seed: int, status: str, collect_features: bool) -> Type1DatasetWriteResult:
+    features = None
+    if collect_features:
+        # Rows of earlier runs come from disk; their status is what that run produced.
+        features = flatten_sample_features(
+            _read_json_if_exists(sample_dir / "genes.json"),
+            _read_json_if_exists(sample_dir / "derived.json"),
+            seed=seed,
+            status=status,
+        )
+    return Type1DatasetWriteResult(sample_dir=sample_dir, status="skipped", features=features)
+
+
+def _finish_sample(
+    sample_dir: Path,
+    meta: dict[str, Any],
+    manifest: DatasetManifest,
+    status: str,
+    features: dict[str, Any] | None,
+) -> Type1DatasetWriteResult:
+    _write_json(sample_dir / "meta.json", meta)
+    manifest.append(meta, "done", status)
+    return Type1DatasetWriteResult(sample_dir=sample_dir, status=status, features=features)
 
 
 def write_type1_dataset_sample(
-    spec_path: Path,
+    spec_path: Path | Type1SpecContext,
     *,
     seed: int,
     out_root: Path,
@@ -225,35 +250,57 @@ def write_type1_dataset_sample(
     build_aedt: bool = False,
     maxwell_config: Maxwell3dConfig | None = None,
     overwrite: bool = False,
+    aedt_pool: AedtSessionPool | None = None,
+    parametric_coil: bool = False,
+    coil_emission: str = "boxes",
+    plan_check: bool = True,
+    collect_features: bool = False,
+    layout: DatasetLayout | str | None = None,
+    catalog: bool = False,
 ) -> Type1DatasetWriteResult:
-    spec_hash = _toml_hash(spec_path)
-    full_name = build_project_name(project_name, spec_path, seed, version=PEETSFEA_VERSION)
+    if isinstance(spec_path, Type1SpecContext):
+        context = spec_path
+    else:
+        context = load_type1_spec_context(spec_path)
+    full_name = build_project_name(project_name, context, seed)
+
+    if not isinstance(layout, DatasetLayout):
+        layout = DatasetLayout.open(out_root, layout)
+    sample_dir = layout.sample_dir(full_name)
+    manifest = DatasetManifest(layout.root)
+    meta = {
+        "peetsfea_version": context.version,
+        "project_name": project_name,
+        "full_name": full_name,
+        "seed": seed,
+        "spec_hash": context.spec_hash,
+        "spec_path": str(context.path),
+        "created_at_utc": _utc_now_iso(),
+        "python_version": sys.version,
+        "platform": platform.platform(),
+    }
 
-    sample_dir = out_root / "type1" / full_name
-    sample_dir.mkdir(parents=True, exist_ok=True)
+    if not overwrite and _sample_complete(sample_dir):
+        status = sample_dir_status(sample_dir)
+        # Complete on disk but unknown to the manifest (older root, or called directly):
+        # record it so the next resume does not have to look.
+        manifest.append(meta, "done", status)
+        return _skipped_result(sample_dir, seed, status, collect_features)
 
-    marker = sample_dir / "meta.json"
-    if marker.exists() and not overwrite:
-        return Type1DatasetWriteResult(sample_dir=sample_dir, status="skipped")
-
-    (sample_dir / "spec_snapshot.toml").write_bytes(spec_path.read_bytes())
-    _write_json(
-        marker,
-        {
-            "peetsfea_version": PEETSFEA_VERSION,
-            "project_name": project_name,
-            "full_name": full_name,
-            "seed": seed,
-            "spec_hash": spec_hash,
-            "spec_path": str(spec_path),
-            "created_at_utc": _utc_now_iso(),
-            "python_version": sys.version,
-            "platform": platform.platform(),
-        },
-    )
+    sample_dir.mkdir(parents=True, exist_ok=True)
+    # A previous, unfinished attempt must not look complete while this one runs.
+    (sample_dir / "meta.json").unlink(missing_ok=True)
+    manifest.append(meta, "started", "ok")
+    layout.record(meta, sample_dir)
+    (sample_dir / "spec_snapshot.toml").write_bytes(context.raw_bytes)
 
     try:
-        result = run_type1_from_path(spec_path, seed)
+        result = run_type1(
+            context,
+            seed,
+            parametric_coil=parametric_coil,
+            coil_emission=coil_emission,
+        )
     except Exception as exc:
         _write_json(
             sample_dir / "run_error.json",
@@ -265,12 +312,25 @@ def write_type1_dataset_sample(
                 "traceback": traceback.format_exc(),
             },
         )
-        return Type1DatasetWriteResult(sample_dir=sample_dir, status="error")
-
-    _write_json(sample_dir / "genes.json", {"sample": to_dict(result.sample)})
+        manifest.append(meta, "run", "error")
+        if catalog:
+            with GeneCatalog(layout.root / CATALOG_FILE) as gene_catalog:
+                gene_catalog.upsert(meta, "error", None, None)
+        features = flatten_sample_features(None, None, seed=seed, status="error") if collect_features else None
+        return _finish_sample(sample_dir, meta, manifest, "error", features)
+
+    genes = {"sample": to_dict(result.sample)}
+    _write_json(sample_dir / "genes.json", genes)
     _write_json(sample_dir / "geometry.json", to_dict(result.geometry))
-    tx_coil_derived = derive_tx_coil_features(result.sample)
-    _write_json(sample_dir / "derived.json", {"tx_coil": tx_coil_derived})
+    overlap_method = context.spec.tx.coil.overlap_method
+    tx_coil_derived = derive_tx_coil_features(result.sample, overlap_method=overlap_method)
+    derived = {"tx_coil": tx_coil_derived, "coupling": derive_coupling_features(result.sample)}
+    _write_json(sample_dir / "derived.json", derived)
+    manifest.append(meta, "run", "ok")
+    if catalog:
+        with GeneCatalog(layout.root / CATALOG_FILE) as gene_catalog:
+            gene_catalog.upsert(meta, "ok", genes, derived)
+    features = flatten_sample_features(genes, derived, seed=seed, status="ok") if collect_features else None
 
     # Optional-but-useful debug snapshot for fast iteration.
     # Keep it separate from derived.json so consumers can ignore it cheaply.
@@ -278,31 +338,16 @@ def write_type1_dataset_sample(
         first = next((inst for inst in result.sample.tx_coil.instances if inst.present), None)
         if first is not None:
             frame = tx_coil_face_frame_for_name(result.sample, first.face)
-            dd = None
-            if first.spiral_count == 2:
-                dd = DdSplit(axis_idx=first.dd_split_axis_idx, gap_mm=first.dd_gap_mm, ratio=first.dd_split_ratio)
-            masks = build_planar_rect_spiral_masks(
+            coil_geometry = planar_coil_geometry(
+                first,
                 face_u_size_mm=frame.face_u_size_mm,
                 face_v_size_mm=frame.face_v_size_mm,
-                spiral_count=first.spiral_count,
-                turns=first.spiral_turns,
-                direction_idx=first.spiral_direction_idx,
-                start_edge_idx=first.spiral_start_edge_idx,
-                edge_clearance_mm=first.edge_clearance_mm,
-                fill_scale=first.fill_scale,
-                pitch_duty=first.pitch_duty,
-                min_trace_width_mm=first.min_trace_width_mm,
-                min_trace_gap_mm=first.min_trace_gap_mm,
-                dd=dd,
-            )
-            effective_trace_layers = min(result.sample.tx_pcb.layer_count, first.trace_layer_count)
-            layer_mode_idx_effective = first.layer_mode_idx if effective_trace_layers >= 2 else 0
-            layered = layer_rect_spirals(
-                masks,
-                layer_mode_idx=layer_mode_idx_effective,
-                radial_split_top_turn_fraction=first.radial_split_top_turn_fraction,
-                radial_split_outer_is_top=first.radial_split_outer_is_top,
+                pcb_layer_count=result.sample.tx_pcb.layer_count,
+                with_overlap=True,
+                overlap_method=overlap_method,
             )
+            masks = coil_geometry.masks
+            layered = coil_geometry.layered
             _write_json(
                 sample_dir / "debug_tx_planar.json",
                 {
@@ -322,6 +367,38 @@ def write_type1_dataset_sample(
         project_path = maxwell_dir / "project.aedt"
         design_name = full_name
         cfg = maxwell_config or Maxwell3dConfig()
+        plan_report = None
+        if plan_check:
+            # Offline numeric check; a sample that fails it never reaches AEDT.
+            plan_report = check_parametric_plan(result.geometry, ignore=PLAN_CHECK_IGNORE)
+            get_logger().info(
+                "plan_check",
+                seed=seed,
+                ok=plan_report.ok,
+                box_count=plan_report.box_count,
+                nonpositive=len(plan_report.nonpositive),
+                interferences=len(plan_report.interferences),
+                duration_ms=plan_report.duration_ms,
+            )
+            if not plan_report.ok:
+                _write_json(
+                    maxwell_dir / "results.json",
+                    {
+                        "status": "error",
+                        "stage": "plan_check",
+                        "project_path": str(project_path),
+                        "design_name": design_name,
+                        "config": to_dict(cfg),
+                        "plan_check": to_dict(plan_report),
+                    },
+                )
+                manifest.append(meta, "plan_check", "error")
+                if catalog:
+                    with GeneCatalog(layout.root / CATALOG_FILE) as gene_catalog:
+                        gene_catalog.upsert(meta, "rejected", genes, derived)
+                if features is not None:
+                    features["status"] = "rejected"
+                return _finish_sample(sample_dir, meta, manifest, "rejected", features)
         try:
             apply_report = apply_parametric_geometry_plan(
                 result.geometry,
@@ -329,17 +406,23 @@ def write_type1_dataset_sample(
                 design_name=design_name,
                 core_material=result.sample.materials_core,
                 config=cfg,
+                session_pool=aedt_pool,
             )
+            # A reused design keeps the name of the sample that created it.
+            reuse = apply_report.get("design_reuse") or {}
             _write_json(
                 maxwell_dir / "results.json",
                 {
                     "status": "success",
-                    "project_path": str(project_path),
-                    "design_name": design_name,
+                    "project_path": reuse.get("project_path", str(project_path)),
+                    "design_name": reuse.get("design_name", design_name),
                     "config": to_dict(cfg),
+                    "session_pool": to_dict(aedt_pool.stats()) if aedt_pool is not None else None,
                     "apply_report": apply_report,
+                    "plan_check": to_dict(plan_report),
                 },
             )
+            manifest.append(meta, "aedt", "ok")
         except Exception as exc:
             _write_json(
                 maxwell_dir / "results.json",
@@ -353,5 +436,205 @@ def write_type1_dataset_sample(
                     "traceback": traceback.format_exc(),
                 },
             )
+            manifest.append(meta, "aedt", "error")
+
+    return _finish_sample(sample_dir, meta, manifest, "ok", features)
+
+
+# Per-process state for `write_type1_dataset_samples(jobs>1)`.
+# The spec context is shipped once per worker (initializer), not once per seed.
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def _init_dataset_worker(context: Type1SpecContext, options: dict[str, Any]) -> None:
+    _WORKER_STATE["context"] = context
+    _WORKER_STATE["options"] = options
+
+
+def _write_dataset_worker(seed: int) -> Type1DatasetWriteResult:
+    return write_type1_dataset_sample(_WORKER_STATE["context"], seed=seed, **_WORKER_STATE["options"])
+
 
-    return Type1DatasetWriteResult(sample_dir=sample_dir, status="ok")
+def write_type1_dataset_samples(
+    spec_path: Path | Type1SpecContext,
+    seeds: Iterable[int],
+    *,
+    out_root: Path,
+    project_name: str = "type1",
+    build_aedt: bool = False,
+    maxwell_config: Maxwell3dConfig | None = None,
+    overwrite: bool = False,
+    jobs: int = 1,
+    aedt_pool_size: int = 0,
+    aedt_recycle_after: int = 25,
+    aedt_backend: AedtBackend | None = None,
+    aedt_reuse_designs: bool = False,
+    parametric_coil: bool = False,
+    coil_emission: str = "boxes",
+    plan_check: bool = True,
+    columnar_out: Path | None = None,
+    columnar_batch_rows: int = 1024,
+    layout: str | None = None,
+    catalog: bool = False,
+) -> Iterator[Type1DatasetWriteResult]:
+    # Results are yielded in seed order for both paths; with jobs > 1 each sample is
+    # still written by `write_type1_dataset_sample`, so skip/overwrite semantics match.
+    # aedt_pool_size=0 keeps the per-sample desktop attach; N >= 1 shares N long-lived
+    # desktops (one writer thread per desktop) across all seeds. aedt_reuse_designs keeps
+    # designs open by topology signature and only pushes variable values (implies a pool).
+    # columnar_out: also write every row (skipped samples read back from disk) to one
+    # columnar table for the whole sweep (pipeline/columnar.py), once the sweep completes.
+    # layout: "flat" | "sharded" sample placement (pipeline/layout.py); None keeps the root's.
+    # Seeds already `done` in the root's manifest are skipped without touching their
+    # directories; everything else (new, crashed, pre-manifest) goes to the writer.
+    # catalog: upsert each written sample into type1/catalog.sqlite (pipeline/catalog.py);
+    # samples of earlier sweeps are added with `build_gene_catalog`.
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
+    if jobs > 1 and build_aedt:
+        raise ValueError("jobs > 1 is not supported with build_aedt (AEDT sessions are per process)")
+    if aedt_pool_size < 0:
+        raise ValueError("aedt_pool_size must be >= 0")
+
+    seeds_list = list(seeds)
+    if isinstance(spec_path, Type1SpecContext):
+        context = spec_path
+    else:
+        context = load_type1_spec_context(spec_path)
+    dataset_layout = DatasetLayout.open(out_root, layout)
+    options: dict[str, Any] = {
+        "out_root": out_root,
+        "project_name": project_name,
+        "build_aedt": build_aedt,
+        "maxwell_config": maxwell_config,
+        "overwrite": overwrite,
+        "parametric_coil": parametric_coil,
+        "coil_emission": coil_emission,
+        "plan_check": plan_check,
+        "collect_features": columnar_out is not None,
+        # Resolved once per sweep; workers get the resolved layout, not a layout.json read each.
+        "layout": dataset_layout,
+        "catalog": catalog,
+    }
+    names = {seed: build_project_name(project_name, context, seed) for seed in seeds_list}
+    cache_before = default_coil_geometry_cache().stats()
+    state = DatasetManifest(dataset_layout.root).load()
+    done = {} if overwrite else state.done
+    pending = [seed for seed in seeds_list if names[seed] not in done]
+    get_logger().info(
+        "dataset_resume",
+        seeds=len(seeds_list),
+        done=len(seeds_list) - len(pending),
+        pending=len(pending),
+        half_written=sum(1 for seed in pending if names[seed] in state.incomplete),
+    )
+    written = _iter_dataset_results(
+        context,
+        pending,
+        options,
+        jobs=jobs,
+        aedt_pool_size=aedt_pool_size,
+        aedt_recycle_after=aedt_recycle_after,
+        aedt_backend=aedt_backend,
+        aedt_reuse_designs=aedt_reuse_designs,
+    )
+
+    def in_seed_order() -> Iterator[Type1DatasetWriteResult]:
+        for seed in seeds_list:
+            name = names[seed]
+            if name in done:
+                yield _skipped_result(dataset_layout.sample_dir(name), seed, done[name], options["collect_features"])
+            else:
+                yield next(written)
+
+    results = in_seed_order()
+    if columnar_out is None:
+        yield from results
+    else:
+        with ColumnarFeatureSink(columnar_out, batch_rows=columnar_batch_rows) as sink:
+            for result in results:
+                if result.features is not None:
+                    sink.append(result.features)
+                yield result
+        get_logger().info("columnar_features", path=str(columnar_out), rows=sink.rows)
+
+    if jobs == 1:
+        # Once per sweep; with jobs > 1 every worker process has its own cache.
+        cache_after = default_coil_geometry_cache().stats()
+        get_logger().info(
+            "coil_geometry_cache",
+            hits=cache_after.hits - cache_before.hits,
+            misses=cache_after.misses - cache_before.misses,
+            size=cache_after.size,
+        )
+
+
+def _iter_dataset_results(
+    context: Type1SpecContext,
+    seeds_list: list[int],
+    options: dict[str, Any],
+    *,
+    jobs: int,
+    aedt_pool_size: int,
+    aedt_recycle_after: int,
+    aedt_backend: AedtBackend | None,
+    aedt_reuse_designs: bool,
+) -> Iterator[Type1DatasetWriteResult]:
+    build_aedt = options["build_aedt"]
+    maxwell_config = options["maxwell_config"]
+    if build_aedt and (aedt_pool_size > 0 or aedt_reuse_designs):
+        yield from _write_dataset_samples_pooled(
+            context,
+            seeds_list,
+            options,
+            pool=AedtSessionPool.from_config(
+                maxwell_config or Maxwell3dConfig(),
+                size=max(1, aedt_pool_size),
+                recycle_after=aedt_recycle_after,
+                backend=aedt_backend,
+                reuse_designs=aedt_reuse_designs,
+            ),
+        )
+        return
+
+    if jobs == 1 or len(seeds_list) <= 1:
+        for seed in seeds_list:
+            yield write_type1_dataset_sample(context, seed=seed, **options)
+        return
+
+    chunksize = max(1, min(64, len(seeds_list) // (jobs * 4)))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_dataset_worker,
+        initargs=(context, options),
+    ) as pool:
+        yield from pool.map(_write_dataset_worker, seeds_list, chunksize=chunksize)
+
+
+def _write_dataset_samples_pooled(
+    context: Type1SpecContext,
+    seeds_list: list[int],
+    options: dict[str, Any],
+    *,
+    pool: AedtSessionPool,
+) -> Iterator[Type1DatasetWriteResult]:
+    def write(seed: int) -> Type1DatasetWriteResult:
+        return write_type1_dataset_sample(context, seed=seed, aedt_pool=pool, **options)
+
+    with pool:
+        if pool.size == 1 or len(seeds_list) <= 1:
+            for seed in seeds_list:
+                yield write(seed)
+        else:
+            with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                yield from executor.map(write, seeds_list)
+        stats = pool.stats()
+        get_logger().info(
+            "aedt_session_pool",
+            size=stats.size,
+            launches=stats.launches,
+            recycles=stats.recycles,
+            designs=stats.designs,
+            errors=stats.errors,
+            reuses=stats.reuses,
+        )
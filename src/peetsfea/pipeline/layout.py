@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# On-disk placement of sample directories under `out_root/type1`:
+# - "flat" (original): type1/<full_name>/
+# - "sharded": type1/<h[0:2]>/<h[2:4]>/<full_name>/ with h = sha256(full_name), so no directory
+#   holds more than a few hundred entries at 10^7 samples. type1/layout.json records the
+#   layout; type1/index.jsonl is an append-only (spec_hash, version, seed) -> path index
+#   (one line per written sample, last line wins).
+# A root without layout.json is flat, so existing datasets stay readable as they are;
+# `migrate_dataset_layout` (python -m peetsfea.dataset_migrate_cli) moves them over.
+
+DATASET_LAYOUTS = ("flat", "sharded")
+LAYOUT_FILE = "layout.json"
+INDEX_FILE = "index.jsonl"
+
+IndexKey = tuple[str, str, int]
+
+
+def _shard_parts(full_name: str) -> tuple[str, str]:
+    digest = hashlib.sha256(full_name.encode("utf-8")).hexdigest()
+    return digest[0:2], digest[2:4]
+
+
+def append_jsonl(path: Path, record: dict[str, Any]) -> None:
+    # One short line per call with O_APPEND, so concurrent writer processes interleave whole
+    # lines (local filesystems; keep records well under PIPE_BUF).
+    line = json.dumps(record, sort_keys=True) + "\n"
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def _write_layout(root: Path, kind: str) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / LAYOUT_FILE).write_text(json.dumps({"layout": kind}, indent=2, sort_keys=True), encoding="utf-8")
+
+
+@dataclass(frozen=True)
+class DatasetLayout:
+    root: Path  # out_root / "type1"
+    kind: str  # flat | sharded
+    # index.jsonl as parsed by the first `locate`; `record` keeps it current.
+    _index: dict[IndexKey, Path] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def open(cls, out_root: Path, layout: str | None = None) -> DatasetLayout:
+        # layout=None: whatever the root already uses (flat if it has no layout.json).
+        root = Path(out_root) / "type1"
+        layout_file = root / LAYOUT_FILE
+        existing = json.loads(layout_file.read_text(encoding="utf-8"))["layout"] if layout_file.exists() else None
+        if layout is not None and layout not in DATASET_LAYOUTS:
+            raise ValueError(f"Unknown dataset layout: {layout!r} (expected one of {DATASET_LAYOUTS})")
+        if existing is not None and layout is not None and existing != layout:
+            raise ValueError(f"{root} uses the {existing!r} layout, not {layout!r} (see dataset_migrate_cli)")
+        kind = existing or layout or "flat"
+        if kind == "sharded" and existing is None:
+            # Declaring a root sharded happens once; a flat root with samples is migrated instead.
+            if root.is_dir() and any((entry / "meta.json").exists() for entry in root.iterdir()):
+                raise ValueError(f"{root} holds flat-layout samples; run dataset_migrate_cli first")
+            _write_layout(root, kind)
+        return cls(root=root, kind=kind)
+
+    def sample_dir(self, full_name: str) -> Path:
+        if self.kind == "sharded":
+            return self.root.joinpath(*_shard_parts(full_name), full_name)
+        return self.root / full_name
+
+    def record(self, meta: dict[str, Any], sample_dir: Path) -> None:
+        # Flat roots need no index (the path is the name).
+        if self.kind != "sharded":
+            return
+        append_jsonl(
+            self.root / INDEX_FILE,
+            {
+                "spec_hash": meta["spec_hash"],
+                "version": meta["peetsfea_version"],
+                "seed": meta["seed"],
+                "full_name": meta["full_name"],
+                "path": sample_dir.relative_to(self.root).as_posix(),
+            },
+        )
+        if self._index is not None:
+            self._index[(meta["spec_hash"], meta["peetsfea_version"], int(meta["seed"]))] = sample_dir
+
+    def load_index(self) -> dict[IndexKey, Path]:
+        index: dict[IndexKey, Path] = {}
+        path = self.root / INDEX_FILE
+        if not path.exists():
+            return index
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                index[(entry["spec_hash"], entry["version"], int(entry["seed"]))] = self.root / entry["path"]
+        return index
+
+    def locate(self, spec_hash: str, version: str, seed: int, *, project_name: str = "type1") -> Path | None:
+        # Index first, then the computed sharded and flat locations (half-migrated roots).
+        # The index is read once per instance; samples written by other processes since are
+        # still found at their computed location.
+        found = None
+        if self.kind == "sharded":
+            index = self._index
+            if index is None:
+                index = self.load_index()
+                object.__setattr__(self, "_index", index)
+            found = index.get((spec_hash, version, seed))
+        if found is not None and found.is_dir():
+            return found
+        full_name = f"{project_name}_{spec_hash}_{version}_{seed}"
+        for candidate in (self.root.joinpath(*_shard_parts(full_name), full_name), self.root / full_name):
+            if candidate.is_dir():
+                return candidate
+        return None
+
+    def iter_sample_dirs(self) -> Iterator[Path]:
+        # Sample directories in either placement (a sample directory is one with meta.json).
+        if not self.root.is_dir():
+            return
+        for entry in sorted(self.root.iterdir()):
+            if not entry.is_dir():
+                continue
+            if (entry / "meta.json").exists():
+                yield entry
+            elif self.kind == "sharded" and len(entry.name) == 2:
+                for sub in sorted(entry.iterdir()):
+                    if sub.is_dir():
+                        yield from (d for d in sorted(sub.iterdir()) if (d / "meta.json").exists())
+
+
+@dataclass(frozen=True)
+class LayoutMigrationResult:
+    moved: int
+    # Sample directories without meta.json (interrupted writes); moved unindexed, the next
+    # resume rewrites them in place.
+    moved_incomplete: int
+    already_sharded: int
+    # Directories that are not named like a sample; left where they are.
+    skipped: tuple[str, ...]
+
+
+def migrate_dataset_layout(out_root: Path) -> LayoutMigrationResult:
+    # flat -> sharded, in place (renames only). Safe to re-run after an interruption:
+    # samples already under a shard are left alone, the rest are moved and indexed; a flat
+    # leftover of a sample that has since been rewritten under its shard is removed.
+    root = Path(out_root) / "type1"
+    if not root.is_dir():
+        raise ValueError(f"No type1 dataset under {out_root}")
+    if not (root / LAYOUT_FILE).exists():
+        _write_layout(root, "sharded")
+    layout = DatasetLayout.open(out_root, "sharded")
+
+    moved = 0
+    incomplete = 0
+    already = 0
+    skipped: list[str] = []
+    for entry in sorted(root.iterdir()):
+        if not entry.is_dir():
+            continue
+        if len(entry.name) == 2 and not (entry / "meta.json").exists():
+            already += sum(len(list(sub.iterdir())) for sub in entry.iterdir() if sub.is_dir())
+            continue
+        meta_path = entry / "meta.json"
+        if not meta_path.exists():
+            # <project>_<spec_hash>_<version>_<seed>
+            if not entry.name.rsplit("_", 1)[-1].isdigit():
+                skipped.append(entry.name)
+                continue
+            target = layout.sample_dir(entry.name)
+            if target.exists():
+                # Rewritten under the shard since; the flat leftover is stale.
+                shutil.rmtree(entry)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                entry.rename(target)
+            incomplete += 1
+            continue
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        target = layout.sample_dir(meta["full_name"])
+        target.parent.mkdir(parents=True, exist_ok=True)
+        entry.rename(target)
+        layout.record(meta, target)
+        moved += 1
+    return LayoutMigrationResult(
+        moved=moved,
+        moved_incomplete=incomplete,
+        already_sharded=already,
+        skipped=tuple(skipped),
+    )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from peetsfea.pipeline.layout import append_jsonl
+
+# Append-only progress log of a dataset root (type1/manifest.jsonl), one line per stage a
+# sample completes: started -> run -> [plan_check | aedt] -> done. `done` is appended only
+# after meta.json, which is now the last file a sample writes, so a sample is complete iff
+# the manifest has its `done` line (or, for roots written before the manifest existed,
+# meta.json plus genes.json / run_error.json). Resuming a sweep is one read of this file
+# and a set difference instead of a mkdir + stat per seed.
+
+MANIFEST_FILE = "manifest.jsonl"
+MANIFEST_STAGES = ("started", "run", "plan_check", "aedt", "done")
+
+
+@dataclass(frozen=True)
+class ManifestState:
+    # full_name -> final status (ok | error | rejected) of every completed sample.
+    done: dict[str, str]
+    # Samples with stage lines but no `done` line (crashed or still running).
+    incomplete: frozenset[str]
+
+
+@dataclass(frozen=True)
+class DatasetManifest:
+    root: Path  # out_root / "type1"
+
+    @property
+    def path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    def append(self, meta: dict[str, Any], stage: str, status: str) -> None:
+        if stage not in MANIFEST_STAGES:
+            raise ValueError(f"Unknown manifest stage: {stage!r}")
+        append_jsonl(
+            self.path,
+            {
+                "full_name": meta["full_name"],
+                "seed": meta["seed"],
+                "spec_hash": meta["spec_hash"],
+                "version": meta["peetsfea_version"],
+                "stage": stage,
+                "status": status,
+                "at_utc": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+            },
+        )
+
+    def load(self) -> ManifestState:
+        done: dict[str, str] = {}
+        seen: set[str] = set()
+        if self.path.exists():
+            torn_tail = False
+            with self.path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    torn_tail = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line torn by a killed writer; its sample has no `done` from that attempt.
+                        continue
+                    name = entry["full_name"]
+                    seen.add(name)
+                    if entry["stage"] == "done":
+                        done[name] = entry["status"]
+                    elif entry["stage"] == "started":
+                        # A restarted sample is incomplete again until its new `done`.
+                        done.pop(name, None)
+            if torn_tail:
+                # Terminate a line cut off by a killed writer so the next append starts clean.
+                with self.path.open("a", encoding="utf-8") as fh:
+                    fh.write("\n")
+        return ManifestState(done=done, incomplete=frozenset(seen - set(done)))
@@ -10,10 +10,11 @@ from peetsfea.domain.type1.parse import parse_type1_spec_dict
 from peetsfea.domain.type1.sampled_models import Type1Sample
 from peetsfea.domain.type1.spec_models import Type1Spec
 from peetsfea.geometry.plan import ParametricGeometryPlan
-from peetsfea.geometry.type1.builder import build_type1_parametric_geometry
+from peetsfea.geometry.plan_eval import check_parametric_plan
+from peetsfea.geometry.type1.builder import PLAN_CHECK_IGNORE, build_type1_parametric_geometry
 from peetsfea.logging_utils import log_action
 from peetsfea.sampling.type1_sampler import sample_type1
-from peetsfea.spec.io import load_toml
+from peetsfea.spec.io import load_toml, load_toml_bytes
 
 PEETSFEA_VERSION = "2.0.0"
 
@@ -33,20 +34,67 @@ class Type1AedtResult:
     design_name: str
 
 
+def _bytes_hash(data: bytes) -> str:
+    return sha256(data).hexdigest()[:6]
+
+
 def _toml_hash(path: Path) -> str:
-    return sha256(path.read_bytes()).hexdigest()[:6]
+    return _bytes_hash(path.read_bytes())
+
+
+@dataclass(frozen=True)
+class Type1SpecContext:
+    # Parse-once view of a spec file, shared by every seed of a sweep.
+    path: Path
+    raw_bytes: bytes
+    spec_hash: str
+    spec: Type1Spec
+    version: str = PEETSFEA_VERSION
+
+
+def load_type1_spec_context(path: Path, *, version: str = PEETSFEA_VERSION) -> Type1SpecContext:
+    raw = path.read_bytes()
+    return Type1SpecContext(
+        path=path,
+        raw_bytes=raw,
+        spec_hash=_bytes_hash(raw),
+        spec=parse_type1_spec_dict(load_toml_bytes(raw)),
+        version=version,
+    )
 
 
-def build_project_name(base_name: str, spec_path: Path, seed: int, version: str = PEETSFEA_VERSION) -> str:
-    suffix = f"{_toml_hash(spec_path)}_{version}_{seed}"
+def build_project_name(
+    base_name: str,
+    spec_path: Path | Type1SpecContext,
+    seed: int,
+    version: str | None = None,
+) -> str:
+    if isinstance(spec_path, Type1SpecContext):
+        spec_hash = spec_path.spec_hash
+        version = version or spec_path.version
+    else:
+        spec_hash = _toml_hash(spec_path)
+    suffix = f"{spec_hash}_{version or PEETSFEA_VERSION}_{seed}"
     return f"{base_name}_{suffix}"
 
 
-@log_action("run_type1", lambda spec, seed: {"seed": seed})
-def run_type1(spec: Type1Spec, seed: int) -> Type1RunResult:
+@log_action("run_type1", lambda spec, seed, **kwargs: {"seed": seed})
+def run_type1(
+    spec: Type1Spec | Type1SpecContext,
+    seed: int,
+    *,
+    parametric_coil: bool = False,
+    coil_emission: str = "boxes",
+) -> Type1RunResult:
+    if isinstance(spec, Type1SpecContext):
+        spec = spec.spec
     sample_input = sample_type1(spec, seed)
     domain = interpret_type1(sample_input)
-    geometry = build_type1_parametric_geometry(domain.sample)
+    geometry = build_type1_parametric_geometry(
+        domain.sample,
+        parametric_coil=parametric_coil,
+        coil_emission=coil_emission,
+    )
     return Type1RunResult(
         spec=spec,
         domain=domain,
@@ -55,11 +103,22 @@ def run_type1(spec: Type1Spec, seed: int) -> Type1RunResult:
     )
 
 
-@log_action("run_type1_from_path", lambda path, seed: {"spec_path": str(path), "seed": seed})
-def run_type1_from_path(path: Path, seed: int) -> Type1RunResult:
+@log_action("run_type1_from_path", lambda path, seed, **kwargs: {"spec_path": str(path), "seed": seed})
+def run_type1_from_path(
+    path: Path,
+    seed: int,
+    *,
+    parametric_coil: bool = False,
+    coil_emission: str = "boxes",
+) -> Type1RunResult:
     spec_dict = load_toml(path)
     spec = parse_type1_spec_dict(spec_dict)
-    return run_type1(spec, seed)
+    return run_type1(
+        spec,
+        seed,
+        parametric_coil=parametric_coil,
+        coil_emission=coil_emission,
+    )
 
 
 @log_action(
@@ -80,11 +139,25 @@ def run_type1_aedt_from_path(
     out_dir: Path | None = None,
     design_name: str | None = None,
     config: Maxwell3dConfig | None = None,
+    parametric_coil: bool = False,
+    coil_emission: str = "boxes",
+    plan_check: bool = True,
 ) -> Type1AedtResult:
-    result = run_type1_from_path(path, seed)
+    context = load_type1_spec_context(path)
+    result = run_type1(
+        context,
+        seed,
+        parametric_coil=parametric_coil,
+        coil_emission=coil_emission,
+    )
+    if plan_check:
+        report = check_parametric_plan(result.geometry, ignore=PLAN_CHECK_IGNORE)
+        if not report.ok:
+            pairs = ", ".join(f"{i.a}/{i.b}" for i in report.interferences)
+            raise ValueError(f"Plan check failed: nonpositive={report.nonpositive} interferences=[{pairs}]")
     out_dir = out_dir or path.parent / "aedt"
     out_dir.mkdir(parents=True, exist_ok=True)
-    full_name = build_project_name(project_name, path, seed)
+    full_name = build_project_name(project_name, context, seed)
     project_path = out_dir / f"{full_name}.aedt"
     design_name = design_name or full_name
 
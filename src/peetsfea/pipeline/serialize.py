@@ -1,10 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from dataclasses import fields, is_dataclass
 from typing import Any
 
+from peetsfea.geometry.type1.layer_modes import SegmentArray
+
+
+def _convert(value: Any) -> Any:
+    # Same shape as dataclasses.asdict, plus SegmentArray -> list of Segment2D dicts.
+    if isinstance(value, SegmentArray):
+        return [_convert(seg) for seg in value.to_segments()]
+    if is_dataclass(value) and not isinstance(value, type):
+        return {f.name: _convert(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*[_convert(v) for v in value])
+    if isinstance(value, (list, tuple)):
+        return type(value)(_convert(v) for v in value)
+    if isinstance(value, dict):
+        return type(value)((_convert(k), _convert(v)) for k, v in value.items())
+    return value
+
 
 def to_dict(value: Any) -> Any:
     if hasattr(value, "__dataclass_fields__"):
-        return asdict(value)
+        return _convert(value)
     return value
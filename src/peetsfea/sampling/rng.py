@@ -10,7 +10,7 @@ def sample_range(rng: random.Random, spec: RangeSpec) -> float:
         return -1.0
     if spec.step == 0 or spec.max == spec.min:
         return spec.min
-    steps = int(round((spec.max - spec.min) / spec.step))
+    steps = round((spec.max - spec.min) / spec.step)
     if steps <= 0:
         return spec.min
     return spec.min + rng.randint(0, steps) * spec.step
@@ -25,5 +25,27 @@ def sample_int_range(rng: random.Random, spec: IntRangeSpec) -> int:
     return spec.min + rng.randint(0, steps) * spec.step
 
 
+def range_values(spec: RangeSpec) -> tuple[float, ...]:
+    # Every value `sample_range` can return, in draw-index order.
+    if spec.min == -1 or spec.max == -1:
+        return (-1.0,)
+    if spec.step == 0 or spec.max == spec.min:
+        return (spec.min,)
+    steps = round((spec.max - spec.min) / spec.step)
+    if steps <= 0:
+        return (spec.min,)
+    return tuple(spec.min + k * spec.step for k in range(steps + 1))
+
+
+def int_range_values(spec: IntRangeSpec) -> tuple[int, ...]:
+    # Every value `sample_int_range` can return, in draw-index order.
+    if spec.step == 0 or spec.max == spec.min:
+        return (spec.min,)
+    steps = (spec.max - spec.min) // spec.step
+    if steps <= 0:
+        return (spec.min,)
+    return tuple(spec.min + k * spec.step for k in range(steps + 1))
+
+
 def half_size(value: float) -> float:
     return value / 2.0 if value > 0 else 0.0
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+
+from peetsfea.domain.type1.spec_models import TxCoilSpec
+from peetsfea.geometry.type1.spiral_mask import DdSplit, Rect2D, split_dd_bounds
+from peetsfea.sampling.rng import int_range_values, range_values
+
+# `tx.coil.sampler = "feasible_v1"`:
+# Instead of drawing every coil gene and rejecting whole attempts when
+# `derive_rect_spiral` fails, enumerate the (min_w, min_gap, edge_clearance,
+# fill_scale, pitch_duty) grid for the spiral region(s), evaluate derive_rect_spiral's
+# acceptance for every (grid point, turns) pair in one vectorised pass, and draw one
+# point uniformly from the joint feasible (shape, turns) set with a single RNG call.
+
+
+@dataclass(frozen=True)
+class FeasibleCoilShape:
+    min_trace_width_mm: float
+    min_trace_gap_mm: float
+    edge_clearance_mm: float
+    fill_scale: float
+    pitch_duty: float
+    spiral_turns: tuple[int, ...]  # one entry per spiral region
+
+
+@dataclass(frozen=True)
+class _FeasibleTable:
+    # One row per grid point with at least one feasible turn combination, in product() order.
+    shapes: np.ndarray  # (k, 5) min_w, min_gap, edge, fill, duty
+    fits: tuple[np.ndarray, ...]  # per region: (k, len(turn candidates)) bool
+    cumulative: np.ndarray  # (k,) running count of (shape, turns) combinations
+
+    @property
+    def total(self) -> int:
+        return int(self.cumulative[-1]) if len(self.cumulative) else 0
+
+
+def spiral_regions(
+    *,
+    face_u_size_mm: float,
+    face_v_size_mm: float,
+    spiral_count: int,
+    dd: DdSplit | None,
+) -> tuple[tuple[float, float], ...] | None:
+    # (u_size, v_size) of each spiral region, exactly as build_planar_rect_spiral_masks splits the face.
+    full = Rect2D(
+        u_min=-0.5 * face_u_size_mm,
+        u_max=0.5 * face_u_size_mm,
+        v_min=-0.5 * face_v_size_mm,
+        v_max=0.5 * face_v_size_mm,
+    )
+    if spiral_count == 1:
+        return ((full.u_size, full.v_size),)
+    if spiral_count != 2 or dd is None:
+        return None
+    try:
+        a, b = split_dd_bounds(full, axis_idx=dd.axis_idx, gap_mm=dd.gap_mm, ratio=dd.ratio)
+    except ValueError:
+        return None
+    return ((a.u_size, a.v_size), (b.u_size, b.v_size))
+
+
+def _rect_spiral_fits(
+    u_size_mm: float,
+    v_size_mm: float,
+    grid: np.ndarray,
+    turns: np.ndarray,
+) -> np.ndarray:
+    # derive_rect_spiral acceptance for every (grid point, turns) pair at once: the same
+    # float64 operations in the same order, so the result matches the scalar function
+    # exactly. grid: (k, 5) min_w, min_gap, edge, fill, duty; returns (k, len(turns)).
+    min_w, min_gap, edge, fill, duty = (grid[:, i : i + 1] for i in range(5))
+    t = turns.astype(np.float64)[None, :]
+    ok = np.broadcast_to(
+        (t > 0)
+        & (u_size_mm > 0)
+        & (v_size_mm > 0)
+        & (edge >= 0)
+        & (fill > 0.0)
+        & (fill <= 1.0)
+        & (duty > 0)
+        & (min_w > 0)
+        & (min_gap >= 0),
+        (grid.shape[0], len(turns)),
+    ).copy()
+    span = np.minimum(u_size_mm - 2.0 * edge, v_size_mm - 2.0 * edge)
+    ok &= span > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        span_eff = np.broadcast_to(span, ok.shape)
+        pitch = np.zeros(ok.shape)
+        width = np.broadcast_to(min_w, ok.shape)
+        for _ in range(8):
+            ok &= span_eff > 0
+            pitch = fill * span_eff / (2.0 * t + duty)
+            ok &= pitch > 0
+            width = np.maximum(min_w, duty * pitch)
+            span_eff = span - width
+        ok &= (pitch - width) >= min_gap
+        u_size = (0.5 * u_size_mm - edge - 0.5 * width) - (-0.5 * u_size_mm + edge + 0.5 * width)
+        v_size = (0.5 * v_size_mm - edge - 0.5 * width) - (-0.5 * v_size_mm + edge + 0.5 * width)
+        ok &= (u_size > 0) & (v_size > 0)
+    return ok
+
+
+@lru_cache(maxsize=4096)
+def _feasible_table(
+    regions: tuple[tuple[float, float], ...],
+    min_w_values: tuple[float, ...],
+    min_gap_values: tuple[float, ...],
+    edge_values: tuple[float, ...],
+    fill_values: tuple[float, ...],
+    duty_values: tuple[float, ...],
+    turns_values: tuple[tuple[int, ...], ...],
+) -> _FeasibleTable:
+    grid = np.array(
+        list(product(min_w_values, min_gap_values, edge_values, fill_values, duty_values)),
+        dtype=np.float64,
+    ).reshape(-1, 5)
+    fits = [
+        _rect_spiral_fits(u_size, v_size, grid, np.asarray(candidates, dtype=np.int64))
+        for (u_size, v_size), candidates in zip(regions, turns_values)
+    ]
+    weight = np.ones(grid.shape[0], dtype=np.int64)
+    for region_fits in fits:
+        weight *= region_fits.sum(axis=1)
+    keep = weight > 0
+    return _FeasibleTable(
+        shapes=grid[keep],
+        fits=tuple(region_fits[keep] for region_fits in fits),
+        cumulative=np.cumsum(weight[keep]),
+    )
+
+
+def sample_feasible_coil_shape(
+    rng: random.Random,
+    coil: TxCoilSpec,
+    *,
+    face_u_size_mm: float,
+    face_v_size_mm: float,
+    spiral_count: int,
+    dd: DdSplit | None,
+) -> FeasibleCoilShape | None:
+    regions = spiral_regions(
+        face_u_size_mm=face_u_size_mm,
+        face_v_size_mm=face_v_size_mm,
+        spiral_count=spiral_count,
+        dd=dd,
+    )
+    if regions is None:
+        return None
+
+    table = _feasible_table(
+        regions,
+        range_values(coil.min_trace_width_mm),
+        range_values(coil.min_trace_gap_mm),
+        range_values(coil.edge_clearance_mm),
+        range_values(coil.fill_scale),
+        range_values(coil.pitch_duty),
+        tuple(int_range_values(coil.spiral_turns[idx]) for idx in range(len(regions))),
+    )
+    if table.total == 0:
+        return None
+
+    pick = rng.randrange(table.total)
+    k = int(np.searchsorted(table.cumulative, pick, side="right"))
+    offset = pick - (int(table.cumulative[k - 1]) if k > 0 else 0)
+
+    turns: list[int] = []
+    for idx in reversed(range(len(table.fits))):
+        values = [t for t, ok in zip(int_range_values(coil.spiral_turns[idx]), table.fits[idx][k]) if ok]
+        turns.append(values[offset % len(values)])
+        offset //= len(values)
+    turns.reverse()
+
+    min_w, min_gap, edge, fill, duty = (float(v) for v in table.shapes[k])
+    return FeasibleCoilShape(
+        min_trace_width_mm=min_w,
+        min_trace_gap_mm=min_gap,
+        edge_clearance_mm=edge,
+        fill_scale=fill,
+        pitch_duty=duty,
+        spiral_turns=tuple(turns),
+    )
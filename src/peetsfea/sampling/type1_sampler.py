@@ -17,13 +17,14 @@ from peetsfea.domain.type1.sampled_models import (
     Type1SampleInput,
     WallSampleMaybe,
 )
-from peetsfea.domain.type1.spec_models import RangeSpec, Type1Spec
-from peetsfea.geometry.type1.layer_modes import Segment2D, layer_rect_spirals
+from peetsfea.domain.type1.spec_models import RangeSpec, TxCoilInstanceSpec, Type1Spec
+from peetsfea.geometry.type1.coil_cache import default_coil_geometry_cache
+from peetsfea.geometry.type1.inductance import estimate_coil_inductance
 from peetsfea.geometry.type1.self_contact import detect_self_contact
 from peetsfea.geometry.type1.pcb_faces import IN_PLANE_SCALE
-from peetsfea.geometry.type1.spiral_mask import DdSplit, build_planar_rect_spiral_masks
-from peetsfea.geometry.type1.topology import topology_from_segments
+from peetsfea.geometry.type1.spiral_mask import DdSplit
 from peetsfea.sampling.rng import sample_int_range, sample_range
+from peetsfea.sampling.tx_coil_feasible import FeasibleCoilShape, sample_feasible_coil_shape
 
 
 def _sample_optional(rng: random.Random, spec: RangeSpec | None) -> float | None:
@@ -59,6 +60,174 @@ def _sample_module(rng: random.Random, module) -> ModuleSample:
     )
 
 
+def _tx_face_dims(face: str, tx_w: float, tx_h: float, tx_thk: float) -> tuple[float, float]:
+    if face in ("pos_x", "neg_x"):
+        return tx_w * IN_PLANE_SCALE, tx_h * IN_PLANE_SCALE
+    if face in ("pos_y", "neg_y"):
+        return tx_thk * IN_PLANE_SCALE, tx_h * IN_PLANE_SCALE
+    return tx_thk * IN_PLANE_SCALE, tx_w * IN_PLANE_SCALE
+
+
+def _tx_coil_wiring_ok(
+    inst: TxCoilInstanceSample,
+    face_u_mm: float,
+    face_v_mm: float,
+    pcb_layer_count: int,
+    reject_stats: Counter[str],
+    inductance_uh: tuple[float, float] | None = None,
+) -> bool:
+    # Step08-5: reject/resample if the 2D wiring becomes meaningless:
+    # - self-contact (accidental short)
+    # - topology not being a single open path (endpoints!=2, branches, multiple components)
+    cache = default_coil_geometry_cache()
+    try:
+        cache.masks(inst, face_u_size_mm=face_u_mm, face_v_size_mm=face_v_mm, pcb_layer_count=pcb_layer_count)
+    except ValueError:
+        reject_stats[f"{inst.name}:mask_value_error"] += 1
+        return False
+
+    try:
+        coil_geometry = cache.get(
+            inst, face_u_size_mm=face_u_mm, face_v_size_mm=face_v_mm, pcb_layer_count=pcb_layer_count
+        )
+    except ValueError:
+        reject_stats[f"{inst.name}:layer_split_value_error"] += 1
+        return False
+    layered = coil_geometry.layered
+
+    if any(detect_self_contact(l.top_segments).detected for l in layered):
+        reject_stats[f"{inst.name}:self_contact_top"] += 1
+        return False
+    if any(detect_self_contact(l.bottom_segments).detected for l in layered):
+        reject_stats[f"{inst.name}:self_contact_bottom"] += 1
+        return False
+
+    topology = coil_geometry.topology_total
+    if topology.component_count != 1:
+        reject_stats[f"{inst.name}:topology_component_count"] += 1
+        return False
+    if topology.endpoints_count != 2:
+        reject_stats[f"{inst.name}:topology_endpoints_count"] += 1
+        return False
+    if topology.has_branch:
+        reject_stats[f"{inst.name}:topology_has_branch"] += 1
+        return False
+    # Optional analytic pre-screen: skip coils far outside the target inductance range.
+    if inductance_uh is not None:
+        estimate_uh = estimate_coil_inductance(coil_geometry).greenhouse_uh
+        if not (inductance_uh[0] <= estimate_uh <= inductance_uh[1]):
+            reject_stats[f"{inst.name}:inductance_out_of_range"] += 1
+            return False
+    return True
+
+
+def _sample_tx_coil_instance_feasible(
+    rng: random.Random,
+    spec: Type1Spec,
+    inst_spec: TxCoilInstanceSpec,
+    *,
+    present: bool,
+    face_dims: tuple[float, float],
+    inner_plane_axis_idx: int,
+    inner_plane_axis: str,
+    inner_pcb_count: int,
+    half: tuple[float, ...],
+    full_weights: tuple[float, ...],
+) -> TxCoilInstanceSample | None:
+    # "feasible_v1": draw the layout genes first, then the spiral shape/turn genes from
+    # the region that derive_rect_spiral accepts for this face (see tx_coil_feasible).
+    coil = spec.tx.coil
+    if not present:
+        return TxCoilInstanceSample(
+            name=inst_spec.name,
+            face=inst_spec.face,
+            present=present,
+            min_trace_width_mm=sample_range(rng, coil.min_trace_width_mm),
+            min_trace_gap_mm=sample_range(rng, coil.min_trace_gap_mm),
+            edge_clearance_mm=sample_range(rng, coil.edge_clearance_mm),
+            fill_scale=sample_range(rng, coil.fill_scale),
+            pitch_duty=sample_range(rng, coil.pitch_duty),
+            layer_mode_idx=sample_int_range(rng, coil.layer_mode_idx),
+            radial_split_top_turn_fraction=sample_range(rng, coil.radial_split_top_turn_fraction),
+            radial_split_outer_is_top=bool(sample_int_range(rng, coil.radial_split_outer_is_top)),
+            spiral_count=sample_int_range(rng, coil.spiral_count),
+            spiral_turns=tuple(sample_int_range(rng, r) for r in coil.spiral_turns),
+            spiral_direction_idx=tuple(sample_int_range(rng, r) for r in coil.spiral_direction_idx),
+            spiral_start_edge_idx=tuple(sample_int_range(rng, r) for r in coil.spiral_start_edge_idx),
+            dd_split_axis_idx=sample_int_range(rng, coil.dd_split_axis_idx),
+            dd_gap_mm=sample_range(rng, coil.dd_gap_mm),
+            dd_split_ratio=sample_range(rng, coil.dd_split_ratio),
+            trace_layer_count=sample_int_range(rng, coil.trace_layer_count),
+            inner_plane_axis_idx=inner_plane_axis_idx,
+            inner_plane_axis=inner_plane_axis,
+            inner_pcb_count=inner_pcb_count,
+            inner_spacing_ratio_half=half,
+            inner_spacing_ratio=full_weights,
+        )
+
+    layer_mode_idx = sample_int_range(rng, coil.layer_mode_idx)
+    radial_split_top_turn_fraction = sample_range(rng, coil.radial_split_top_turn_fraction)
+    radial_split_outer_is_top = bool(sample_int_range(rng, coil.radial_split_outer_is_top))
+    spiral_count = sample_int_range(rng, coil.spiral_count)
+    spiral_direction_idx = tuple(sample_int_range(rng, r) for r in coil.spiral_direction_idx)
+    spiral_start_edge_idx = tuple(sample_int_range(rng, r) for r in coil.spiral_start_edge_idx)
+    trace_layer_count = sample_int_range(rng, coil.trace_layer_count)
+
+    # Only the DD split can leave a face without any feasible spiral; redraw it a bounded
+    # number of times before giving the attempt back to the outer loop.
+    shape: FeasibleCoilShape | None = None
+    for _ in range(64):
+        dd_split_axis_idx = sample_int_range(rng, coil.dd_split_axis_idx)
+        dd_gap_mm = sample_range(rng, coil.dd_gap_mm)
+        dd_split_ratio = sample_range(rng, coil.dd_split_ratio)
+        dd = None
+        if spiral_count == 2:
+            dd = DdSplit(axis_idx=dd_split_axis_idx, gap_mm=dd_gap_mm, ratio=dd_split_ratio)
+        shape = sample_feasible_coil_shape(
+            rng,
+            coil,
+            face_u_size_mm=face_dims[0],
+            face_v_size_mm=face_dims[1],
+            spiral_count=spiral_count,
+            dd=dd,
+        )
+        if shape is not None or spiral_count != 2:
+            break
+    if shape is None:
+        return None
+
+    spiral_turns = shape.spiral_turns + tuple(
+        sample_int_range(rng, r) for r in coil.spiral_turns[len(shape.spiral_turns) :]
+    )
+
+    return TxCoilInstanceSample(
+        name=inst_spec.name,
+        face=inst_spec.face,
+        present=present,
+        min_trace_width_mm=shape.min_trace_width_mm,
+        min_trace_gap_mm=shape.min_trace_gap_mm,
+        edge_clearance_mm=shape.edge_clearance_mm,
+        fill_scale=shape.fill_scale,
+        pitch_duty=shape.pitch_duty,
+        layer_mode_idx=layer_mode_idx,
+        radial_split_top_turn_fraction=radial_split_top_turn_fraction,
+        radial_split_outer_is_top=radial_split_outer_is_top,
+        spiral_count=spiral_count,
+        spiral_turns=spiral_turns,
+        spiral_direction_idx=spiral_direction_idx,
+        spiral_start_edge_idx=spiral_start_edge_idx,
+        dd_split_axis_idx=dd_split_axis_idx,
+        dd_gap_mm=dd_gap_mm,
+        dd_split_ratio=dd_split_ratio,
+        trace_layer_count=trace_layer_count,
+        inner_plane_axis_idx=inner_plane_axis_idx,
+        inner_plane_axis=inner_plane_axis,
+        inner_pcb_count=inner_pcb_count,
+        inner_spacing_ratio_half=half,
+        inner_spacing_ratio=full_weights,
+    )
+
+
 def sample_type1(spec: Type1Spec, seed: int) -> Type1SampleInput:
     rng = random.Random(seed)
 
@@ -149,124 +318,64 @@ def sample_type1(spec: Type1Spec, seed: int) -> Type1SampleInput:
                     break
                 full_weights = weights + tuple(0.0 for _ in range((spec.tx.coil.max_inner_pcb_count + 1) - gaps))
 
-                inst = TxCoilInstanceSample(
-                    name=inst_spec.name,
-                    face=inst_spec.face,
-                    present=present,
-                    min_trace_width_mm=sample_range(rng, spec.tx.coil.min_trace_width_mm),
-                    min_trace_gap_mm=sample_range(rng, spec.tx.coil.min_trace_gap_mm),
-                    edge_clearance_mm=sample_range(rng, spec.tx.coil.edge_clearance_mm),
-                    fill_scale=sample_range(rng, spec.tx.coil.fill_scale),
-                    pitch_duty=sample_range(rng, spec.tx.coil.pitch_duty),
-                    layer_mode_idx=sample_int_range(rng, spec.tx.coil.layer_mode_idx),
-                    radial_split_top_turn_fraction=sample_range(rng, spec.tx.coil.radial_split_top_turn_fraction),
-                    radial_split_outer_is_top=bool(sample_int_range(rng, spec.tx.coil.radial_split_outer_is_top)),
-                    spiral_count=sample_int_range(rng, spec.tx.coil.spiral_count),
-                    spiral_turns=tuple(sample_int_range(rng, r) for r in spec.tx.coil.spiral_turns),
-                    spiral_direction_idx=tuple(sample_int_range(rng, r) for r in spec.tx.coil.spiral_direction_idx),
-                    spiral_start_edge_idx=tuple(sample_int_range(rng, r) for r in spec.tx.coil.spiral_start_edge_idx),
-                    dd_split_axis_idx=sample_int_range(rng, spec.tx.coil.dd_split_axis_idx),
-                    dd_gap_mm=sample_range(rng, spec.tx.coil.dd_gap_mm),
-                    dd_split_ratio=sample_range(rng, spec.tx.coil.dd_split_ratio),
-                    trace_layer_count=sample_int_range(rng, spec.tx.coil.trace_layer_count),
-                    inner_plane_axis_idx=inner_plane_axis_idx,
-                    inner_plane_axis=inner_plane_axis,
-                    inner_pcb_count=inner_pcb_count,
-                    inner_spacing_ratio_half=half,
-                    inner_spacing_ratio=full_weights,
-                )
+                if spec.tx.coil.sampler == "feasible_v1":
+                    inst = _sample_tx_coil_instance_feasible(
+                        rng,
+                        spec,
+                        inst_spec,
+                        present=present,
+                        face_dims=_tx_face_dims(inst_spec.face, tx_w, tx_h, tx_thk),
+                        inner_plane_axis_idx=inner_plane_axis_idx,
+                        inner_plane_axis=inner_plane_axis,
+                        inner_pcb_count=inner_pcb_count,
+                        half=half,
+                        full_weights=full_weights,
+                    )
+                    if inst is None:
+                        reject_stats[f"{inst_spec.name}:no_feasible_region"] += 1
+                        valid = False
+                        break
+                else:
+                    inst = TxCoilInstanceSample(
+                        name=inst_spec.name,
+                        face=inst_spec.face,
+                        present=present,
+                        min_trace_width_mm=sample_range(rng, spec.tx.coil.min_trace_width_mm),
+                        min_trace_gap_mm=sample_range(rng, spec.tx.coil.min_trace_gap_mm),
+                        edge_clearance_mm=sample_range(rng, spec.tx.coil.edge_clearance_mm),
+                        fill_scale=sample_range(rng, spec.tx.coil.fill_scale),
+                        pitch_duty=sample_range(rng, spec.tx.coil.pitch_duty),
+                        layer_mode_idx=sample_int_range(rng, spec.tx.coil.layer_mode_idx),
+                        radial_split_top_turn_fraction=sample_range(rng, spec.tx.coil.radial_split_top_turn_fraction),
+                        radial_split_outer_is_top=bool(sample_int_range(rng, spec.tx.coil.radial_split_outer_is_top)),
+                        spiral_count=sample_int_range(rng, spec.tx.coil.spiral_count),
+                        spiral_turns=tuple(sample_int_range(rng, r) for r in spec.tx.coil.spiral_turns),
+                        spiral_direction_idx=tuple(sample_int_range(rng, r) for r in spec.tx.coil.spiral_direction_idx),
+                        spiral_start_edge_idx=tuple(sample_int_range(rng, r) for r in spec.tx.coil.spiral_start_edge_idx),
+                        dd_split_axis_idx=sample_int_range(rng, spec.tx.coil.dd_split_axis_idx),
+                        dd_gap_mm=sample_range(rng, spec.tx.coil.dd_gap_mm),
+                        dd_split_ratio=sample_range(rng, spec.tx.coil.dd_split_ratio),
+                        trace_layer_count=sample_int_range(rng, spec.tx.coil.trace_layer_count),
+                        inner_plane_axis_idx=inner_plane_axis_idx,
+                        inner_plane_axis=inner_plane_axis,
+                        inner_pcb_count=inner_pcb_count,
+                        inner_spacing_ratio_half=half,
+                        inner_spacing_ratio=full_weights,
+                    )
 
                 instances.append(inst)
                 if not inst.present:
                     continue
 
-                if inst.face in ("pos_x", "neg_x"):
-                    face_u_mm = tx_w * IN_PLANE_SCALE
-                    face_v_mm = tx_h * IN_PLANE_SCALE
-                elif inst.face in ("pos_y", "neg_y"):
-                    face_u_mm = tx_thk * IN_PLANE_SCALE
-                    face_v_mm = tx_h * IN_PLANE_SCALE
-                else:
-                    face_u_mm = tx_thk * IN_PLANE_SCALE
-                    face_v_mm = tx_w * IN_PLANE_SCALE
-
-                dd = None
-                if inst.spiral_count == 2:
-                    dd = DdSplit(axis_idx=inst.dd_split_axis_idx, gap_mm=inst.dd_gap_mm, ratio=inst.dd_split_ratio)
-
-                # Step08-5: reject/resample if the 2D wiring becomes meaningless:
-                # - self-contact (accidental short)
-                # - topology not being a single open path (endpoints!=2, branches, multiple components)
-                effective_trace_layers = min(tx_pcb.layer_count, inst.trace_layer_count)
-                layer_mode_idx_effective = inst.layer_mode_idx if effective_trace_layers >= 2 else 0
-
-                try:
-                    masks = build_planar_rect_spiral_masks(
-                        face_u_size_mm=face_u_mm,
-                        face_v_size_mm=face_v_mm,
-                        spiral_count=inst.spiral_count,
-                        turns=inst.spiral_turns,
-                        direction_idx=inst.spiral_direction_idx,
-                        start_edge_idx=inst.spiral_start_edge_idx,
-                        edge_clearance_mm=inst.edge_clearance_mm,
-                        fill_scale=inst.fill_scale,
-                        pitch_duty=inst.pitch_duty,
-                        min_trace_width_mm=inst.min_trace_width_mm,
-                        min_trace_gap_mm=inst.min_trace_gap_mm,
-                        dd=dd,
-                    )
-                except ValueError:
-                    reject_stats[f"{inst.name}:mask_value_error"] += 1
-                    valid = False
-                    break
-
-                try:
-                    layered = layer_rect_spirals(
-                        masks,
-                        layer_mode_idx=layer_mode_idx_effective,
-                        radial_split_top_turn_fraction=inst.radial_split_top_turn_fraction,
-                        radial_split_outer_is_top=inst.radial_split_outer_is_top,
-                    )
-                except ValueError:
-                    reject_stats[f"{inst.name}:layer_split_value_error"] += 1
-                    valid = False
-                    break
-
-                if any(detect_self_contact(tuple(l.top_segments)).detected for l in layered):
-                    reject_stats[f"{inst.name}:self_contact_top"] += 1
-                    valid = False
-                    break
-                if any(detect_self_contact(tuple(l.bottom_segments)).detected for l in layered):
-                    reject_stats[f"{inst.name}:self_contact_bottom"] += 1
-                    valid = False
-                    break
-
-                total_segments = [
-                    Segment2D(a=s.a, b=s.b, width_mm=0.0)
-                    for l in layered
-                    for s in (l.top_segments + l.bottom_segments)
-                ]
-                if inst.spiral_count == 2 and len(layered) >= 2:
-                    p0 = layered[0].terminal_b
-                    p1 = layered[1].terminal_a
-                    if p0[0] == p1[0] or p0[1] == p1[1]:
-                        total_segments.append(Segment2D(a=p0, b=p1, width_mm=0.0))
-                    else:
-                        mid = (p1[0], p0[1])
-                        total_segments.append(Segment2D(a=p0, b=mid, width_mm=0.0))
-                        total_segments.append(Segment2D(a=mid, b=p1, width_mm=0.0))
-
-                topology = topology_from_segments(tuple(total_segments))
-                if topology.component_count != 1:
-                    reject_stats[f"{inst.name}:topology_component_count"] += 1
-                    valid = False
-                    break
-                if topology.endpoints_count != 2:
-                    reject_stats[f"{inst.name}:topology_endpoints_count"] += 1
-                    valid = False
-                    break
-                if topology.has_branch:
-                    reject_stats[f"{inst.name}:topology_has_branch"] += 1
+                face_u_mm, face_v_mm = _tx_face_dims(inst.face, tx_w, tx_h, tx_thk)
+                if not _tx_coil_wiring_ok(
+                    inst,
+                    face_u_mm,
+                    face_v_mm,
+                    tx_pcb.layer_count,
+                    reject_stats,
+                    inductance_uh=spec.tx.coil.inductance_uh,
+                ):
                     valid = False
                     break
 
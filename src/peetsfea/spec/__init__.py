@@ -1,3 +1,3 @@
-from .io import load_toml, load_toml_text
+from .io import load_toml, load_toml_bytes, load_toml_text
 
-__all__ = ["load_toml", "load_toml_text"]
+__all__ = ["load_toml", "load_toml_bytes", "load_toml_text"]
@@ -15,3 +15,7 @@ def load_toml(path: Path) -> dict[str, Any]:
 
 def load_toml_text(text: str) -> dict[str, Any]:
     return tomllib.loads(text)
+
+
+def load_toml_bytes(data: bytes) -> dict[str, Any]:
+    return tomllib.loads(data.decode("utf-8"))
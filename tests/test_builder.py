@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from peetsfea.geometry.type1 import builder
+from peetsfea.geometry.type1.builder import (
+    build_type1_parametric_geometry,
+    scene_plan_template,
+    scene_signature,
+)
+from peetsfea.pipeline.runner import load_type1_spec_context, run_type1
+from peetsfea.pipeline.serialize import to_dict
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("coil_emission", ["boxes", "polyline"])
+def test_cached_template_matches_uncached_builder(monkeypatch: pytest.MonkeyPatch, coil_emission: str) -> None:
+    context = load_type1_spec_context(ROOT / "examples" / "type1.toml")
+    first, second = (run_type1(context, seed).sample for seed in (3, 7))
+    assert scene_signature(first) == scene_signature(second)
+    assert first.tx_module.outer_w_mm != second.tx_module.outer_w_mm
+
+    scene_plan_template.cache_clear()
+    cached = [to_dict(build_type1_parametric_geometry(s, coil_emission=coil_emission)) for s in (first, second)]
+    assert scene_plan_template.cache_info().hits == 1
+    assert scene_plan_template(scene_signature(first)) is scene_plan_template(scene_signature(second))
+
+    monkeypatch.setattr(builder, "scene_plan_template", scene_plan_template.__wrapped__)
+    uncached = [to_dict(build_type1_parametric_geometry(s, coil_emission=coil_emission)) for s in (first, second)]
+
+    assert cached == uncached
+    assert cached[0]["variables"] != cached[1]["variables"]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from peetsfea.pipeline.catalog import GeneCatalog
+
+
+def _meta(seed: int) -> dict:
+    full_name = f"type1_abc123_2.0.0_{seed}"
+    return {
+        "full_name": full_name,
+        "seed": seed,
+        "spec_hash": "abc123",
+        "peetsfea_version": "2.0.0",
+        "project_name": full_name,
+    }
+
+
+def _genes(gap_mm: float, turns: list[int], layer_mode_idx: int = 0) -> dict:
+    instance = {
+        "name": "neg_x",
+        "present": True,
+        "layer_mode_idx": layer_mode_idx,
+        "spiral_count": len(turns),
+        "spiral_turns": turns,
+        "spiral_start_edge_idx": [0] * len(turns),
+        "spiral_direction_idx": [1] * len(turns),
+    }
+    return {"sample": {"core_core_gap_mm": gap_mm, "tx_pcb": {"layer_count": 2}, "tx_coil": {"instances": [instance]}}}
+
+
+def test_upsert_twice_replaces_the_rows(tmp_path: Path) -> None:
+    with GeneCatalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.upsert(_meta(1), "ok", _genes(100.0, [10, 12]), None)
+        before = set(catalog.columns("samples"))
+        derived = {"coupling": {"k_max_abs": 0.2, "instances": [{"name": "neg_x", "k": 0.2}]}}
+        catalog.upsert(_meta(1), "ok", _genes(110.0, [14]), derived)
+
+        assert set(catalog.columns("samples")) - before == {"derived_coupling_k_max_abs"}
+        assert "derived_coupling_k" in catalog.columns("instances")
+        rows = catalog._conn.execute("SELECT seed, core_core_gap_mm, derived_coupling_k_max_abs FROM samples").fetchall()
+        assert rows == [(1, 110.0, 0.2)]
+        assert catalog._conn.execute("SELECT COUNT(*) FROM instances").fetchone() == (1,)
+        # The second upsert has one spiral; the stale second spiral row is gone.
+        assert catalog._conn.execute("SELECT spiral_idx, turns FROM spirals").fetchall() == [(0, 14)]
+        indexes = {row[1] for row in catalog._conn.execute("PRAGMA index_list(samples)")}
+        assert {"ix_samples_seed", "ix_samples_core_core_gap_mm", "ix_samples_derived_coupling_k_max_abs"} <= indexes
+
+
+def test_select_seeds(tmp_path: Path) -> None:
+    with GeneCatalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.upsert(_meta(1), "ok", _genes(100.0, [10, 20]), None)
+        catalog.upsert(_meta(2), "ok", _genes(120.0, [18]), None)
+        catalog.upsert(_meta(3), "ok", _genes(90.0, [5, 6], layer_mode_idx=2), None)
+        catalog.upsert(_meta(4), "rejected", _genes(95.0, [30]), None)
+        catalog.upsert(_meta(5), "error", None, None)
+
+        assert catalog.select_seeds() == [1, 2, 3]
+        assert catalog.select_seeds(status=None) == [1, 2, 3, 4, 5]
+        assert catalog.select_seeds(status="rejected") == [4]
+        assert catalog.select_seeds("core_core_gap_mm < :gap", params={"gap": 105}) == [1, 3]
+        assert catalog.select_seeds(instance="spiral_count = 2") == [1, 3]
+        assert catalog.select_seeds(spiral="turns >= 15") == [1, 2]
+        # The spiral condition applies to spirals of an instance matching the instance condition.
+        assert catalog.select_seeds(instance="spiral_count = 2", spiral="turns >= 15") == [1]
+        assert catalog.select_seeds(instance="layer_mode_idx = 2", spiral="turns >= 15") == []
+        assert catalog.select_seeds(spec_hash="other") == []
+        assert catalog.select_seeds(version="2.0.0", status=None) == [1, 2, 3, 4, 5]
+        with pytest.raises(ValueError, match="Unknown catalog table"):
+            catalog.columns("genes")
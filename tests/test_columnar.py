@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peetsfea.pipeline.columnar import (
+    ColumnarFeatureSink,
+    flatten_sample_features,
+    read_columnar_features,
+)
+
+
+def test_flatten_keys_named_entries_by_name() -> None:
+    genes = {"sample": {"tx_coil": {"instances": [{"name": "neg_x", "turns": [3, 4]}, {"name": "pos_z", "turns": [5]}]}}}
+    derived = {"coupling": {"k_max_abs": 0.25, "rx_loop": None}}
+    row = flatten_sample_features(genes, derived, seed=7, status="ok", error=None)
+    assert row == {
+        "seed": 7,
+        "status": "ok",
+        "genes.sample.tx_coil.instances.neg_x.name": "neg_x",
+        "genes.sample.tx_coil.instances.neg_x.turns.0": 3,
+        "genes.sample.tx_coil.instances.neg_x.turns.1": 4,
+        "genes.sample.tx_coil.instances.pos_z.name": "pos_z",
+        "genes.sample.tx_coil.instances.pos_z.turns.0": 5,
+        "derived.coupling.k_max_abs": 0.25,
+    }
+
+
+def test_round_trip_with_mixed_dtypes_and_missing_columns(tmp_path: Path) -> None:
+    # Three row groups of two rows; some columns are missing from whole groups or single rows.
+    rows = [
+        {"seed": 1, "ok": True, "k": 0.5, "name": "a", "turns": 3},
+        {"seed": 2, "ok": False, "k": 1.5, "name": "bb", "turns": 4},
+        {"seed": 3, "ok": True, "k": 2, "turns": 5, "late": 10},
+        {"seed": 4, "ok": True, "k": 3, "name": "ccc", "late": 11},
+        {"seed": 5, "ok": False, "k": 4.25, "name": "d", "turns": 6},
+        {"seed": 6, "ok": True, "name": "eeeeeeeeee", "turns": 7},
+    ]
+    out = tmp_path / "features"
+    with ColumnarFeatureSink(out, batch_rows=2) as sink:
+        for row in rows:
+            sink.append(row)
+        assert len(list((out / "_parts").glob("*.npz"))) == 3
+
+    schema = json.loads((out / "schema.json").read_text(encoding="utf-8"))
+    assert schema["rows"] == 6
+    assert [col["name"] for col in schema["columns"]] == ["k", "late", "name", "ok", "seed", "turns"]
+    assert not (out / "_parts").exists()
+
+    table = read_columnar_features(out)
+    assert isinstance(table["seed"], np.memmap)
+    # Complete int and bool columns keep their dtype.
+    assert table["seed"].dtype == np.int64
+    assert table["seed"].tolist() == [1, 2, 3, 4, 5, 6]
+    assert table["ok"].dtype == np.bool_
+    assert table["ok"].tolist() == [True, False, True, True, False, True]
+    # int groups merged with float groups, and gaps, become float64 with NaN.
+    assert table["k"].dtype == np.float64
+    np.testing.assert_array_equal(table["k"], [0.5, 1.5, 2.0, 3.0, 4.25, np.nan])
+    assert table["turns"].dtype == np.float64
+    np.testing.assert_array_equal(table["turns"], [3.0, 4.0, 5.0, np.nan, 6.0, 7.0])
+    np.testing.assert_array_equal(table["late"], [np.nan, np.nan, 10.0, 11.0, np.nan, np.nan])
+    # Strings are widened to the longest group and gaps are "".
+    assert table["name"].dtype == np.dtype("<U10")
+    assert table["name"].tolist() == ["a", "bb", "", "ccc", "d", "eeeeeeeeee"]
+
+    subset = read_columnar_features(out, ["seed", "name"], mmap=False)
+    assert list(subset) == ["seed", "name"]
+    assert not isinstance(subset["seed"], np.memmap)
+    with pytest.raises(ValueError, match="Unknown columns"):
+        read_columnar_features(out, ["missing"])
+
+
+def test_aborted_sweep_keeps_the_previous_table(tmp_path: Path) -> None:
+    out = tmp_path / "features"
+    with ColumnarFeatureSink(out) as sink:
+        sink.append({"seed": 1})
+    with pytest.raises(RuntimeError), ColumnarFeatureSink(out) as sink:
+        sink.append({"seed": 2})
+        raise RuntimeError("worker failed")
+    assert read_columnar_features(out)["seed"].tolist() == [1]
+    assert not (out / "_parts").exists()
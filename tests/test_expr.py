@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from fractions import Fraction
+
+import pytest
+
+from peetsfea.geometry.expr import LinearExpr, sstr, symbol
+
+sym = symbol
+
+# (expression, sympy sstr(expr), sympy sstr(expr, order="none")), the strings as printed
+# by sympy for the same expressions built from sympy Symbols.
+CASES = [
+    (
+        sym("tv_center_z") - sym("tv_h") / 2 - sym("tx_core_h") / 2 - sym("tx_gap_from_tv_bottom"),
+        "tv_center_z - tv_h/2 - tx_core_h/2 - tx_gap_from_tv_bottom",
+        "tv_center_z - tx_gap_from_tv_bottom - tv_h/2 - tx_core_h/2",
+    ),
+    (
+        sym("tv_center_y") - sym("rx_core_w") / 2,
+        "-rx_core_w/2 + tv_center_y",
+        "tv_center_y - rx_core_w/2",
+    ),
+    (
+        sym("core_core_gap") + sym("rx_core_h") / 2 + sym("tv_center_z") - sym("tv_h") / 2 - sym("tx_gap_from_tv_bottom"),
+        "core_core_gap + rx_core_h/2 + tv_center_z - tv_h/2 - tx_gap_from_tv_bottom",
+        "core_core_gap + tv_center_z + rx_core_h/2 - tx_gap_from_tv_bottom - tv_h/2",
+    ),
+    (
+        sym("tx_coil_cu") + sym("tx_coil_s0_pitch") + sym("tx_coil_s0_umin") - sym("tx_coil_s0_w") / 2,
+        "tx_coil_cu + tx_coil_s0_pitch + tx_coil_s0_umin - tx_coil_s0_w/2",
+        "tx_coil_cu + tx_coil_s0_pitch + tx_coil_s0_umin - tx_coil_s0_w/2",
+    ),
+    (
+        sym("tx_coil_cu") + sym("tx_coil_s1_umin") - sym("tx_coil_tab_b") + 2 * sym("tx_coil_s1_pitch"),
+        "tx_coil_cu + 2*tx_coil_s1_pitch + tx_coil_s1_umin - tx_coil_tab_b",
+        "tx_coil_cu + tx_coil_s1_umin - tx_coil_tab_b + 2*tx_coil_s1_pitch",
+    ),
+    (
+        sym("tx_coil_s0_umax") + sym("tx_coil_s0_w") - sym("tx_coil_s0_pitch") - sym("tx_coil_s0_umin"),
+        "-tx_coil_s0_pitch + tx_coil_s0_umax - tx_coil_s0_umin + tx_coil_s0_w",
+        "tx_coil_s0_umax + tx_coil_s0_w - tx_coil_s0_pitch - tx_coil_s0_umin",
+    ),
+    (
+        sym("tx_coil_tab_b") + sym("tx_coil_s1_pitch") / 2,
+        "tx_coil_s1_pitch/2 + tx_coil_tab_b",
+        "tx_coil_tab_b + tx_coil_s1_pitch/2",
+    ),
+    (3 - 2 * sym("x"), "3 - 2*x", "3 - 2*x"),
+    (Fraction(5, 2) - sym("x"), "5/2 - x", "5/2 - x"),
+    (sym("x") + 3, "x + 3", "3 + x"),
+    (-3 * sym("x") / 2 + sym("y") - Fraction(1, 4), "-3*x/2 + y - 1/4", "-1/4 + y - 3*x/2"),
+    (-sym("x") - 2 * sym("y") + Fraction(7, 3), "-x - 2*y + 7/3", "7/3 - x - 2*y"),
+    (sym("x") - sym("x"), "0", "0"),
+]
+
+
+@pytest.mark.parametrize(("expr", "lex", "none"), CASES)
+def test_sstr_matches_sympy(expr: LinearExpr, lex: str, none: str) -> None:
+    assert sstr(expr) == lex
+    assert sstr(expr, order="none") == none
+
+
+def test_cancelled_terms_are_dropped() -> None:
+    expr = sym("x") + sym("y") - sym("x")
+    assert expr.terms == {"y": Fraction(1)}
+    assert (sym("x") * 0).terms == {}
+
+
+def test_unknown_order() -> None:
+    with pytest.raises(ValueError, match="order"):
+        sstr(sym("x"), order="grlex")
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peetsfea.domain.errors import SpecValidationError
+from peetsfea.domain.type1.parse import parse_type1_spec_dict
+from peetsfea.geometry.type1.coil_cache import CoilGeometryCache
+from peetsfea.geometry.type1.layer_modes import (
+    SegmentArray,
+    _exact_overlap,
+    estimate_overlap,
+)
+from peetsfea.geometry.type1.spiral_mask import Rect2D, rect_spiral_polyline_array
+from peetsfea.geometry.type1.tx_coil_3d import tx_coil_face_frame_for_name
+from peetsfea.pipeline.runner import load_type1_spec_context, run_type1
+from peetsfea.spec.io import load_toml
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _raster_areas(top: SegmentArray, bottom: SegmentArray, step: float) -> tuple[float, float, float]:
+    # Cell-centre raster of both layers; error is O(perimeter * step).
+    rects = np.concatenate([top.rects(), bottom.rects()])
+    u = np.arange(rects[:, 0].min(), rects[:, 1].max(), step) + 0.5 * step
+    v = np.arange(rects[:, 2].min(), rects[:, 3].max(), step) + 0.5 * step
+
+    def cover(layer: SegmentArray) -> np.ndarray:
+        image = np.zeros((len(u), len(v)), dtype=bool)
+        for u0, u1, v0, v1 in layer.rects():
+            image[np.searchsorted(u, u0) : np.searchsorted(u, u1), np.searchsorted(v, v0) : np.searchsorted(v, v1)] = True
+        return image
+
+    in_top, in_bottom = cover(top), cover(bottom)
+    cell = step * step
+    return (
+        float(np.count_nonzero(in_top)) * cell,
+        float(np.count_nonzero(in_bottom)) * cell,
+        float(np.count_nonzero(in_top & in_bottom)) * cell,
+    )
+
+
+def _spiral(turns: int, pitch: float, width: float, start_edge_idx: int, direction_idx: int) -> SegmentArray:
+    bounds = Rect2D(u_min=-60.0, u_max=55.0, v_min=-35.0, v_max=42.0)
+    points = rect_spiral_polyline_array(
+        bounds=bounds, turns=turns, pitch_mm=pitch, start_edge_idx=start_edge_idx, direction_idx=direction_idx
+    )
+    return SegmentArray.from_polyline(points, width)
+
+
+@pytest.mark.parametrize(
+    ("top", "bottom"),
+    [
+        ((5, 4.0, 1.5, 0, 1), (5, 4.0, 1.5, 2, 0)),
+        ((12, 2.5, 0.8, 3, 1), (9, 3.1, 1.2, 1, 1)),
+        ((25, 1.3, 0.6, 1, 0), (20, 1.6, 0.9, 0, 1)),
+    ],
+)
+def test_exact_overlap_matches_fine_raster(top: tuple, bottom: tuple) -> None:
+    top_segments, bottom_segments = _spiral(*top), _spiral(*bottom)
+
+    exact = _exact_overlap(top_segments, bottom_segments)
+    top_area, bottom_area, overlap_area = _raster_areas(top_segments, bottom_segments, step=0.02)
+
+    assert exact.grid_step_mm == 0.0
+    assert exact.overlap_area_est_mm2 > 0.0
+    assert exact.top_area_est_mm2 == pytest.approx(top_area, rel=5e-3)
+    assert exact.bottom_area_est_mm2 == pytest.approx(bottom_area, rel=5e-3)
+    assert exact.overlap_area_est_mm2 == pytest.approx(overlap_area, rel=2e-2)
+    assert exact.overlap_ratio_est == pytest.approx(overlap_area / min(top_area, bottom_area), rel=2e-2)
+
+
+def test_unknown_overlap_method() -> None:
+    with pytest.raises(ValueError, match="overlap method"):
+        estimate_overlap(_spiral(3, 4.0, 1.0, 0, 1), _spiral(3, 4.0, 1.0, 1, 1), method="mesh")
+
+
+def test_overlap_method_is_part_of_the_cache_key() -> None:
+    context = load_type1_spec_context(ROOT / "examples" / "type1.toml")
+    sample = run_type1(context, 1).sample
+    inst = next(inst for inst in sample.tx_coil.instances if inst.present)
+    frame = tx_coil_face_frame_for_name(sample, inst.face)
+    cache = CoilGeometryCache()
+
+    def get(**kwargs):
+        return cache.get(
+            inst,
+            face_u_size_mm=frame.face_u_size_mm,
+            face_v_size_mm=frame.face_v_size_mm,
+            pcb_layer_count=sample.tx_pcb.layer_count,
+            **kwargs,
+        )
+
+    plain = get()
+    grid = get(with_overlap=True)
+    exact = get(with_overlap=True, overlap_method="exact")
+
+    assert all(lay.overlap_estimate is None for lay in plain.layered)
+    assert all(lay.overlap_estimate.grid_step_mm > 0.0 for lay in grid.layered)
+    assert all(lay.overlap_estimate.grid_step_mm == 0.0 for lay in exact.layered)
+    assert grid.masks is plain.masks and exact.masks is plain.masks
+    assert get(with_overlap=True, overlap_method="exact") is exact
+    assert get(with_overlap=True) is grid
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+@pytest.mark.parametrize(("value", "expected"), [(None, "grid"), ("grid", "grid"), ("exact", "exact")])
+def test_spec_overlap_method(value: str | None, expected: str) -> None:
+    data = load_toml(ROOT / "examples" / "type1.toml")
+    if value is not None:
+        data["tx"]["coil"]["overlap_method"] = value
+    assert parse_type1_spec_dict(data).tx.coil.overlap_method == expected
+
+
+def test_spec_rejects_unknown_overlap_method() -> None:
+    data = load_toml(ROOT / "examples" / "type1.toml")
+    data["tx"]["coil"]["overlap_method"] = "mesh"
+    with pytest.raises(SpecValidationError, match="overlap_method"):
+        parse_type1_spec_dict(data)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from peetsfea.pipeline.layout import DatasetLayout, migrate_dataset_layout
+
+
+def _meta(seed: int) -> dict:
+    full_name = f"type1_abc123_2.0.0_{seed}"
+    return {"full_name": full_name, "seed": seed, "spec_hash": "abc123", "peetsfea_version": "2.0.0"}
+
+
+def _write_flat_sample(root: Path, seed: int, *, complete: bool = True) -> Path:
+    meta = _meta(seed)
+    sample_dir = root / "type1" / meta["full_name"]
+    sample_dir.mkdir(parents=True)
+    (sample_dir / "genes.json").write_text("{}", encoding="utf-8")
+    if complete:
+        (sample_dir / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return sample_dir
+
+
+def test_migrate_moves_incomplete_samples(tmp_path: Path) -> None:
+    for seed in (1, 2):
+        _write_flat_sample(tmp_path, seed)
+    _write_flat_sample(tmp_path, 3, complete=False)
+    (tmp_path / "type1" / "notes").mkdir()
+
+    result = migrate_dataset_layout(tmp_path)
+
+    assert (result.moved, result.moved_incomplete, result.skipped) == (2, 1, ("notes",))
+    layout = DatasetLayout.open(tmp_path)
+    assert layout.kind == "sharded"
+    assert sorted(p.name for p in (tmp_path / "type1").iterdir() if p.is_dir() and len(p.name) != 2) == ["notes"]
+    incomplete = layout.sample_dir(_meta(3)["full_name"])
+    assert (incomplete / "genes.json").exists()
+    assert sorted(key[2] for key in layout.load_index()) == [1, 2]
+    assert {p.name for p in layout.iter_sample_dirs()} == {_meta(1)["full_name"], _meta(2)["full_name"]}
+
+    again = migrate_dataset_layout(tmp_path)
+    assert (again.moved, again.moved_incomplete, again.already_sharded) == (0, 0, 3)
+
+
+def test_locate_reads_index_once(tmp_path: Path, monkeypatch) -> None:
+    layout = DatasetLayout.open(tmp_path, "sharded")
+    for seed in (1, 2):
+        meta = _meta(seed)
+        sample_dir = layout.sample_dir(meta["full_name"])
+        sample_dir.mkdir(parents=True)
+        layout.record(meta, sample_dir)
+
+    loads = []
+    original = DatasetLayout.load_index
+    monkeypatch.setattr(DatasetLayout, "load_index", lambda self: loads.append(1) or original(self))
+
+    assert layout.locate("abc123", "2.0.0", 1) == layout.sample_dir(_meta(1)["full_name"])
+    assert layout.locate("abc123", "2.0.0", 2) == layout.sample_dir(_meta(2)["full_name"])
+    assert layout.locate("abc123", "2.0.0", 9) is None
+    assert len(loads) == 1
+
+    # Samples recorded through the same instance are visible without a reload.
+    meta = _meta(7)
+    custom = layout.root / "elsewhere" / meta["full_name"]
+    custom.mkdir(parents=True)
+    layout.record(meta, custom)
+    assert layout.locate("abc123", "2.0.0", 7) == custom
+    assert len(loads) == 1
+    assert layout == DatasetLayout.open(tmp_path)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+from pathlib import Path
+
+from peetsfea.pipeline.layout import append_jsonl
+from peetsfea.pipeline.manifest import DatasetManifest
+
+WRITERS = 8
+LINES_PER_WRITER = 200
+
+
+def _meta(seed: int) -> dict:
+    full_name = f"type1_abc123_2.0.0_{seed}"
+    return {"full_name": full_name, "seed": seed, "spec_hash": "abc123", "peetsfea_version": "2.0.0"}
+
+
+def _write_lines(path: Path, writer: int) -> None:
+    for idx in range(LINES_PER_WRITER):
+        append_jsonl(path, {"writer": writer, "idx": idx, "pad": "x" * (idx % 97)})
+
+
+def test_concurrent_append_jsonl_keeps_whole_lines(tmp_path: Path) -> None:
+    path = tmp_path / "manifest.jsonl"
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_write_lines, args=(path, writer)) for writer in range(WRITERS)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == WRITERS * LINES_PER_WRITER
+    records = [json.loads(line) for line in lines]
+    for writer in range(WRITERS):
+        # Lines of one writer keep their order.
+        assert [r["idx"] for r in records if r["writer"] == writer] == list(range(LINES_PER_WRITER))
+
+
+def test_load_tracks_done_restarted_and_torn_lines(tmp_path: Path) -> None:
+    manifest = DatasetManifest(tmp_path)
+    for stage in ("started", "run", "aedt", "done"):
+        manifest.append(_meta(1), stage, "ok")
+    manifest.append(_meta(2), "started", "ok")
+    manifest.append(_meta(2), "run", "ok")
+    manifest.append(_meta(2), "done", "rejected")
+    # Seed 2 is started again (e.g. --force) and seed 3 never finishes.
+    manifest.append(_meta(2), "started", "ok")
+    manifest.append(_meta(3), "started", "ok")
+    with manifest.path.open("a", encoding="utf-8") as fh:
+        fh.write('{"full_name": "type1_abc123_2.0.0_4", "sta')
+
+    state = manifest.load()
+    assert state.done == {_meta(1)["full_name"]: "ok"}
+    assert state.incomplete == {_meta(2)["full_name"], _meta(3)["full_name"]}
+
+    # The torn tail is terminated, so the next line parses.
+    manifest.append(_meta(3), "done", "error")
+    assert manifest.load().done == {_meta(1)["full_name"]: "ok", _meta(3)["full_name"]: "error"}
+    last = json.loads(manifest.path.read_text(encoding="utf-8").splitlines()[-1])
+    assert (last["full_name"], last["stage"], last["at_utc"][-1]) == (_meta(3)["full_name"], "done", "Z")
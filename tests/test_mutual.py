@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peetsfea.geometry.type1.mutual import (
+    RxLoopParams,
+    estimate_tx_rx_coupling,
+    neumann_mutual_h,
+)
+from peetsfea.pipeline.runner import load_type1_spec_context, run_type1
+
+ROOT = Path(__file__).resolve().parents[1]
+MU0_H_PER_MM = 4e-10 * math.pi
+
+
+def _circle(radius_mm: float, z_mm: float, sides: int = 360) -> np.ndarray:
+    # Inscribed polygon, (sides, 2, 3) filaments; its mutual is ~1e-4 below the circle's.
+    phi = np.linspace(0.0, 2.0 * math.pi, sides + 1)
+    points = np.column_stack([radius_mm * np.cos(phi), radius_mm * np.sin(phi), np.full(sides + 1, z_mm)])
+    return np.stack([points[:-1], points[1:]], axis=1)
+
+
+def _elliptic_ke(m: float) -> tuple[float, float]:
+    # Complete elliptic integrals K(m), E(m) (parameter m = k^2) by the AGM iteration.
+    a, b, c = 1.0, math.sqrt(1.0 - m), math.sqrt(m)
+    total, power = 0.5 * c * c, 0.5
+    while abs(c) > 1e-16:
+        a, b, c = 0.5 * (a + b), math.sqrt(a * b), 0.5 * (a - b)
+        power *= 2.0
+        total += power * c * c
+    k = math.pi / (2.0 * a)
+    return k, k * (1.0 - total)
+
+
+def _coaxial_loops_mutual_h(a_mm: float, b_mm: float, d_mm: float) -> float:
+    # Maxwell's closed form for two coaxial circular filaments.
+    m = 4.0 * a_mm * b_mm / ((a_mm + b_mm) ** 2 + d_mm**2)
+    k = math.sqrt(m)
+    big_k, big_e = _elliptic_ke(m)
+    return MU0_H_PER_MM * math.sqrt(a_mm * b_mm) * ((2.0 / k - k) * big_k - (2.0 / k) * big_e)
+
+
+def test_elliptic_integrals() -> None:
+    assert _elliptic_ke(0.0) == pytest.approx((math.pi / 2, math.pi / 2))
+    # K(1/2), E(1/2) from tables.
+    assert _elliptic_ke(0.5) == pytest.approx((1.8540746773013719, 1.3506438810476755))
+
+
+@pytest.mark.parametrize(("a_mm", "b_mm", "d_mm"), [(50.0, 50.0, 20.0), (80.0, 30.0, 10.0), (40.0, 120.0, 150.0)])
+def test_neumann_matches_coaxial_loops(a_mm: float, b_mm: float, d_mm: float) -> None:
+    expected = _coaxial_loops_mutual_h(a_mm, b_mm, d_mm)
+    assert neumann_mutual_h(_circle(a_mm, 0.0), _circle(b_mm, d_mm)) == pytest.approx(expected, rel=2e-4)
+    # Reversing one loop flips the sign.
+    reversed_b = _circle(b_mm, d_mm)[::-1, ::-1]
+    assert neumann_mutual_h(_circle(a_mm, 0.0), reversed_b) == pytest.approx(-expected, rel=2e-4)
+
+
+@pytest.mark.parametrize("seed", range(1, 7))
+def test_coupling_coefficient_is_bounded(seed: int) -> None:
+    context = load_type1_spec_context(ROOT / "examples" / "type1.toml")
+    sample = run_type1(context, seed).sample
+    estimate = estimate_tx_rx_coupling(sample)
+    if estimate is None:
+        pytest.skip("TX or RX module absent")
+    assert estimate == estimate_tx_rx_coupling(sample, RxLoopParams())
+    assert estimate.rx_inductance_uh > 0.0
+    for inst in estimate.instances:
+        assert inst.tx_inductance_uh > 0.0
+        assert 0.0 <= abs(inst.k) <= 1.0
+        assert inst.k == pytest.approx(inst.mutual_uh / math.sqrt(inst.tx_inductance_uh * estimate.rx_inductance_uh))
+    assert estimate.k_max_abs == max(abs(inst.k) for inst in estimate.instances)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peetsfea.geometry.plan import (
+    DesignVariable,
+    OperationPlan,
+    ParametricBoxPlan,
+    ParametricGeometryPlan,
+    ParametricPolylinePlan,
+)
+from peetsfea.geometry.plan_eval import (
+    PlanCheckReport,
+    PlanInterference,
+    check_parametric_plan,
+    evaluate_plan_boxes,
+    evaluate_plan_variables,
+)
+from peetsfea.geometry.type1.builder import PLAN_CHECK_IGNORE
+from peetsfea.pipeline import dataset
+from peetsfea.pipeline.catalog import GeneCatalog, sample_dir_status
+from peetsfea.pipeline.runner import load_type1_spec_context, run_type1
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _plan(*, gap: str = "1mm") -> ParametricGeometryPlan:
+    # Core block with a hole subtracted, a plate `gap` above it built from two united halves,
+    # a trace on top of the plate and a non-model wall cutting through everything.
+    return ParametricGeometryPlan(
+        units_length="mm",
+        variables=[
+            DesignVariable("w", 10.0, "mm"),
+            DesignVariable("t", 2.0, "mm"),
+            DesignVariable("gap", gap),
+            DesignVariable("z_plate", "t + gap", is_expression=True),
+            DesignVariable("z_top", "z_plate + t", is_expression=True),
+        ],
+        boxes=[
+            ParametricBoxPlan("Core", ("-w/2", "-w/2", "0mm"), ("w", "w", "t"), "ferrite", True),
+            ParametricBoxPlan("Hole", ("-1mm", "-1mm", "0mm"), ("2mm", "2mm", "t"), "vacuum", True),
+            ParametricBoxPlan("Plate_A", ("-w/2", "-w/2", "z_plate"), ("w/2", "w", "t"), "copper", True),
+            ParametricBoxPlan("Plate_B", ("0mm", "-w/2", "z_plate"), ("w/2", "w", "t"), "copper", True),
+            ParametricBoxPlan("Wall_NonModel", ("-0.5mm", "-w", "-w"), ("1mm", "2*w", "3*w"), "vacuum", False),
+        ],
+        operations=[
+            OperationPlan("subtract", ["Core"], ["Hole"]),
+            OperationPlan("unite", ["Plate_A", "Plate_B"]),
+        ],
+        polylines=[
+            ParametricPolylinePlan(
+                "Trace",
+                (("-3mm", "-3mm", "z_top + 0.25mm"), ("3mm", "-3mm", "z_top + 0.25mm"), ("3mm", "3mm", "z_top + 0.25mm")),
+                "1mm",
+                "0.5mm",
+                "copper",
+                True,
+            )
+        ],
+    )
+
+
+def test_evaluate_variables_and_boxes() -> None:
+    plan = _plan()
+    assert evaluate_plan_variables(plan) == {"w": 10.0, "t": 2.0, "gap": 1.0, "z_plate": 3.0, "z_top": 5.0}
+
+    arrays = evaluate_plan_boxes(plan)
+    assert arrays.names == ("Core", "Hole", "Plate_A", "Plate_B", "Wall_NonModel", "Trace#0", "Trace#1")
+    assert arrays.body_names == ("Core", "Hole", "Plate_A", "Wall_NonModel", "Trace")
+    assert arrays.body.tolist() == [0, 1, 2, 2, 3, 4, 4]
+    assert arrays.model.tolist() == [True, True, True, True, False, True, True]
+    np.testing.assert_allclose(arrays.lo[2], [-5.0, -5.0, 3.0])
+    np.testing.assert_allclose(arrays.hi[3], [5.0, 5.0, 5.0])
+    # Both segments reach w/2 past the shared corner but not past the open ends.
+    np.testing.assert_allclose(arrays.lo[5:], [[-3.0, -3.5, 5.0], [2.5, -3.5, 5.0]])
+    np.testing.assert_allclose(arrays.hi[5:], [[3.5, -2.5, 5.5], [3.5, 3.0, 5.5]])
+
+
+def test_clean_plan_passes() -> None:
+    report = check_parametric_plan(_plan())
+    assert report.ok
+    assert (report.box_count, report.nonpositive, report.interferences) == (7, [], [])
+
+
+def test_non_model_overlaps_only_with_include_non_model() -> None:
+    # The subtracted (consumed) Hole is not checked at all.
+    report = check_parametric_plan(_plan(), include_non_model=True)
+    assert not report.ok
+    assert {(i.a, i.b) for i in report.interferences} == {
+        ("Core", "Wall_NonModel"),
+        ("Plate_A", "Wall_NonModel"),
+        ("Wall_NonModel", "Trace"),
+    }
+
+
+def test_seeded_overlap_is_reported() -> None:
+    # A negative gap pushes the plate 0.5 mm into the core.
+    report = check_parametric_plan(_plan(gap="-0.5mm"))
+    assert not report.ok
+    assert report.nonpositive == []
+    assert len(report.interferences) == 1
+    hit = report.interferences[0]
+    assert (hit.a, hit.b, hit.box_pairs) == ("Core", "Plate_A", 2)
+    assert hit.overlap_mm3 == pytest.approx(10.0 * 10.0 * 0.5)
+
+
+def test_nonpositive_size_is_reported() -> None:
+    plan = _plan()
+    plan = replace(plan, variables=[*plan.variables[:1], DesignVariable("t", 0.0, "mm"), *plan.variables[2:]])
+    report = check_parametric_plan(plan)
+    assert not report.ok
+    assert report.nonpositive == ["Core", "Hole", "Plate_A", "Plate_B"]
+
+
+@pytest.mark.parametrize("seed", [4, 6, 8, 11, 12])
+def test_tx_coil_crossing_non_model_wall_is_not_an_interference(seed: int) -> None:
+    context = load_type1_spec_context(ROOT / "examples" / "type1.toml")
+    report = check_parametric_plan(run_type1(context, seed).geometry, ignore=PLAN_CHECK_IGNORE)
+    assert report.ok, report.interferences
+
+
+def test_failed_plan_check_rejects_the_sample(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    failed = PlanCheckReport(
+        ok=False,
+        box_count=2,
+        nonpositive=[],
+        interferences=[PlanInterference(a="Core", b="Plate", box_pairs=1, overlap_mm3=1.0)],
+        duration_ms=0.0,
+    )
+    monkeypatch.setattr(dataset, "check_parametric_plan", lambda plan, **kwargs: failed)
+    context = load_type1_spec_context(ROOT / "examples" / "type1.toml")
+    kwargs = {"seed": 1, "out_root": tmp_path, "build_aedt": True, "collect_features": True, "catalog": True}
+
+    result = dataset.write_type1_dataset_sample(context, **kwargs)
+
+    assert result.status == "rejected"
+    assert result.features is not None
+    assert result.features["status"] == "rejected"
+    assert sample_dir_status(result.sample_dir) == "rejected"
+    with GeneCatalog.for_dataset(tmp_path) as catalog:
+        assert catalog.select_seeds(status="ok") == []
+        assert catalog.select_seeds(status="rejected") == [1]
+    resumed = dataset.write_type1_dataset_sample(context, **kwargs)
+    assert resumed.status == "skipped"
+    assert resumed.features is not None
+    assert resumed.features["status"] == "rejected"
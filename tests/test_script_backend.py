@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from peetsfea.aedt.script_backend import compile_plan_script
+from peetsfea.pipeline.runner import run_type1_from_path
+
+ROOT = Path(__file__).resolve().parents[1]
+GOLDEN = Path(__file__).resolve().parent / "golden"
+# PEETSFEA_UPDATE_GOLDEN=1 rewrites the golden scripts instead of comparing against them.
+UPDATE = os.environ.get("PEETSFEA_UPDATE_GOLDEN") == "1"
+
+
+@pytest.mark.parametrize(("seed", "coil_emission"), [(1, "boxes"), (2, "polyline")])
+def test_compile_plan_script_matches_golden(seed: int, coil_emission: str) -> None:
+    result = run_type1_from_path(ROOT / "examples" / "type1.toml", seed, coil_emission=coil_emission)
+    text = compile_plan_script(
+        result.geometry,
+        project_name="type1",
+        design_name=f"type1_{seed}",
+        core_material=result.sample.materials_core,
+    )
+    golden = GOLDEN / f"script_type1_seed{seed}_{coil_emission}.txt"
+    if UPDATE:
+        golden.write_text(text, encoding="utf-8")
+    assert text == golden.read_text(encoding="utf-8")
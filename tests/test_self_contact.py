@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from peetsfea.geometry.type1.layer_modes import SegmentArray
+from peetsfea.geometry.type1.self_contact import _rects_intersect, detect_self_contact
+
+
+def _brute_force_pairs(segments: SegmentArray, *, ndigits: int = 6) -> list[tuple[int, int]]:
+    rects = [tuple(r) for r in segments.rects().tolist()]
+    endpoints = [{ka, kb} for ka, kb in segments.endpoint_keys(ndigits=ndigits)]
+    pairs: list[tuple[int, int]] = []
+    for i in range(len(rects)):
+        for j in range(i + 1, len(rects)):
+            if endpoints[i].intersection(endpoints[j]):
+                continue
+            if _rects_intersect(rects[i], rects[j]):
+                pairs.append((i, j))
+    return pairs
+
+
+def _random_segments(rng: np.random.Generator, count: int) -> SegmentArray:
+    # Coarse grid so touching/overlapping traces and shared endpoints are common.
+    start = rng.integers(0, 40, size=(count, 2)).astype(np.float64) * 0.5
+    length = rng.integers(0, 30, size=count).astype(np.float64) * 0.5
+    horizontal = rng.random(count) < 0.5
+    end = start.copy()
+    end[horizontal, 0] += length[horizontal]
+    end[~horizontal, 1] += length[~horizontal]
+    width = rng.choice([0.1, 0.25, 0.5, 1.0], size=count)
+    return SegmentArray(np.column_stack([start, end, width]))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sweep_matches_brute_force(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    segments = _random_segments(rng, int(rng.integers(1, 200)))
+    expected = _brute_force_pairs(segments)
+
+    report = detect_self_contact(segments, max_pairs=len(expected) + 1)
+
+    assert report.detected == bool(expected)
+    assert report.pair_count == len(expected)
+    assert list(report.example_pairs) == expected
+
+
+def test_example_pairs_are_truncated_in_order() -> None:
+    segments = _random_segments(np.random.default_rng(1234), 150)
+    expected = _brute_force_pairs(segments)
+    assert len(expected) > 5
+
+    report = detect_self_contact(segments, max_pairs=5)
+
+    assert report.pair_count == len(expected)
+    assert list(report.example_pairs) == expected[:5]
+
+
+def test_empty_segments() -> None:
+    report = detect_self_contact(SegmentArray(np.empty((0, 5))))
+    assert (report.detected, report.pair_count, report.example_pairs) == (False, 0, ())
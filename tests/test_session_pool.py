@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from peetsfea.aedt.session_pool import AedtSessionPool, FakeAedtBackend
+from peetsfea.pipeline.dataset import write_type1_dataset_sample
+from peetsfea.pipeline.runner import load_type1_spec_context
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _pool(backend: FakeAedtBackend, **kwargs) -> AedtSessionPool:
+    return AedtSessionPool(backend=backend, **kwargs)
+
+
+def test_recycle_after_n_designs() -> None:
+    backend = FakeAedtBackend()
+    with _pool(backend, recycle_after=3) as pool:
+        for idx in range(7):
+            with pool.design(Path(f"p{idx}.aedt"), "d") as app:
+                assert not app.closed
+        stats = pool.stats()
+
+    assert [len(session.apps) for session in backend.sessions] == [3, 3, 1]
+    assert all(app.closed for session in backend.sessions for app in session.apps)
+    assert [session.closed for session in backend.sessions] == [True, True, True]
+    assert (stats.launches, stats.recycles, stats.designs, stats.errors) == (3, 2, 7, 0)
+
+
+def test_recycle_on_error() -> None:
+    backend = FakeAedtBackend()
+    with _pool(backend, recycle_after=10) as pool:
+        with pool.design(Path("ok.aedt"), "d"):
+            pass
+        with pytest.raises(RuntimeError, match="boom"), pool.design(Path("bad.aedt"), "d"):
+            raise RuntimeError("boom")
+        assert backend.sessions[0].closed
+        with pool.design(Path("next.aedt"), "d"):
+            pass
+        stats = pool.stats()
+
+    assert len(backend.sessions) == 2
+    assert backend.sessions[0].apps[1].closed
+    assert (stats.launches, stats.recycles, stats.designs, stats.errors) == (2, 1, 3, 1)
+
+
+def test_reusable_design_hits_and_misses() -> None:
+    backend = FakeAedtBackend()
+    with _pool(backend, reuse_designs=True, max_open_designs=2, recycle_after=10) as pool:
+        with pool.reusable_design("a", Path("a.aedt"), "d") as first:
+            assert first.fresh
+            first.values["x"] = "1mm"
+        with pool.reusable_design("a", Path("a2.aedt"), "d") as hit:
+            assert hit is first
+            assert not hit.fresh
+            assert hit.values == {"x": "1mm"}
+        with pool.reusable_design("b", Path("b.aedt"), "d") as miss:
+            assert miss.fresh
+            assert miss.app is not first.app
+        # A third key evicts the least recently used design ("a") and closes it.
+        with pool.reusable_design("c", Path("c.aedt"), "d"):
+            pass
+        assert first.app.closed
+        with pool.reusable_design("a", Path("a3.aedt"), "d") as again:
+            assert again.fresh
+            assert again.app is not first.app
+        stats = pool.stats()
+
+    assert len(backend.sessions) == 1
+    assert (stats.designs, stats.reuses, stats.launches) == (4, 1, 1)
+
+
+def test_reusable_design_requires_reuse_designs() -> None:
+    with (
+        _pool(FakeAedtBackend()) as pool,
+        pytest.raises(RuntimeError),
+        pool.reusable_design("a", Path("a.aedt"), "d"),
+    ):
+        pass
+
+
+def test_reused_designs_do_not_count_towards_recycle_after() -> None:
+    backend = FakeAedtBackend()
+    with _pool(backend, reuse_designs=True, recycle_after=2) as pool:
+        for _ in range(5):
+            with pool.reusable_design("a", Path("a.aedt"), "d"):
+                pass
+        with pool.reusable_design("b", Path("b.aedt"), "d"):
+            pass
+        stats = pool.stats()
+
+    assert (stats.designs, stats.reuses, stats.recycles) == (2, 4, 1)
+
+
+def test_one_thread_per_desktop() -> None:
+    backend = FakeAedtBackend()
+    lock = threading.Lock()
+    active: dict[int, int] = {}
+    peak = {"designs": 0, "per_session": 0}
+
+    def worker(idx: int, pool: AedtSessionPool) -> None:
+        with pool.design(Path(f"p{idx}.aedt"), "d") as app:
+            session = next(s for s in backend.sessions if app in s.apps)
+            with lock:
+                active[session.session_id] = active.get(session.session_id, 0) + 1
+                peak["designs"] = max(peak["designs"], sum(active.values()))
+                peak["per_session"] = max(peak["per_session"], active[session.session_id])
+            time.sleep(0.01)
+            with lock:
+                active[session.session_id] -= 1
+
+    with _pool(backend, size=2, recycle_after=100) as pool:
+        threads = [threading.Thread(target=worker, args=(idx, pool)) for idx in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = pool.stats()
+
+    assert len(backend.sessions) == 2
+    assert peak == {"designs": 2, "per_session": 1}
+    assert (stats.designs, stats.errors) == (8, 0)
+
+
+def test_closed_pool_rejects_designs() -> None:
+    pool = _pool(FakeAedtBackend())
+    pool.close()
+    with pytest.raises(RuntimeError, match="closed"), pool.design(Path("p.aedt"), "d"):
+        pass
+
+
+def test_reused_design_is_recorded_in_results(tmp_path: Path) -> None:
+    # Same seed under two project names: same plan, so the second sample reuses the design.
+    context = load_type1_spec_context(ROOT / "examples" / "type1.toml")
+    with _pool(FakeAedtBackend(), reuse_designs=True) as pool:
+        first_dir, second_dir = (
+            write_type1_dataset_sample(
+                context, seed=1, out_root=tmp_path, project_name=name, build_aedt=True, aedt_pool=pool
+            ).sample_dir
+            for name in ("first", "second")
+        )
+    first, second = (json.loads((d / "maxwell" / "results.json").read_text(encoding="utf-8")) for d in (first_dir, second_dir))
+
+    assert not first["apply_report"]["design_reuse"]["reused"]
+    assert second["apply_report"]["design_reuse"]["reused"]
+    assert first["design_name"] == second["design_name"] == first_dir.name
+    assert Path(second["project_path"]) == second_dir / "maxwell" / "project.aedt"
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from peetsfea.geometry.type1.spiral_mask import Rect2D, rect_spiral_polyline_array
+
+
+def _iterative_polyline(
+    *,
+    bounds: Rect2D,
+    turns: int,
+    pitch_mm: float,
+    start_edge_idx: int,
+    direction_idx: int,
+) -> list[tuple[float, float]]:
+    # Step-by-step walk the closed form replaced: move to the boundary ahead, then pull the
+    # boundary just travelled along in by one pitch.
+    east, north, west, south = 0, 1, 2, 3
+    u_min, u_max, v_min, v_max = bounds.u_min, bounds.u_max, bounds.v_min, bounds.v_max
+    if direction_idx == 1:
+        start_map = {
+            3: ((u_min, v_min), east),
+            0: ((u_max, v_min), north),
+            2: ((u_max, v_max), west),
+            1: ((u_min, v_max), south),
+        }
+        turn_delta = 1
+    else:
+        start_map = {
+            3: ((u_max, v_min), west),
+            0: ((u_max, v_max), south),
+            2: ((u_min, v_max), east),
+            1: ((u_min, v_min), north),
+        }
+        turn_delta = -1
+
+    (u, v), direction = start_map[start_edge_idx]
+    points = [(u, v)]
+    left, right, bottom, top = u_min, u_max, v_min, v_max
+    for _ in range(4 * turns):
+        if left >= right or bottom >= top:
+            raise ValueError("Spiral does not fit: bounds collapsed before completing requested turns")
+        if direction == east:
+            u = right
+        elif direction == west:
+            u = left
+        elif direction == north:
+            v = top
+        else:
+            v = bottom
+        if (u, v) != points[-1]:
+            points.append((u, v))
+        if direction in (east, west):
+            if v == bottom:
+                bottom += pitch_mm
+            else:
+                top -= pitch_mm
+        elif u == left:
+            left += pitch_mm
+        else:
+            right -= pitch_mm
+        direction = (direction + turn_delta) % 4
+    return points
+
+
+def _bits(points) -> bytes:
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2).tobytes()
+
+
+@pytest.mark.parametrize("direction_idx", [0, 1])
+@pytest.mark.parametrize("start_edge_idx", [0, 1, 2, 3])
+@pytest.mark.parametrize("turns", [1, 2, 3, 7, 15, 40])
+def test_polyline_array_matches_iterative_walk(turns: int, start_edge_idx: int, direction_idx: int) -> None:
+    rng = np.random.default_rng(1000 * turns + 10 * start_edge_idx + direction_idx)
+    for _ in range(50):
+        u_size, v_size = rng.uniform(5.0, 120.0, size=2)
+        bounds = Rect2D(u_min=-0.5 * u_size, u_max=0.5 * u_size, v_min=-0.4 * v_size, v_max=0.6 * v_size)
+        # Pitches around the largest one that fits, so both outcomes are exercised.
+        pitch = float(min(u_size, v_size)) / (2.0 * turns) * rng.uniform(0.5, 1.5)
+        kwargs = {
+            "bounds": bounds,
+            "turns": turns,
+            "pitch_mm": pitch,
+            "start_edge_idx": start_edge_idx,
+            "direction_idx": direction_idx,
+        }
+        try:
+            expected = _iterative_polyline(**kwargs)
+        except ValueError as exc:
+            with pytest.raises(ValueError, match=str(exc)):
+                rect_spiral_polyline_array(**kwargs)
+            continue
+        assert _bits(rect_spiral_polyline_array(**kwargs)) == _bits(expected)
+
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from peetsfea.geometry.type1.spiral_mask import DdSplit, derive_rect_spiral
+from peetsfea.pipeline.runner import load_type1_spec_context, run_type1
+from peetsfea.pipeline.serialize import to_dict
+from peetsfea.sampling.tx_coil_feasible import (
+    _rect_spiral_fits,
+    sample_feasible_coil_shape,
+    spiral_regions,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+GOLDEN = Path(__file__).resolve().parent / "golden"
+
+
+@pytest.fixture(scope="module")
+def spec():
+    return load_type1_spec_context(ROOT / "examples" / "type1.toml").spec
+
+
+def _derive_ok(u_size: float, v_size: float, turns: int, min_w, min_gap, edge, fill, duty) -> bool:
+    try:
+        derive_rect_spiral(
+            u_size_mm=u_size,
+            v_size_mm=v_size,
+            turns=turns,
+            edge_clearance_mm=edge,
+            fill_scale=fill,
+            pitch_duty=duty,
+            min_trace_width_mm=min_w,
+            min_trace_gap_mm=min_gap,
+        )
+    except ValueError:
+        return False
+    return True
+
+
+def test_fits_match_derive_rect_spiral() -> None:
+    rng = np.random.default_rng(7)
+    grid = np.column_stack(
+        [
+            rng.choice([0.1, 0.2, 0.5], 200),
+            rng.choice([0.0, 0.2, 0.6], 200),
+            rng.choice([0.0, 0.4, 3.0, 12.0], 200),
+            rng.choice([0.5, 0.75, 1.0], 200),
+            rng.choice([0.35, 0.5, 0.75], 200),
+        ]
+    )
+    turns = np.arange(1, 40)
+    for u_size, v_size in ((30.0, 18.0), (8.0, 60.0), (6.5, 6.5)):
+        fits = _rect_spiral_fits(u_size, v_size, grid, turns)
+        expected = [[_derive_ok(u_size, v_size, int(t), *row) for t in turns] for row in grid.tolist()]
+        assert fits.tolist() == expected
+        assert fits.any() and not fits.all()
+
+
+@pytest.mark.parametrize(
+    ("face", "spiral_count", "dd"),
+    [
+        ((40.0, 25.0), 1, None),
+        ((12.0, 90.0), 1, None),
+        ((60.0, 30.0), 2, DdSplit(axis_idx=0, gap_mm=2.0, ratio=0.5)),
+        ((30.0, 60.0), 2, DdSplit(axis_idx=1, gap_mm=6.4, ratio=0.5)),
+    ],
+)
+def test_feasible_shapes_are_accepted_by_derive_rect_spiral(spec, face, spiral_count, dd) -> None:
+    regions = spiral_regions(face_u_size_mm=face[0], face_v_size_mm=face[1], spiral_count=spiral_count, dd=dd)
+    assert regions is not None
+    rng = random.Random(1234)
+    for _ in range(200):
+        shape = sample_feasible_coil_shape(
+            rng,
+            spec.tx.coil,
+            face_u_size_mm=face[0],
+            face_v_size_mm=face[1],
+            spiral_count=spiral_count,
+            dd=dd,
+        )
+        assert shape is not None
+        assert len(shape.spiral_turns) == spiral_count
+        for (u_size, v_size), turns in zip(regions, shape.spiral_turns):
+            assert _derive_ok(
+                u_size,
+                v_size,
+                turns,
+                shape.min_trace_width_mm,
+                shape.min_trace_gap_mm,
+                shape.edge_clearance_mm,
+                shape.fill_scale,
+                shape.pitch_duty,
+            )
+
+
+def test_feasible_v1_samples_build(spec) -> None:
+    # Every present instance must build; derive_rect_spiral raises inside the builder otherwise.
+    feasible = replace(spec, tx=replace(spec.tx, coil=replace(spec.tx.coil, sampler="feasible_v1")))
+    for seed in range(1, 6):
+        result = run_type1(feasible, seed)
+        assert result.geometry.boxes
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_rejection_v1_keeps_legacy_genes(spec, seed: int) -> None:
+    # Golden files were produced by the sampler before feasible_v1 existed.
+    assert spec.tx.coil.sampler == "rejection_v1"
+    genes = json.loads(json.dumps(to_dict(run_type1(spec, seed).sample)))
+    assert genes == json.loads((GOLDEN / f"genes_type1_seed{seed}.json").read_text(encoding="utf-8"))
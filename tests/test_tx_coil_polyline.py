@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from peetsfea.geometry.type1.tx_coil_3d import (
+    build_tx_planar_trace_coil,
+    build_tx_polyline_trace_coil,
+)
+from peetsfea.pipeline.runner import load_type1_spec_context, run_type1
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def sample():
+    context = load_type1_spec_context(ROOT / "examples" / "type1.toml")
+    return run_type1(context, 1).sample
+
+
+@pytest.mark.parametrize("layer_mode_idx", [0, 1, 2])
+def test_polyline_object_count_per_layer_mode(sample, layer_mode_idx: int) -> None:
+    # Seed 1 instance 2: two-layer DD coil with 20 + 3 turns.
+    inst = sample.tx_coil.instances[2]
+    assert sample.tx_pcb.layer_count >= 2 and inst.trace_layer_count >= 2
+    inst = replace(inst, layer_mode_idx=layer_mode_idx, radial_split_top_turn_fraction=0.5)
+    turns = inst.spiral_turns[: inst.spiral_count]
+
+    polylines, boxes, _ = build_tx_polyline_trace_coil(sample, inst)
+    planar_boxes, _ = build_tx_planar_trace_coil(sample, inst)
+    vias = [box for box in boxes if "_Via_" in box.name]
+    segments = [box for box in planar_boxes if "_Top_" in box.name or "_Bot_" in box.name]
+
+    # One polyline per run of consecutive turns on one layer: a single run per spiral, a
+    # top and a bottom run for a radial split, and one run per turn for alternating turns,
+    # where every turn ends at a via.
+    expected_lines = {0: len(turns), 1: 2 * len(turns), 2: sum(turns)}[layer_mode_idx]
+    expected_vias = {0: 0, 1: len(turns), 2: sum(t - 1 for t in turns)}[layer_mode_idx]
+    assert len(polylines) == expected_lines
+    assert len(vias) == expected_vias
+    assert len(segments) == 4 * sum(turns)
+    assert len(boxes) - len(vias) == len(planar_boxes) - len(segments) - expected_vias